@@ -0,0 +1 @@
+Added adaptive chunk sizing for uploads to the storage and buckets, configurable with `chunk-size`, `min-chunk-size`, `max-chunk-size` and `adaptive-chunk-size` in the `[storage]` section of the user config.
@@ -0,0 +1 @@
+Uploads to Azure buckets stage blocks of at least 4 MiB concurrently, and large Azure blobs are downloaded with up to `parallel-parts` concurrent range requests.
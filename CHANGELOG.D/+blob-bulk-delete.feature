@@ -0,0 +1 @@
+Delete blobs in batches using the bulk delete APIs of S3, Azure and GCS in `apolo blob rm --recursive`.
@@ -0,0 +1 @@
+Added `parallel` argument to `Buckets.list_blobs()` and `Buckets.get_disk_usage()` and `--parallel` option to `apolo blob ls` and `apolo blob du` for listing key prefixes of a bucket concurrently.
@@ -0,0 +1 @@
+Added `Buckets.copy_file()` and `Buckets.copy_dir()` methods, `apolo blob cp` copies blobs between buckets on the server side when both buckets use the same provider.
@@ -0,0 +1 @@
+Recursive copy and removal of storage and bucket directories now run on fixed pools of workers with separate limits for listing, small files and large files, so memory no longer grows with the size of the directory tree.
@@ -0,0 +1 @@
+The Buckets API reuses resolved buckets and open provider clients between calls of the same `Client`, they are closed by `Client.close()`.
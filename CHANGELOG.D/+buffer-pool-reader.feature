@@ -0,0 +1 @@
+Reduce CPU and memory churn when reading local files for upload by reusing read buffers and memory-mapping large files.
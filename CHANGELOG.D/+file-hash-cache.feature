@@ -0,0 +1 @@
+Content hashes of local files are cached in the configuration database keyed by the device, inode, size and modification time of the file, so `apolo storage sync` does not rehash unchanged files.
@@ -0,0 +1 @@
+Files of 150 MiB or more are uploaded to GCS buckets as concurrently uploaded parts composed on the server, and large GCS blobs are downloaded with concurrent range requests.
@@ -0,0 +1 @@
+Glob patterns in `apolo blob glob`, `apolo blob cp --glob` and storage commands are parsed once, and directories of the same level are listed concurrently.
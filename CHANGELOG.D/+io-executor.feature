@@ -0,0 +1 @@
+Blocking file system calls of storage and blob transfers run in a dedicated thread pool instead of the default executor of the event loop, its size is set by `io-threads` in the `[storage]` section of the user config.
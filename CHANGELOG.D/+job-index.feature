@@ -0,0 +1 @@
+Resolve job names and complete job ids and names from a local job index kept in the config database.
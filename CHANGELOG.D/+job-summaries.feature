@@ -0,0 +1 @@
+Fetch compact job summaries with server-side field projection in `apolo ps`, `apolo top` and job name completion.
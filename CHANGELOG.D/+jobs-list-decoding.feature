@@ -0,0 +1 @@
+Speed up decoding of `Jobs.list()`: use orjson when installed (`apolo-sdk[orjson]`), resolve image name defaults once per listing and decode status transitions and container volumes on first access.
@@ -0,0 +1 @@
+Wait for job start and stop with `Jobs.watch()`, which checks the job status less often while it does not change and uses conditional requests.
@@ -0,0 +1 @@
+Directory transfers take file types and sizes from directory listings instead of requesting them for every entry.
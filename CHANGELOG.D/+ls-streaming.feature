@@ -0,0 +1 @@
+Print `apolo storage ls` output that is not a terminal unsorted as the entries are received, unless `--sort` is specified, add `--sort none` for doing it on a terminal, and print `apolo blob ls` output without buffering when it is not a terminal.
@@ -0,0 +1 @@
+Added `parallel` argument to `Storage.download_file()` and `Storage.download_dir()` for downloading ranges of a large file concurrently; `apolo cp --parallel` now applies to downloads too.  `--continue` resumes interrupted parallel downloads from the completed ranges.
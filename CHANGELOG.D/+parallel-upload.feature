@@ -0,0 +1 @@
+Added `parallel` argument to `Storage.upload_file()` and `Storage.upload_dir()` and `--parallel` option to `apolo cp` for uploading chunks of a large file concurrently.
@@ -0,0 +1 @@
+Multipart uploads to S3 compatible buckets send up to `parallel-parts` parts from the `[storage]` section of the user config concurrently, and the part size grows for large files to stay within the limit of 10000 parts.
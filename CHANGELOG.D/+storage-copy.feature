@@ -0,0 +1 @@
+Added `Storage.copy_file()` and `Storage.copy_dir()` methods, `apolo cp` copies files between storage locations without downloading them to the local disk.
@@ -0,0 +1 @@
+Added `apolo storage sync` command and `Storage.sync()` method which transfer only new and changed files, comparing content hashes remembered at the previous synchronization.
@@ -0,0 +1 @@
+Add `Jobs.top_many()` merging telemetry of several jobs into one stream; `apolo top` uses it and re-renders only rows of changed jobs.
@@ -357,14 +357,15 @@ async def _process_attach_single_try(
             # that's why we need to initialize
             # it AFTER the disconnection from attached session.
             with JobStopProgress.create(root.console, quiet=root.quiet) as progress:
-                while (not job.status.is_finished) and (
-                    job.history.reason == "Restarting"
-                    or job.history.restarts == restarts
-                ):
-                    if not progress.step(job):
-                        sys.exit(EX_IOERR)
-                    await asyncio.sleep(0.2)
-                    job = await root.client.jobs.status(job.id)
+                async with root.client.jobs.watch(job.id) as it:
+                    async for job in it:
+                        if job.status.is_finished or (
+                            job.history.reason != "Restarting"
+                            and job.history.restarts != restarts
+                        ):
+                            break
+                        if not progress.step(job):
+                            sys.exit(EX_IOERR)
                 progress.end(job)
 
 
@@ -1,7 +1,17 @@
+import contextlib
 import glob as globmodule  # avoid conflict with subcommand "glob"
 import logging
 import sys
-from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import click
 from rich.text import Text
@@ -450,12 +460,21 @@ async def statbucket(
     type=PROJECT,
     help="Look on a specified project (the current project by default).",
 )
+@option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    metavar="N",
+    default=1,
+    show_default=True,
+    help="Number of key prefixes listed concurrently.",
+)
 @argument("bucket", type=BUCKET)
 async def du(
     root: Root,
     cluster: Optional[str],
     org: Optional[str],
     project: Optional[str],
+    parallel: int,
     bucket: str,
 ) -> None:
     """
@@ -481,6 +500,7 @@ async def du(
             cluster_name=bucket_obj.cluster_name,
             org_name=bucket_obj.org_name,
             project_name=bucket_obj.project_name,
+            parallel=parallel,
         ) as usage_it:
             async for usage in usage_it:
                 status.update(
@@ -621,6 +641,14 @@ async def set_bucket_publicity(
     help="List all keys under the URL path provided, not just 1 level depths.",
 )
 @option("--full-uri", is_flag=True, help="Output full bucket URI.")
+@option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    metavar="N",
+    default=1,
+    show_default=True,
+    help="Number of key prefixes listed concurrently with --recursive.",
+)
 async def ls(
     root: Root,
     paths: Sequence[URL],
@@ -628,6 +656,7 @@ async def ls(
     format_long: bool,
     recursive: bool,
     full_uri: bool,
+    parallel: int,
 ) -> None:
     """
     List buckets or bucket contents.
@@ -668,10 +697,16 @@ async def ls(
                 uri_text = painter.paint(str(uri), FileStatusType.DIRECTORY)
                 root.print(Text.assemble("List of ", uri_text, ":"))
 
-            with root.pager():
+            # The pager collects the whole output, a huge listing piped
+            # elsewhere is printed as it is received instead
+            pager: ContextManager[Any] = (
+                root.pager() if root.tty else contextlib.nullcontext()
+            )
+            with pager:
                 async with root.client.buckets.list_blobs(
                     uri=uri,
                     recursive=recursive,
+                    parallel=parallel,
                 ) as blobs_it:
                     async for entry in blobs_it:
                         root.print(formatter(entry))
@@ -804,9 +839,10 @@ async def cp(
     Copy blobs into and from Blob Storage.
 
     Either SOURCES or DESTINATION should have `blob://` scheme.
-    If scheme is omitted, file:// scheme is assumed. It is currently not possible to
-    copy files between Blob Storage (`blob://`) destination, nor with `storage://`
-    scheme paths.
+    If scheme is omitted, file:// scheme is assumed. Blobs are copied between
+    buckets on the server side if both buckets use the same provider, otherwise
+    the data is streamed through the client. It is currently not possible to
+    copy with `storage://` scheme paths.
 
     Use `/dev/stdin` and `/dev/stdout` file names to upload a file from standard input
     or output to stdout.
@@ -924,6 +960,25 @@ async def cp(
                             update=update,
                             progress=progress_blob,
                         )
+                elif source.scheme == "blob" and destination.scheme == "blob":
+                    if continue_:
+                        raise click.UsageError(
+                            "Option --continue is not supported for copying to "
+                            "Blob Storage"
+                        )
+
+                    if recursive and await _is_dir(root, source):
+                        await root.client.buckets.copy_dir(
+                            source,
+                            destination,
+                            update=update,
+                            filter=file_filter.match,
+                            progress=progress_blob,
+                        )
+                    else:
+                        await root.client.buckets.copy_file(
+                            source, destination, update=update, progress=progress_blob
+                        )
                 else:
                     raise RuntimeError(
                         f"Copy operation of the file with scheme '{source.scheme}'"
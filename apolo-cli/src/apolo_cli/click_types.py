@@ -610,9 +610,8 @@ class JobType(AsyncType[str]):
         now = datetime.now()
         limit = int(os.environ.get(JOB_LIMIT_ENV, 100))
         names = {}
-        async with client.jobs.list(
+        async with client.jobs.list_cached(
             since=now - timedelta(days=7),
-            reverse=True,
             limit=limit,
             cluster_name=cluster_name,
             project_names=(project_name,) if project_name else (),
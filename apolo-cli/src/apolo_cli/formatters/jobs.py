@@ -5,7 +5,7 @@ import sys
 import time
 from dataclasses import dataclass
 from types import TracebackType
-from typing import Callable, Dict, Iterable, List, Optional, Tuple, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 import humanize
 from rich import box
@@ -17,10 +17,16 @@ from rich.styled import Styled
 from rich.table import Table
 from rich.text import Text, TextType
 
-from apolo_sdk import JobDescription, JobRestartPolicy, JobStatus, JobTelemetry
+from apolo_sdk import (
+    JobDescription,
+    JobRestartPolicy,
+    JobStatus,
+    JobSummary,
+    JobTelemetry,
+)
 
 from apolo_cli.formatters.utils import DatetimeFormatter, format_gpu_string
-from apolo_cli.parse_utils import JobTableFormat, JobTelemetryKeyFunc
+from apolo_cli.parse_utils import InvertKey, JobTableFormat, JobTelemetryKeyFunc
 from apolo_cli.utils import format_size
 
 from .utils import (
@@ -329,56 +335,102 @@ class JobTelemetryFormatter(RenderHook):
     ) -> None:
         self._console = console
         self._username = username
-        self.sort_keys = sort_keys
+        self._sort_keys = sort_keys
         self._columns = columns
         self._image_formatter = image_formatter
         self._datetime_formatter = datetime_formatter
         self._maxrows = maxrows
         self._live_render = LiveRender(Table.grid())
-        self._data: Dict[str, Tuple[JobDescription, JobTelemetry]] = {}
+        self._data: Dict[str, Tuple[JobSummary, JobTelemetry]] = {}
+        # Sort keys and cells of rows are cached,
+        # only rows of updated jobs are formatted again on render
+        self._rows: Dict[str, Tuple[Tuple[Any, ...], List[TextType]]] = {}
+        self._order: List[str] = []
+        # Ordered set of ids of updated and removed jobs
+        self._updated: Dict[str, None] = {}
+        self._resort = False
         self.changed = True
 
-    def update(self, job: JobDescription, info: JobTelemetry) -> None:
+    @property
+    def sort_keys(self) -> List[Tuple[JobTelemetryKeyFunc, bool]]:
+        return self._sort_keys
+
+    @sort_keys.setter
+    def sort_keys(self, sort_keys: List[Tuple[JobTelemetryKeyFunc, bool]]) -> None:
+        self._sort_keys = sort_keys
+        self._resort = True
+
+    def update(
+        self, job: Union[JobDescription, JobSummary], info: JobTelemetry
+    ) -> None:
+        if isinstance(job, JobDescription):
+            job = JobSummary.from_job(job)
+        old = self._data.get(job.id)
         self._data[job.id] = job, info
-        self.changed = True
+        if old is None or old[0] != job or _telemetry_changed(old[1], info):
+            self._updated[job.id] = None
+            self.changed = True
 
     def remove(self, job_id: str) -> None:
-        self._data.pop(job_id, None)
-        self.changed = True
+        if self._data.pop(job_id, None) is not None:
+            self._updated[job_id] = None
+            self.changed = True
+
+    def _sort_key(self, item: Tuple[JobSummary, JobTelemetry]) -> Tuple[Any, ...]:
+        return tuple(
+            InvertKey(keyfunc(item)) if reverse else keyfunc(item)
+            for keyfunc, reverse in self.sort_keys
+        )
+
+    def _format_cells(self, job: JobSummary, info: JobTelemetry) -> List[TextType]:
+        job_data = TabularJobRow.from_job(
+            job,
+            self._username,
+            image_formatter=self._image_formatter,
+            datetime_formatter=self._datetime_formatter,
+        )
+        telemetry_data = dict(
+            cpu=f"{info.cpu:.3f}",
+            memory=f"{info.memory:.3f}",
+            gpu=f"{info.gpu_duty_cycle}" if info.gpu_duty_cycle else "0",
+            gpu_memory=f"{info.gpu_memory:.3f}" if info.gpu_memory else "0",
+        )
+
+        def get(id: str) -> TextType:
+            if id in telemetry_data:
+                return telemetry_data[id]
+            else:
+                return getattr(job_data, id)
+
+        return _format_row(self._columns, get)
 
     def render(self) -> None:
         table = Table(box=box.SIMPLE_HEAVY)
         _add_columns(table, self._columns)
 
-        items = list(self._data.values())
-        for keyfunc, reverse in reversed(self.sort_keys):
-            items.sort(key=keyfunc, reverse=reverse)
+        if self._updated or self._resort:
+            for job_id in self._updated:
+                item = self._data.get(job_id)
+                if item is None:
+                    self._rows.pop(job_id, None)
+                else:
+                    if job_id not in self._rows:
+                        self._order.append(job_id)
+                    self._rows[job_id] = self._sort_key(item), self._format_cells(*item)
+            if self._resort:
+                for job_id, (_, cells) in self._rows.items():
+                    self._rows[job_id] = self._sort_key(self._data[job_id]), cells
+            self._order = [job_id for job_id in self._order if job_id in self._rows]
+            # The previous order is mostly sorted, sorting it again is cheap
+            self._order.sort(key=lambda job_id: self._rows[job_id][0])
+            self._updated.clear()
+            self._resort = False
+
         maxrows = self._console.size.height - 4
         if self._maxrows is not None and self._maxrows < maxrows:
             maxrows = self._maxrows
-        del items[max(maxrows, 1) :]
-
-        for job, info in items:
-            job_data = TabularJobRow.from_job(
-                job,
-                self._username,
-                image_formatter=self._image_formatter,
-                datetime_formatter=self._datetime_formatter,
-            )
-            telemetry_data = dict(
-                cpu=f"{info.cpu:.3f}",
-                memory=f"{info.memory:.3f}",
-                gpu=f"{info.gpu_duty_cycle}" if info.gpu_duty_cycle else "0",
-                gpu_memory=f"{info.gpu_memory:.3f}" if info.gpu_memory else "0",
-            )
-
-            def get(id: str) -> TextType:
-                if id in telemetry_data:
-                    return telemetry_data[id]
-                else:
-                    return getattr(job_data, id)
-
-            table.add_row(*_format_row(self._columns, get))
+        for job_id in self._order[: max(maxrows, 1)]:
+            table.add_row(*self._rows[job_id][1])
 
         if self._console.is_terminal:
             self._live_render.set_renderable(table)
@@ -418,12 +470,16 @@ class JobTelemetryFormatter(RenderHook):
 
 class BaseJobsFormatter:
     @abc.abstractmethod
-    def __call__(self, jobs: Iterable[JobDescription]) -> RenderableType:
+    def __call__(
+        self, jobs: Iterable[Union[JobDescription, JobSummary]]
+    ) -> RenderableType:
         pass
 
 
 class SimpleJobsFormatter(BaseJobsFormatter):
-    def __call__(self, jobs: Iterable[JobDescription]) -> RenderableType:
+    def __call__(
+        self, jobs: Iterable[Union[JobDescription, JobSummary]]
+    ) -> RenderableType:
         table = Table.grid()
         table.add_column("")
         for job in jobs:
@@ -455,28 +511,30 @@ class TabularJobRow:
     @classmethod
     def from_job(
         cls,
-        job: JobDescription,
+        job: Union[JobDescription, JobSummary],
         username: str,
         image_formatter: ImageFormatter,
         datetime_formatter: DatetimeFormatter,
     ) -> "TabularJobRow":
+        if isinstance(job, JobDescription):
+            job = JobSummary.from_job(job)
         return cls(
             id=job.id,
             name=job.name if job.name else "",
             tags=",".join(job.tags),
             status=fmt_status(job.status),
-            when=datetime_formatter(job.history.changed_at),
-            created=datetime_formatter(job.history.created_at),
-            started=datetime_formatter(job.history.started_at),
-            finished=datetime_formatter(job.history.finished_at),
-            image=image_formatter(job.container.image),
+            when=datetime_formatter(job.changed_at),
+            created=datetime_formatter(job.created_at),
+            started=datetime_formatter(job.started_at),
+            finished=datetime_formatter(job.finished_at),
+            image=image_formatter(job.image) if job.image is not None else "",
             owner=("YOU" if job.owner == username else job.owner),
             description=job.description if job.description else "",
             cluster_name=job.cluster_name,
             org_name=job.org_name or "",
-            command=job.container.command if job.container.command else "",
+            command=job.command if job.command else "",
             life_span=format_life_span(job.life_span),
-            workdir=job.container.working_dir or "",
+            workdir=job.working_dir or "",
             preset=job.preset_name or "",
             project_name=job.project_name or "",
         )
@@ -485,6 +543,16 @@ class TabularJobRow:
         return _format_row(columns, lambda id: getattr(self, id))
 
 
+def _telemetry_changed(old: JobTelemetry, new: JobTelemetry) -> bool:
+    # Timestamps are not shown
+    return (
+        old.cpu != new.cpu
+        or old.memory_bytes != new.memory_bytes
+        or old.gpu_duty_cycle != new.gpu_duty_cycle
+        or old.gpu_memory_bytes != new.gpu_memory_bytes
+    )
+
+
 def _format_row(
     columns: JobTableFormat, get: Callable[[str], TextType]
 ) -> List[TextType]:
@@ -520,7 +588,9 @@ class TabularJobsFormatter(BaseJobsFormatter):
         self._image_formatter = image_formatter
         self._datetime_formatter = datetime_formatter
 
-    def __call__(self, jobs: Iterable[JobDescription]) -> RenderableType:
+    def __call__(
+        self, jobs: Iterable[Union[JobDescription, JobSummary]]
+    ) -> RenderableType:
         table = Table(box=box.SIMPLE_HEAVY)
         _add_columns(table, self._columns)
 
@@ -7,7 +7,18 @@ import sys
 import webbrowser
 from contextlib import AsyncExitStack
 from datetime import datetime, timedelta, timezone
-from typing import AsyncIterator, List, Optional, Sequence, Set, Tuple
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import click
 from dateutil.parser import isoparse
@@ -28,6 +39,7 @@ from apolo_sdk import (
     JobPriority,
     JobRestartPolicy,
     JobStatus,
+    JobSummary,
     Permission,
     RemoteImage,
 )
@@ -64,6 +76,7 @@ from .formatters.utils import (
 )
 from .parse_utils import (
     JobTableFormat,
+    calc_job_summary_fields,
     get_default_ps_columns,
     get_default_top_columns,
     parse_ps_columns,
@@ -268,10 +281,11 @@ async def attach(root: Root, job: str, port_forward: List[Tuple[int, int]]) -> N
     if status.status.is_pending:
         with JobStartProgress.create(root.console, quiet=root.quiet) as progress:
             progress.step(status)
-            while status.status.is_pending:
-                await asyncio.sleep(0.2)
-                status = await root.client.jobs.status(id)
-                progress.step(status)
+            async with root.client.jobs.watch(id) as it:
+                async for status in it:
+                    progress.step(status)
+                    if not status.status.is_pending:
+                        break
 
     tty = status.container.tty
     _check_tty(root, tty)
@@ -463,7 +477,11 @@ async def ls(
             datetime_formatter=get_datetime_formatter(root.iso_datetime_format),
         )
 
-    async with root.client.jobs.list(
+    fields = calc_job_summary_fields(format)
+    if description:
+        fields.add("description")
+    async with root.client.jobs.list_summaries(
+        fields=fields,
         statuses=statuses,
         name=name,
         owners=owners,
@@ -482,8 +500,8 @@ async def ls(
         if distinct:
 
             async def _filter_distinct(
-                jobs_iter: AsyncIterator[JobDescription],
-            ) -> AsyncIterator[JobDescription]:
+                jobs_iter: AsyncIterator[JobSummary],
+            ) -> AsyncIterator[JobSummary]:
                 names: Set[str] = set()
                 async for job in jobs_iter:
                     if job.name in names:
@@ -689,8 +707,17 @@ async def top(
     if not cluster:
         cluster = root.client.config.cluster_name
 
-    observed: Set[str] = set()
-    loop = asyncio.get_event_loop()
+    observed: Dict[str, JobSummary] = {}
+
+    async def watch(
+        cluster_name: str, job_ids: Union[Iterable[str], AsyncIterable[str]]
+    ) -> None:
+        async with root.client.jobs.top_many(job_ids, cluster_name=cluster_name) as it:
+            async for job_id, info in it:
+                if info is None:
+                    formatter.remove(job_id)  # Job is finished.
+                else:
+                    formatter.update(observed[job_id], info)
 
     if jobs:
         for opt, val in [
@@ -706,16 +733,23 @@ async def top(
                     f"Option --{opt} is mutually exclusive with job arguments"
                 )
 
-        async def create_pollers() -> None:
+        async def watch_jobs() -> None:
+            cluster_job_ids: Dict[str, List[str]] = {}
             for job_str in jobs:
                 job_id = await resolve_job(
                     job_str, client=root.client, status=JobStatus.active_items()
                 )
                 if job_id in observed:
                     continue
-                observed.add(job_id)
-                job = await root.client.jobs.status(job_id)
-                loop.create_task(poller(job))
+                job = JobSummary.from_job(await root.client.jobs.status(job_id))
+                observed[job_id] = job
+                cluster_job_ids.setdefault(job.cluster_name, []).append(job_id)
+            await asyncio.gather(
+                *(
+                    watch(cluster_name, job_ids)
+                    for cluster_name, job_ids in cluster_job_ids.items()
+                )
+            )
 
     else:
         owners = set(owner)
@@ -734,10 +768,17 @@ async def top(
         since_dt = _parse_date(since)
         until_dt = _parse_date(until)
 
-        async def create_pollers() -> None:
+        fields = calc_job_summary_fields(
+            format, [key.strip().lstrip("-") for key in sort.split(",")]
+        )
+        if description:
+            fields.add("description")
+
+        async def new_job_ids() -> AsyncIterator[str]:
             nonlocal since_dt
             while True:
-                async with root.client.jobs.list(
+                async with root.client.jobs.list_summaries(
+                    fields=fields,
                     statuses=JobStatus.active_items(),
                     name=name,
                     owners=owners,
@@ -758,29 +799,17 @@ async def top(
                     if since_dt is None or since_dt < dt:
                         since_dt = dt
                     async for job in jobs:
-                        job_id = job.id
-                        if job_id in observed:
+                        if job.id in observed:
                             continue
-                        observed.add(job_id)
-                        dt = job.history.created_at
+                        observed[job.id] = job
+                        dt = job.created_at
                         if dt is not None and since_dt < dt:
                             since_dt = dt
-                        loop.create_task(poller(job))
+                        yield job.id
                 await asyncio.sleep(TOP_NEW_JOBS_DELAY)
 
-    async def poller(job: JobDescription) -> None:
-        try:
-            async with root.client.jobs.top(
-                job.id, cluster_name=job.cluster_name
-            ) as it:
-                async for info in it:
-                    formatter.update(job, info)
-                    await asyncio.sleep(0)
-        except ValueError:
-            pass  # Job is finished.
-        finally:
-            formatter.remove(job.id)
-        await asyncio.sleep(0)
+        async def watch_jobs() -> None:
+            await watch(cluster, new_job_ids())
 
     async def renderer() -> None:
         async with async_timeout.timeout(timeout if timeout else None):
@@ -809,7 +838,7 @@ async def top(
         image_formatter=image_fmtr,
         datetime_formatter=datetime_fmtr,
     ) as formatter:
-        await asyncio.gather(create_pollers(), renderer())
+        await asyncio.gather(watch_jobs(), renderer())
 
 
 @command()
@@ -1371,10 +1400,12 @@ async def run_job(
         await root.client.users.share(user, permission)
     with JobStartProgress.create(console=root.console, quiet=root.quiet) as progress:
         progress.begin(job)
-        while wait_start and job.status.is_pending:
-            await asyncio.sleep(0.2)
-            job = await root.client.jobs.status(job.id)
-            progress.step(job)
+        if wait_start and job.status.is_pending:
+            async with root.client.jobs.watch(job.id) as it:
+                async for job in it:
+                    progress.step(job)
+                    if not job.status.is_pending:
+                        break
         progress.end(job)
 
     # Even if we detached, but the job has failed to start
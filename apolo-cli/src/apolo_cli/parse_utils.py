@@ -9,6 +9,7 @@ from typing import (
     List,
     Mapping,
     Optional,
+    Set,
     Tuple,
     TypeVar,
 )
@@ -16,7 +17,7 @@ from typing import (
 import click
 from rich.console import JustifyMethod
 
-from apolo_sdk import JobDescription, JobStatus, JobTelemetry
+from apolo_sdk import JobStatus, JobSummary, JobTelemetry
 
 _T = TypeVar("_T")
 
@@ -122,6 +123,17 @@ TOP_COLUMNS_DEFAULT_FORMAT = "id/name when cpu memory gpu gpu_memory"
 PS_COLUMNS_MAP = {column.id: column for column in PS_COLUMNS}
 TOP_COLUMNS_MAP = {column.id: column for column in TOP_COLUMNS}
 
+# Optional fields of JobSummary required for columns and sort keys
+JOB_SUMMARY_FIELDS = {
+    "tags": "tags",
+    "description": "description",
+    "image": "image",
+    "command": "command",
+    "life_span": "life_span",
+    "workdir": "working_dir",
+    "preset": "preset_name",
+}
+
 COLUMNS_RE = re.compile(
     r"""
     (?P<id>\w+(?:/\w+)*)|
@@ -273,6 +285,14 @@ def get_default_top_columns() -> JobTableFormat:
     return parse_top_columns(None)
 
 
+def calc_job_summary_fields(
+    columns: JobTableFormat, sort_keys: Iterable[str] = ()
+) -> Set[str]:
+    ids = [id for column in columns for id in column.id.split("/")]
+    ids.extend(sort_keys)
+    return {JOB_SUMMARY_FIELDS[id] for id in ids if id in JOB_SUMMARY_FIELDS}
+
+
 def parse_ps_columns(fmt: Optional[str]) -> JobTableFormat:
     return _parse_columns(fmt, PS_COLUMNS_MAP, PS_COLUMNS_DEFAULT_FORMAT)
 
@@ -283,7 +303,7 @@ def parse_top_columns(fmt: Optional[str]) -> JobTableFormat:
 
 class InvertKey:
     def __init__(self, value: Any) -> None:
-        self.value = Any
+        self.value = value
 
     def __lt__(self, other: Any) -> Any:
         return self.value > other.value
@@ -304,28 +324,28 @@ class InvertKey:
         return self.value != other.value
 
 
-JobTelemetryKeyFunc = Callable[[Tuple[JobDescription, JobTelemetry]], Any]
+JobTelemetryKeyFunc = Callable[[Tuple[JobSummary, JobTelemetry]], Any]
 
 JOB_STATUS_PRIORITIES = {status: i for i, status in enumerate(JobStatus)}
 DATETIME_MIN = datetime.min.replace(tzinfo=timezone.utc)
 INF = float("inf")
 
 SORT_KEY_FUNCS: Dict[str, JobTelemetryKeyFunc] = {
-    # JobDescriptor attibutes
+    # JobSummary attibutes
     "id": lambda item: item[0].id,
     "name": lambda item: item[0].name or "",
     "status": lambda item: JOB_STATUS_PRIORITIES[item[0].status],
-    "created": lambda item: item[0].history.created_at or DATETIME_MIN,
-    "started": lambda item: item[0].history.started_at or DATETIME_MIN,
-    "finished": lambda item: item[0].history.finished_at or DATETIME_MIN,
-    "when": lambda item: item[0].history.changed_at,
-    "image": lambda item: str(item[0].container.image),
+    "created": lambda item: item[0].created_at or DATETIME_MIN,
+    "started": lambda item: item[0].started_at or DATETIME_MIN,
+    "finished": lambda item: item[0].finished_at or DATETIME_MIN,
+    "when": lambda item: item[0].changed_at or DATETIME_MIN,
+    "image": lambda item: str(item[0].image),
     "owner": lambda item: item[0].owner,
     "description": lambda item: item[0].description or "",
     "cluster_name": lambda item: item[0].cluster_name,
-    "command": lambda item: item[0].container.command,
+    "command": lambda item: item[0].command or "",
     "life_span": lambda item: item[0].life_span or INF,
-    "workdir": lambda item: item[0].container.working_dir or "",
+    "workdir": lambda item: item[0].working_dir or "",
     "preset": lambda item: item[0].preset_name or "",
     "project_name": lambda item: item[0].project_name or "",
     # JobTelemetry attibutes
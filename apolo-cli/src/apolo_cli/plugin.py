@@ -34,6 +34,12 @@ def setup(manager: PluginManager) -> None:
     manager.config.define_str("job", "org-name", scope=ConfigScope.LOCAL)
     manager.config.define_str_list("storage", "cp-exclude")
     manager.config.define_str_list("storage", "cp-exclude-from-files")
+    manager.config.define_int("storage", "chunk-size")
+    manager.config.define_int("storage", "min-chunk-size")
+    manager.config.define_int("storage", "max-chunk-size")
+    manager.config.define_bool("storage", "adaptive-chunk-size")
+    manager.config.define_int("storage", "io-threads")
+    manager.config.define_int("storage", "parallel-parts")
 
     manager.version_checker.register("apolo-cli", get_apolo_cli_txt)
     manager.version_checker.register("certifi", get_certifi_txt, delay=14 * 3600 * 24)
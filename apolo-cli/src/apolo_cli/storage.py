@@ -13,6 +13,7 @@ from yarl import URL
 from apolo_sdk import (
     Client,
     FileFilter,
+    FileStatus,
     FileStatusType,
     IllegalArgumentError,
     ResourceNotFound,
@@ -38,6 +39,9 @@ from .utils import Option, argument, command, group, option, parse_file_resource
 
 APOLOIGNORE_FILENAME = ".apoloignore"
 NEUROIGNORE_FILENAME = ".neuroignore"
+MAX_TREE_LISTINGS = 4
+# Entries of unsorted listing rendered at once
+LS_PAGE_SIZE = 1000
 
 log = logging.getLogger(__name__)
 
@@ -143,16 +147,17 @@ async def rm(
 @option("-l", "format_long", is_flag=True, help="use a long listing format.")
 @option(
     "--sort",
-    type=click.Choice(["name", "size", "time"]),
-    default="name",
-    help="sort by given field, default is name.",
+    type=click.Choice(["name", "size", "time", "none"]),
+    default=None,
+    help="sort by given field, default is name for a terminal and none "
+    "otherwise. With none entries are printed as they are received.",
 )
 async def ls(
     root: Root,
     paths: Sequence[URL],
     human_readable: bool,
     format_long: bool,
-    sort: str,
+    sort: Optional[str],
     directory: bool,
     show_all: bool,
 ) -> None:
@@ -160,9 +165,30 @@ async def ls(
     List directory contents.
 
     By default PATH is equal project's dir (storage:)
+
+    Unless --sort is specified, the output which is not a terminal is not
+    sorted: entries of huge directories are printed as they are received,
+    without collecting the whole listing in memory.
     """
     if not paths:
         paths = [URL("storage:")]
+    if sort is None:
+        # The piped output can be sorted by the receiver
+        sort = "name" if root.tty else "none"
+    if format_long:
+        formatter: BaseFilesFormatter = LongFilesFormatter(
+            human_readable=human_readable, color=root.color
+        )
+    elif root.tty and not root.quiet:
+        if sort == "none":
+            # Columns cannot be laid out before all entries are received
+            formatter = SimpleFilesFormatter(root.color)
+        else:
+            formatter = VerticalColumnsFilesFormatter(
+                width=root.terminal_size[0], color=root.color
+            )
+    else:
+        formatter = SimpleFilesFormatter(False)
     errors = False
     for uri in paths:
         try:
@@ -174,6 +200,9 @@ async def ls(
                     uri_text = painter.paint(str(uri), FileStatusType.DIRECTORY)
                     root.print(Text.assemble("List of ", uri_text, ":"))
 
+                if sort == "none":
+                    await _ls_unsorted(root, uri, formatter, show_all)
+                    continue
                 async with root.client.storage.list(uri) as it:
                     files = [file async for file in it]
                 files.sort(key=FilesSorter(sort).key())
@@ -181,18 +210,6 @@ async def ls(
             log.error(f"cannot access {uri}: {error}")
             errors = True
         else:
-            if format_long:
-                formatter: BaseFilesFormatter = LongFilesFormatter(
-                    human_readable=human_readable, color=root.color
-                )
-            else:
-                if root.tty and not root.quiet:
-                    formatter = VerticalColumnsFilesFormatter(
-                        width=root.terminal_size[0], color=root.color
-                    )
-                else:
-                    formatter = SimpleFilesFormatter(False)
-
             if not show_all:
                 files = [item for item in files if not item.name.startswith(".")]
             with root.pager():
@@ -202,6 +219,23 @@ async def ls(
         sys.exit(EX_OSFILE)
 
 
+async def _ls_unsorted(
+    root: Root, uri: URL, formatter: BaseFilesFormatter, show_all: bool
+) -> None:
+    # Pages are printed bypassing the pager, it would collect the whole output
+    page: List[FileStatus] = []
+    async with root.client.storage.list(uri) as it:
+        async for file in it:
+            if not show_all and file.name.startswith("."):
+                continue
+            page.append(file)
+            if len(page) >= LS_PAGE_SIZE:
+                root.print(formatter(page))
+                page = []
+    if page:
+        root.print(formatter(page))
+
+
 @command()
 @argument(
     "patterns",
@@ -329,6 +363,14 @@ def filter_option(
     is_flag=True,
     help="Continue copying partially-copied files.",
 )
+@option(
+    "--parallel",
+    type=click.IntRange(min=1),
+    metavar="N",
+    default=1,
+    show_default=True,
+    help="Number of chunks of a single file transferred concurrently.",
+)
 @filter_option(
     "--exclude",
     "filters",
@@ -368,6 +410,7 @@ async def cp(
     no_target_directory: bool,
     update: bool,
     continue_: bool,
+    parallel: int,
     filters: Optional[Tuple[Tuple[bool, str], ...]],
     exclude_from_files: str,
     progress: bool,
@@ -413,6 +456,9 @@ async def cp(
 
     # download only files with extension `.out` into the current directory
     apolo cp storage:results/*.out .
+
+    # copy remote directory `foo` into other project's remote directory `bar`
+    apolo cp -r storage:foo storage:/{project}/bar
     """
     if target_directory:
         if no_target_directory:
@@ -471,6 +517,7 @@ async def cp(
                             continue_=continue_,
                             filter=file_filter.match,
                             ignore_file_names=frozenset(ignore_file_names),
+                            parallel=parallel,
                             progress=progress_obj,
                         )
                     else:
@@ -479,6 +526,7 @@ async def cp(
                             destination,
                             update=update,
                             continue_=continue_,
+                            parallel=parallel,
                             progress=progress_obj,
                         )
                 elif src.scheme == "storage" and destination.scheme == "file":
@@ -489,6 +537,7 @@ async def cp(
                             update=update,
                             continue_=continue_,
                             filter=file_filter.match,
+                            parallel=parallel,
                             progress=progress_obj,
                         )
                     else:
@@ -497,6 +546,27 @@ async def cp(
                             destination,
                             update=update,
                             continue_=continue_,
+                            parallel=parallel,
+                            progress=progress_obj,
+                        )
+                elif src.scheme == "storage" and destination.scheme == "storage":
+                    if recursive and await _is_dir(root, src):
+                        await root.client.storage.copy_dir(
+                            src,
+                            destination,
+                            update=update,
+                            continue_=continue_,
+                            filter=file_filter.match,
+                            parallel=parallel,
+                            progress=progress_obj,
+                        )
+                    else:
+                        await root.client.storage.copy_file(
+                            src,
+                            destination,
+                            update=update,
+                            continue_=continue_,
+                            parallel=parallel,
                             progress=progress_obj,
                         )
                 else:
@@ -507,7 +577,7 @@ async def cp(
                         " Checkout 'apolo-extras data --help',"
                         " maybe it will suite your use-case?"
                     )
-        except (OSError, ResourceNotFound, IllegalArgumentError) as error:
+        except (OSError, ResourceNotFound, IllegalArgumentError, ValueError) as error:
             log.error(f"cannot copy {src} to {destination}: {error}")
             errors = True
 
@@ -515,6 +585,100 @@ async def cp(
         sys.exit(EX_OSFILE)
 
 
+@command()
+@argument(
+    "source",
+    type=PlatformURIType(allowed_schemes=["storage", "file"], complete_file=False),
+)
+@argument(
+    "destination",
+    type=PlatformURIType(allowed_schemes=["storage", "file"], complete_file=False),
+)
+@option(
+    "--delete",
+    is_flag=True,
+    help="Delete files and directories in DESTINATION missing in SOURCE.",
+)
+@filter_option(
+    "--exclude",
+    "filters",
+    is_exclude=True,
+    help=("Exclude files and directories that match the specified pattern."),
+)
+@filter_option(
+    "--include",
+    "filters",
+    is_exclude=False,
+    help=("Don't exclude files and directories that match the specified pattern."),
+)
+@option(
+    "--exclude-from-files",
+    metavar="FILES",
+    help=(
+        "A list of file names that contain patterns for exclusion files "
+        "and directories. Used only for uploading. "
+        "The default can be changed using the storage.cp-exclude-from-files "
+        'configuration variable documented in "apolo help user-config"'
+    ),
+)
+@option(
+    "-p/-P",
+    "--progress/--no-progress",
+    is_flag=True,
+    default=True,
+    help="Show progress, on by default in TTY mode, off otherwise.",
+)
+async def sync(
+    root: Root,
+    source: URL,
+    destination: URL,
+    delete: bool,
+    filters: Optional[Tuple[Tuple[bool, str], ...]],
+    exclude_from_files: str,
+    progress: bool,
+) -> None:
+    """
+    Synchronize directories.
+
+    Copy new and changed files from SOURCE directory to DESTINATION
+    directory.  One of them should have storage:// scheme, other should be
+    a local directory.  If scheme is omitted, file:// scheme is assumed.
+
+    Files are compared by their content hashes remembered at the previous
+    synchronization, so files which were only touched are not copied again.
+
+    Examples:
+
+    # upload changes of local directory `foo` to remote directory `bar`
+    apolo storage sync foo storage:bar
+
+    # download remote directory `bar` and delete local files missing in it
+    apolo storage sync --delete storage:bar foo
+    """
+    ignore_file_names = await calc_ignore_file_names(root.client, exclude_from_files)
+    filters = await calc_filters(root.client, filters)
+    file_filter = FileFilter()
+    for exclude, pattern in filters:
+        log.debug("%s %s", "Exclude" if exclude else "Include", pattern)
+        file_filter.append(exclude, pattern)
+
+    show_progress = root.tty and progress
+    progress_obj = create_storage_progress(root, show_progress)
+    try:
+        with progress_obj.begin(source, destination):
+            await root.client.storage.sync(
+                source,
+                destination,
+                delete=delete,
+                filter=file_filter.match,
+                ignore_file_names=frozenset(ignore_file_names),
+                progress=progress_obj,
+            )
+    except (OSError, ResourceNotFound, IllegalArgumentError, ValueError) as error:
+        log.error(f"cannot sync {source} to {destination}: {error}")
+        sys.exit(EX_OSFILE)
+
+
 @command()
 @argument(
     "paths",
@@ -793,6 +957,7 @@ async def _is_dir(root: Root, uri: URL) -> bool:
 
 
 storage.add_command(cp)
+storage.add_command(sync)
 storage.add_command(ls)
 storage.add_command(glob)
 storage.add_command(rm)
@@ -832,23 +997,36 @@ async def calc_ignore_file_names(
     return ignore_file_names
 
 
-async def fetch_tree(client: Client, uri: URL, show_all: bool) -> Tree:
+async def fetch_tree(
+    client: Client,
+    uri: URL,
+    show_all: bool,
+    *,
+    sem: Optional[asyncio.Semaphore] = None,
+) -> Tree:
+    if sem is None:
+        sem = asyncio.Semaphore(MAX_TREE_LISTINGS)
     loop = asyncio.get_event_loop()
     folders = []
     files = []
     tasks = []
     size = 0
-    async with client.storage.list(uri) as it:
-        async for item in it:
-            if not show_all and item.name.startswith("."):
-                continue
-            if item.is_dir():
-                tasks.append(
-                    loop.create_task(fetch_tree(client, uri / item.name, show_all))
-                )
-            else:
-                files.append(item)
-                size += item.size
+    # Only the listing itself is limited, waiting for subtrees is not,
+    # otherwise deep trees would deadlock.
+    async with sem:
+        async with client.storage.list(uri) as it:
+            async for item in it:
+                if not show_all and item.name.startswith("."):
+                    continue
+                if item.is_dir():
+                    tasks.append(
+                        loop.create_task(
+                            fetch_tree(client, uri / item.name, show_all, sem=sem)
+                        )
+                    )
+                else:
+                    files.append(item)
+                    size += item.size
     for task in tasks:
         subtree = await task
         folders.append(subtree)
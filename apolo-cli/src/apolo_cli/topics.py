@@ -250,6 +250,35 @@ async def user_config() -> None:
     every line contains a pattern, and the exclamation mark `!` is used to negate
     the pattern. Empty lines and lines which start with `#` are ignored.
 
+    **`chunk-size`**
+
+    Initial size of chunks in bytes for uploading files to the storage and
+    to buckets. Default is `1048576` (1 MiB) for the storage; for buckets
+    it is the smallest part size supported by the provider.
+
+    The chunk size is adjusted during the transfer: it grows while requests
+    complete fast and shrinks when requests are slow or fail.
+
+    **`min-chunk-size`**, **`max-chunk-size`**
+
+    Limits for the adjusted chunk size in bytes. Defaults are `262144`
+    (256 KiB) and `67108864` (64 MiB).
+
+    **`adaptive-chunk-size`**
+
+    Set to `false` to always use the `chunk-size` instead of adjusting it.
+    Default is `true`.
+
+    **`io-threads`**
+
+    The number of threads for reading and writing local files during
+    transfers. Default is `16`.
+
+    **`parallel-parts`**
+
+    The number of parts of a single file uploaded to or downloaded from
+    a bucket concurrently. Default is `4`.
+
     `[disk]` section
     ----------------
 
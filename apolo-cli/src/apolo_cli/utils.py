@@ -469,19 +469,12 @@ async def resolve_job_ex(
         return id_or_name, cluster_name
 
     try:
-        async with client.jobs.list(
-            name=id_or_name,
-            project_names=project_names.keys(),
-            reverse=True,
-            cluster_name=cluster_name,
-        ) as it:
-            async for job in it:
-                if (
-                    job.project_name in project_names
-                    and job.org_name == project_names[job.project_name]
-                ):
-                    log.debug(f"Job name '{id_or_name}' resolved to job ID '{job.id}'")
-                    return job.id, cluster_name
+        job_id = await client.jobs.resolve_name(
+            id_or_name, cluster_name=cluster_name, projects=project_names
+        )
+        if job_id is not None:
+            log.debug(f"Job name '{id_or_name}' resolved to job ID '{job_id}'")
+            return job_id, cluster_name
     except asyncio.CancelledError:
         raise
     except ClientResponseError as e:
@@ -66,6 +66,20 @@ def test_ls_directory_itself(helper: Helper) -> None:
     assert captured.out.splitlines() == [name]
 
 
+@pytest.mark.e2e
+def test_ls_unsorted(helper: Helper) -> None:
+    helper.mkdir("folder/subfolder", parents=True)
+    helper.mkdir("folder/.hidden", parents=True)
+    helper.mkdir("folder/another", parents=True)
+    captured = helper.run_cli(
+        ["storage", "ls", "--sort", "none", helper.tmpstorage / "folder"]
+    )
+    assert sorted(captured.out.splitlines()) == ["another", "subfolder"]
+    # The output which is not a terminal is not sorted by default
+    captured = helper.run_cli(["storage", "ls", helper.tmpstorage / "folder"])
+    assert sorted(captured.out.splitlines()) == ["another", "subfolder"]
+
+
 @pytest.mark.e2e
 def test_e2e_mkdir(helper: Helper) -> None:
     helper.run_cli(["storage", "mkdir", "--parents", helper.tmpstorage / "folder"])
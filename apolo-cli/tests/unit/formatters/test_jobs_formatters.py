@@ -1805,6 +1805,35 @@ class TestJobTelemetryFormatter:
             assert not fmt.changed
             rich_cmp(console, index=2)
 
+    def test_format_telemetry_unchanged(
+        self,
+        job_descr: JobDescription,
+        new_console: _NewConsole,
+        datetime_formatter: DatetimeFormatter,
+    ) -> None:
+        console = new_console(tty=True, color=True)
+        with JobTelemetryFormatter(
+            console,
+            "owner",
+            parse_sort_keys("cpu"),
+            parse_top_columns(None),
+            image_formatter=str,
+            datetime_formatter=datetime_formatter,
+        ) as fmt:
+            telemetry = JobTelemetry(
+                cpu=0.12345, memory_bytes=int(256.123 * 2**20), timestamp=1.0
+            )
+            fmt.update(job_descr, telemetry)
+            fmt.render()
+            assert not fmt.changed
+
+            # Only the timestamp differs
+            fmt.update(job_descr, replace(telemetry, timestamp=2.0))
+            assert not fmt.changed
+
+            fmt.update(job_descr, replace(telemetry, cpu=0.5))
+            assert fmt.changed
+
     def test_format_telemetry_limited_height(
         self,
         job_descr: JobDescription,
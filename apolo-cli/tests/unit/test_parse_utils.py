@@ -7,6 +7,7 @@ from apolo_cli.parse_utils import (
     PS_COLUMNS_MAP,
     SORT_KEY_FUNCS,
     JobColumnInfo,
+    calc_job_summary_fields,
     get_default_ps_columns,
     get_default_top_columns,
     parse_memory,
@@ -199,6 +200,17 @@ def test_parse_sort_keys() -> None:
         parse_sort_keys("")
 
 
+def test_calc_job_summary_fields() -> None:
+    assert calc_job_summary_fields(parse_ps_columns("id name status when")) == set()
+    assert calc_job_summary_fields(get_default_ps_columns()) == {
+        "image",
+        "command",
+    }
+    assert calc_job_summary_fields(
+        parse_top_columns("id workdir/preset"), ["-cpu", "image"]
+    ) == {"working_dir", "preset_name", "image"}
+
+
 def test_parse_timedelta_valid_zero() -> None:
     assert parse_timedelta("0") == timedelta(0)
 
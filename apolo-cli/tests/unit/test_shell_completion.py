@@ -37,6 +37,7 @@ from apolo_sdk import (
     Jobs,
     JobStatus,
     JobStatusHistory,
+    JobSummary,
     PersistentBucketCredentials,
     RemoteImage,
     Resources,
@@ -642,7 +643,7 @@ def make_job(
 
 @skip_on_windows
 def test_job_autocomplete(run_autocomplete: _RunAC) -> None:
-    with mock.patch.object(Jobs, "list") as mocked_list:
+    with mock.patch.object(Jobs, "list_cached") as mocked_list:
         jobs = [
             make_job("job-0123-4567", owner="user", project_name="project"),
             make_job(
@@ -665,25 +666,22 @@ def test_job_autocomplete(run_autocomplete: _RunAC) -> None:
         ]
 
         @asyncgeneratorcontextmanager
-        async def list(
+        async def list_cached(
             *,
             since: Optional[datetime] = None,
-            reverse: bool = False,
             limit: Optional[int] = None,
             cluster_name: Optional[str] = None,
-            owners: Iterable[str] = (),
+            org_name: Optional[str] = None,
             project_names: Iterable[str] = (),
-        ) -> AsyncIterator[JobDescription]:
+        ) -> AsyncIterator[JobSummary]:
             for job in jobs:
                 if cluster_name and job.cluster_name != cluster_name:
                     continue
-                if owners and job.owner not in owners:
-                    continue
                 if project_names and job.project_name not in project_names:
                     continue
-                yield job
+                yield JobSummary.from_job(job)
 
-        mocked_list.side_effect = list
+        mocked_list.side_effect = list_cached
 
         zsh_out, bash_out = run_autocomplete(["job", "status", "j"])
         assert bash_out == "uri,job:,"
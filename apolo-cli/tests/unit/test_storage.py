@@ -1,11 +1,16 @@
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, AsyncIterator, Callable
+from unittest import mock
 
 import toml
+from yarl import URL
 
-from apolo_sdk import Client, PluginManager
+from apolo_sdk import Action, Client, FileStatus, FileStatusType, PluginManager
+from apolo_sdk._utils import asyncgeneratorcontextmanager
 
-from apolo_cli.storage import calc_filters, calc_ignore_file_names
+import apolo_cli.storage
+from apolo_cli.formatters.storage import SimpleFilesFormatter
+from apolo_cli.storage import _ls_unsorted, calc_filters, calc_ignore_file_names
 
 _MakeClient = Callable[..., Client]
 
@@ -110,3 +115,29 @@ async def test_calc_ignore_file_names_user_spec(
             )
         )
         assert await calc_ignore_file_names(client, None) == [".gitignore", ".hgignore"]
+
+
+async def test_ls_unsorted_pages(monkeypatch: Any) -> None:
+    monkeypatch.setattr(apolo_cli.storage, "LS_PAGE_SIZE", 2)
+    names = ["b", ".hidden", "a", "d", "c"]
+
+    @asyncgeneratorcontextmanager
+    async def list(uri: URL) -> AsyncIterator[FileStatus]:
+        for name in names:
+            yield FileStatus(
+                path=name,
+                size=0,
+                type=FileStatusType.FILE,
+                modification_time=0,
+                permission=Action.READ,
+                uri=uri / name,
+            )
+
+    root = mock.Mock()
+    root.client.storage.list = list
+
+    await _ls_unsorted(root, URL("storage:dir"), SimpleFilesFormatter(False), False)
+
+    # Entries are printed in the received order a page at a time
+    pages = [str(call.args[0]) for call in root.print.call_args_list]
+    assert pages == ["b\na", "d\nc"]
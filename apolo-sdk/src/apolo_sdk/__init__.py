@@ -120,6 +120,7 @@ from ._jobs import (
     JobStatus,
     JobStatusHistory,
     JobStatusItem,
+    JobSummary,
     JobTelemetry,
     Resources,
     StdStream,
@@ -200,6 +201,7 @@ __all__ = (
     "JobStatus",
     "JobStatusHistory",
     "JobStatusItem",
+    "JobSummary",
     "JobTelemetry",
     "Jobs",
     "LocalImage",
@@ -4,10 +4,21 @@ from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from io import BytesIO
-from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Tuple, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
+from azure.core import MatchConditions
 from azure.core.credentials import AzureSasCredential
-from azure.core.exceptions import ResourceNotFoundError
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
 from azure.storage.blob import BlobBlock
 from azure.storage.blob.aio import ContainerClient
 from azure.storage.blob.aio._list_blobs_helper import BlobPrefix
@@ -23,15 +34,27 @@ from ._bucket_base import (
     MeasureTimeDiffMixin,
 )
 from ._errors import ResourceNotFound
-from ._utils import asyncgeneratorcontextmanager
+from ._utils import aclosing, asyncgeneratorcontextmanager
 
 
 class AzureProvider(MeasureTimeDiffMixin, BucketProvider):
-    def __init__(self, container_client: ContainerClient, bucket: "Bucket") -> None:
+    # Stage blocks of at least 4 MiB, smaller blocks waste round trips
+    MIN_CHUNK_SIZE = 4 * 2**20
+    MAX_PARTS = 50_000
+    # Seconds between checks of a pending server-side copy
+    COPY_POLL_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        container_client: ContainerClient,
+        bucket: "Bucket",
+        sas_credential: Optional[AzureSasCredential] = None,
+    ) -> None:
         super().__init__()
         self.bucket = bucket
 
         self._client = container_client
+        self._sas_credential = sas_credential
 
         def _extract_date(resp: Any) -> datetime:
             date_str = resp.http_response.headers["Date"]
@@ -91,7 +114,11 @@ class AzureProvider(MeasureTimeDiffMixin, BucketProvider):
                     credential=credential,
                 )
             )
-            yield cls(container_client, bucket)
+            yield cls(
+                container_client,
+                bucket,
+                credential if isinstance(credential, AzureSasCredential) else None,
+            )
 
     @asyncgeneratorcontextmanager
     async def list_blobs(
@@ -146,32 +173,68 @@ class AzureProvider(MeasureTimeDiffMixin, BucketProvider):
         key: str,
         body: Union[AsyncIterator[bytes], bytes],
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
     ) -> None:
         blob_client = self._client.get_blob_client(key)
         if isinstance(body, bytes):
             await blob_client.upload_blob(BytesIO(body))
-        else:
-            blocks = []
-            async for data in body:
-                block_id = secrets.token_hex(16)
-                await blob_client.stage_block(block_id, BytesIO(data))
-                if progress:
-                    await progress(len(data))
-                blocks.append(BlobBlock(block_id=block_id))
-            await blob_client.commit_block_list(blocks)
+            return
+
+        async def _stage_block(part_number: int, data: bytearray) -> Optional[str]:
+            if not data:
+                # An empty blob has no blocks
+                return None
+            # All block ids of a blob must have the same length
+            block_id = secrets.token_hex(16)
+            await blob_client.stage_block(block_id, BytesIO(data))
+            return block_id
+
+        block_ids = await self._upload_parts(
+            body, _stage_block, size=size, progress=progress
+        )
+        await blob_client.commit_block_list(
+            [BlobBlock(block_id=block_id) for block_id in block_ids if block_id]
+        )
 
     @asyncgeneratorcontextmanager
     async def fetch_blob(self, key: str, offset: int = 0) -> AsyncIterator[bytes]:
+        blob_client = self._client.get_blob_client(key)
+        part_size = self._get_part_size()
+        # The first range also tells the size of the blob
         try:
-            downloader = await self._client.get_blob_client(key).download_blob(
-                offset=offset
+            downloader = await blob_client.download_blob(
+                offset=offset, length=part_size
             )
         except ResourceNotFoundError:
             raise ResourceNotFound(
                 f"There is no object with key {key} in bucket {self.bucket.name}"
             )
+        props = downloader.properties
+        # properties.size is the size of the downloaded range,
+        # the size of the blob is only in the content range
+        assert props.content_range is not None
+        size = int(props.content_range.rpartition("/")[2])
         async for chunk in downloader.chunks():
             yield chunk
+        if offset + part_size >= size:
+            return
+
+        async def _fetch_range(start: int, end: int) -> bytes:
+            # Ranges of a blob overwritten in the meantime must not be mixed
+            downloader = await blob_client.download_blob(
+                offset=start,
+                length=end - start,
+                etag=props.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+            return await downloader.readall()
+
+        async with aclosing(
+            self._fetch_ranges(_fetch_range, offset + part_size, size)
+        ) as it:
+            async for chunk in it:
+                yield chunk
 
     async def delete_blob(self, key: str) -> None:
         try:
@@ -181,6 +244,61 @@ class AzureProvider(MeasureTimeDiffMixin, BucketProvider):
                 f"There is no object with key {key} in bucket {self.bucket.name}"
             )
 
+    MAX_DELETE_BATCH = 256
+
+    async def delete_blobs(self, keys: Sequence[str]) -> None:
+        responses = await self._client.delete_blobs(*keys, raise_on_any_failure=False)
+        async for response in responses:
+            if response.status_code not in (202, 404):
+                raise HttpResponseError(response=response)
+
+    def _get_blob_url(self, key: str) -> str:
+        url = self._client.get_blob_client(key).url
+        if self._sas_credential is not None:
+            url += "?" + self._sas_credential.signature.lstrip("?")
+        return url
+
+    def can_copy_from(self, src: BucketProvider) -> bool:
+        # The source is authorized by its SAS token, or by the credential
+        # of the destination within the same storage account
+        return isinstance(src, AzureProvider) and (
+            src._sas_credential is not None
+            or src._client.account_name == self._client.account_name
+        )
+
+    async def copy_blob(
+        self,
+        src: BucketProvider,
+        src_key: str,
+        key: str,
+        *,
+        size: int,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> None:
+        assert isinstance(src, AzureProvider)
+        blob_client = self._client.get_blob_client(key)
+        props = await blob_client.start_copy_from_url(src._get_blob_url(src_key))
+        # The value is a string, the properties are typed as str | datetime
+        status: Optional[str] = cast(str, props["copy_status"])
+        description = None
+        copied = 0
+        # Copying of large blobs continues in background
+        while status == "pending":
+            await asyncio.sleep(self.COPY_POLL_INTERVAL)
+            copy = (await blob_client.get_blob_properties()).copy
+            status = copy.status
+            description = copy.status_description
+            if copy.progress and progress is not None:
+                # In form "<bytes copied>/<total bytes>"
+                done = int(copy.progress.partition("/")[0])
+                if done > copied:
+                    await progress(done - copied)
+                    copied = done
+        if status != "success":
+            raise HttpResponseError(message=f"Copy to {key} is {status}: {description}")
+        if progress is not None and size > copied:
+            await progress(size - copied)
+
     async def get_time_diff_to_local(self) -> Tuple[float, float]:
         if self._min_time_diff is None or self._max_time_diff is None:
             return 0, 0
@@ -1,26 +1,52 @@
 import abc
+import asyncio
+import collections
 import enum
 import time
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import PurePosixPath
 from typing import (
     Any,
+    AsyncGenerator,
     AsyncIterator,
     Awaitable,
     Callable,
+    Deque,
+    Dict,
+    Iterator,
     List,
     Mapping,
     Optional,
+    Sequence,
     Tuple,
+    TypeVar,
     Union,
 )
 
 from yarl import URL
 
+from ._chunk_size import ChunkSizeController
+from ._errors import ResourceNotFound
+from ._file_reader import BufferPool
 from ._rewrite import rewrite_module
-from ._utils import AsyncContextManager
+from ._utils import (
+    AsyncContextManager,
+    aclosing,
+    asyncgeneratorcontextmanager,
+    run_concurrently,
+)
+
+DEFAULT_PARALLEL_PARTS = 4
+# Levels of common prefixes expanded to find shards for parallel listing
+MAX_SHARD_DEPTH = 3
+# Entries of a listed shard kept in memory ahead of the consumer
+SHARD_BUFFER_SIZE = 10_000
+# Bytes of ranged downloads kept in memory ahead of the consumer
+MAX_FETCH_AHEAD = 64 * 2**20  # 64 MiB
+
+_T = TypeVar("_T")
 
 
 @rewrite_module
@@ -83,6 +109,273 @@ class BucketProvider(abc.ABC):
 
     bucket: "Bucket"
 
+    # The smallest size of uploaded parts
+    MIN_CHUNK_SIZE = 2**20  # 1 MiB
+    # The largest number of parts of a single blob
+    MAX_PARTS = 10_000
+    # The largest number of keys in a single delete_blobs() call
+    MAX_DELETE_BATCH = 100
+    _chunk_size: Optional[ChunkSizeController] = None
+    _parallel_parts: int = DEFAULT_PARALLEL_PARTS
+
+    def _get_part_size(self, size: Optional[int] = None) -> int:
+        if self._chunk_size is None:
+            part_size = self.MIN_CHUNK_SIZE
+        else:
+            part_size = self._chunk_size.size
+        if size is not None:
+            # Large blobs need larger parts to fit into MAX_PARTS
+            part_size = max(part_size, -(-size // self.MAX_PARTS))
+        return part_size
+
+    @contextmanager
+    def _measure(self, nbytes: int) -> Iterator[None]:
+        if self._chunk_size is None:
+            yield
+        else:
+            with self._chunk_size.measure(nbytes):
+                yield
+
+    async def _upload_parts(
+        self,
+        body: AsyncIterator[bytes],
+        upload_part: Callable[[int, bytearray], Awaitable[_T]],
+        *,
+        size: Optional[int] = None,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> List[_T]:
+        """Split *body* into parts and upload them concurrently.
+
+        *upload_part* is called with the part number starting from 1 and
+        the part data.  Up to ``_parallel_parts`` parts are uploaded at once
+        while the next parts are read, buffers of uploaded parts are reused.
+        At least one part is uploaded, it is empty for an empty body.
+        Return the results of *upload_part* in the order of parts.
+        """
+        parallel = max(self._parallel_parts, 1)
+        pool = BufferPool(max_idle=parallel)
+        queue: "asyncio.Queue[Optional[Tuple[int, bytearray, int]]]"
+        queue = asyncio.Queue(parallel)
+        results: Dict[int, _T] = {}
+
+        async def reader() -> None:
+            part_number = 0
+            buf: Optional[bytearray] = None
+            pos = 0
+            async for chunk in body:
+                view = memoryview(chunk)
+                while view:
+                    if buf is None:
+                        buf = pool.acquire(self._get_part_size(size))
+                        pos = 0
+                    n = min(len(buf) - pos, len(view))
+                    buf[pos : pos + n] = view[:n]
+                    pos += n
+                    view = view[n:]
+                    if pos == len(buf):
+                        part_number += 1
+                        await queue.put((part_number, buf, pos))
+                        buf = None
+            if buf is not None or part_number == 0:
+                # Either the final part or an empty blob
+                part_number += 1
+                await queue.put((part_number, buf or bytearray(), pos))
+            for _ in range(parallel):
+                await queue.put(None)
+
+        async def uploader() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                part_number, buf, length = item
+                try:
+                    with self._measure(length):
+                        results[part_number] = await upload_part(
+                            part_number, buf if length == len(buf) else buf[:length]
+                        )
+                finally:
+                    pool.release(buf)
+                if progress is not None:
+                    await progress(length)
+
+        await run_concurrently([reader(), *(uploader() for _ in range(parallel))])
+        return [results[part_number] for part_number in sorted(results)]
+
+    async def _fetch_ranges(
+        self,
+        fetch_range: Callable[[int, int], Awaitable[bytes]],
+        start: int,
+        end: int,
+    ) -> AsyncGenerator[bytes, None]:
+        """Download bytes from *start* to *end* with concurrent range requests.
+
+        *fetch_range* is called with the start and the end (exclusive) of
+        a range.  Up to ``_parallel_parts`` ranges are requested ahead of
+        the consumer, the data is yielded in order.
+        """
+        parallel = max(self._parallel_parts, 1)
+        # Ranges are kept in memory until they are consumed, so no more
+        # than MAX_FETCH_AHEAD bytes are requested ahead
+        part_size = max(
+            min(self._get_part_size(), MAX_FETCH_AHEAD // parallel),
+            self.MIN_CHUNK_SIZE,
+        )
+        parallel = max(min(parallel, MAX_FETCH_AHEAD // part_size), 1)
+        starts = iter(range(start, end, part_size))
+        pending: Deque["asyncio.Future[bytes]"] = collections.deque()
+
+        def _schedule() -> None:
+            pos = next(starts, None)
+            if pos is not None:
+                pending.append(
+                    asyncio.ensure_future(fetch_range(pos, min(pos + part_size, end)))
+                )
+
+        try:
+            for _ in range(parallel):
+                _schedule()
+            while pending:
+                data = await pending.popleft()
+                _schedule()
+                yield data
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+
+    @asyncgeneratorcontextmanager
+    async def _list_blobs_sharded(
+        self, prefix: str, parallel: int, *, ordered: bool = True
+    ) -> AsyncIterator[BucketEntry]:
+        """Recursively list keys under *prefix* with concurrent listings.
+
+        The keys are split into shards by common prefixes, up to *parallel*
+        shards are listed at once.  If *ordered* is true, the entries are
+        yielded in key order, otherwise as soon as they are received.
+        """
+        items = await self._find_shards(prefix, parallel)
+        if ordered:
+            it = self._iter_shards_ordered(items, parallel)
+        else:
+            it = self._iter_shards_unordered(items, parallel)
+        async with aclosing(it):
+            async for entry in it:
+                yield entry
+
+    async def _find_shards(self, prefix: str, parallel: int) -> List[BucketEntry]:
+        # Expand common prefixes level by level while there are too few
+        # of them.  Objects found on the way are kept at their positions,
+        # so that the list stays in key order.
+        items: List[BucketEntry] = [
+            BlobCommonPrefix(bucket=self.bucket, key=prefix, size=0)
+        ]
+        for _ in range(MAX_SHARD_DEPTH):
+            shards = [item for item in items if isinstance(item, BlobCommonPrefix)]
+            if not shards or len(shards) >= parallel:
+                break
+            expanded: List[BucketEntry] = []
+            for item in items:
+                if isinstance(item, BlobCommonPrefix):
+                    async with self.list_blobs(item.key, recursive=False) as it:
+                        children = [entry async for entry in it]
+                    expanded.extend(sorted(children, key=lambda entry: entry.key))
+                else:
+                    expanded.append(item)
+            items = expanded
+        return items
+
+    async def _list_into(
+        self,
+        prefixes: Iterator[str],
+        queue: "asyncio.Queue[Union[BucketEntry, Exception, None]]",
+    ) -> None:
+        try:
+            for prefix in prefixes:
+                async with self.list_blobs(prefix, recursive=True) as it:
+                    async for entry in it:
+                        await queue.put(entry)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+
+    async def _iter_shards_ordered(
+        self, items: List[BucketEntry], parallel: int
+    ) -> AsyncGenerator[BucketEntry, None]:
+        shards = iter([item for item in items if isinstance(item, BlobCommonPrefix)])
+        started: Dict[
+            str,
+            Tuple[
+                "asyncio.Queue[Union[BucketEntry, Exception, None]]",
+                "asyncio.Future[None]",
+            ],
+        ] = {}
+
+        def _start() -> None:
+            shard = next(shards, None)
+            if shard is not None:
+                queue: "asyncio.Queue[Union[BucketEntry, Exception, None]]"
+                queue = asyncio.Queue(SHARD_BUFFER_SIZE)
+                task = asyncio.ensure_future(self._list_into(iter([shard.key]), queue))
+                started[shard.key] = (queue, task)
+
+        try:
+            for _ in range(parallel):
+                _start()
+            for item in items:
+                if not isinstance(item, BlobCommonPrefix):
+                    yield item
+                    continue
+                queue, _ = started[item.key]
+                while True:
+                    entry = await queue.get()
+                    if entry is None:
+                        break
+                    if isinstance(entry, Exception):
+                        raise entry
+                    yield entry
+                del started[item.key]
+                _start()
+        finally:
+            tasks = [task for _, task in started.values()]
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+
+    async def _iter_shards_unordered(
+        self, items: List[BucketEntry], parallel: int
+    ) -> AsyncGenerator[BucketEntry, None]:
+        shards = [item.key for item in items if isinstance(item, BlobCommonPrefix)]
+        for item in items:
+            if not isinstance(item, BlobCommonPrefix):
+                yield item
+        if not shards:
+            return
+        queue: "asyncio.Queue[Union[BucketEntry, Exception, None]]"
+        queue = asyncio.Queue(SHARD_BUFFER_SIZE)
+        prefixes = iter(shards)
+        tasks = [
+            asyncio.ensure_future(self._list_into(prefixes, queue))
+            for _ in range(min(parallel, len(shards)))
+        ]
+        try:
+            running = len(tasks)
+            while running:
+                entry = await queue.get()
+                if entry is None:
+                    running -= 1
+                elif isinstance(entry, Exception):
+                    raise entry
+                else:
+                    yield entry
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+
     @classmethod
     @abc.abstractmethod
     def create(
@@ -108,6 +401,8 @@ class BucketProvider(abc.ABC):
         key: str,
         body: Union[AsyncIterator[bytes], bytes],
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
     ) -> None:
         pass
 
@@ -124,6 +419,43 @@ class BucketProvider(abc.ABC):
     ) -> None:
         pass
 
+    async def delete_blobs(self, keys: Sequence[str]) -> None:
+        """Delete up to MAX_DELETE_BATCH blobs, missing keys are ignored.
+
+        Providers with bulk delete requests override it, by default
+        the blobs are deleted one by one concurrently.
+        """
+
+        async def _delete(key: str) -> None:
+            try:
+                await self.delete_blob(key)
+            except ResourceNotFound:
+                pass
+
+        await run_concurrently(_delete(key) for key in keys)
+
+    def can_copy_from(self, src: "BucketProvider") -> bool:
+        """Whether blobs of *src* are copied on the server side by copy_blob()."""
+        return False
+
+    async def copy_blob(
+        self,
+        src: "BucketProvider",
+        src_key: str,
+        key: str,
+        *,
+        size: int,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> None:
+        """Copy blob *src_key* of *src* to *key*.
+
+        Providers override it to copy on the server side, without passing
+        the data through the client, if can_copy_from() returns True for
+        *src*.  By default the blob is fetched and uploaded again.
+        """
+        async with src.fetch_blob(src_key) as body:
+            await self.put_blob(key, body, progress, size=size)
+
     @abc.abstractmethod
     async def get_time_diff_to_local(self) -> Tuple[float, float]:
         pass
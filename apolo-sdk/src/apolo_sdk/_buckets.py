@@ -1,15 +1,19 @@
+import asyncio
+import errno
+import functools
 import json
-import re
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import PurePosixPath
 from typing import (
     AbstractSet,
     Any,
+    AsyncGenerator,
     AsyncIterator,
     Awaitable,
     Callable,
     Dict,
     Iterable,
+    List,
     Mapping,
     Optional,
     Tuple,
@@ -24,8 +28,15 @@ from ._abc import (
     AbstractDeleteProgress,
     AbstractFileProgress,
     AbstractRecursiveFileProgress,
+    StorageProgressComplete,
+    StorageProgressDelete,
+    StorageProgressStart,
+    StorageProgressStep,
+    _AsyncAbstractDeleteProgress,
+    _AsyncAbstractFileProgress,
 )
 from ._bucket_base import (
+    DEFAULT_PARALLEL_PARTS,
     Bucket,
     BucketCredentials,
     BucketEntry,
@@ -33,21 +44,28 @@ from ._bucket_base import (
     BucketUsage,
     PersistentBucketCredentials,
 )
+from ._chunk_size import ChunkSizeController
 from ._config import Config
 from ._core import _Core
 from ._errors import NDJSONError, ResourceNotFound
-from ._file_filter import (
-    AsyncFilterFunc,
-    _glob_safe_prefix,
-    _has_magic,
-    _isrecursive,
-    translate,
-)
+from ._file_filter import MAX_GLOB_LISTINGS, AsyncFilterFunc, GlobSegment, compile_glob
 from ._file_utils import FileSystem, FileTransferer, LocalFS, rm
+from ._io_executor import IOExecutor
 from ._parser import Parser
 from ._rewrite import rewrite_module
+from ._storage import run_progress
 from ._url_utils import _extract_path, normalize_local_path_uri
-from ._utils import NoPublicConstructor, asyncgeneratorcontextmanager
+from ._utils import (
+    NoPublicConstructor,
+    aclosing,
+    asyncgeneratorcontextmanager,
+    map_ordered,
+    queue_calls,
+    run_concurrently,
+)
+
+# Bulk delete requests sent concurrently by a recursive remove
+MAX_CONCURRENT_DELETES = 4
 
 
 class BucketFS(FileSystem[PurePosixPath]):
@@ -58,6 +76,10 @@ class BucketFS(FileSystem[PurePosixPath]):
     def __init__(self, provider: BucketProvider) -> None:
         self._provider = provider
 
+    @property
+    def chunk_size(self) -> Optional[ChunkSizeController]:
+        return self._provider._chunk_size
+
     @property
     def bucket(self) -> Bucket:
         return self._provider.bucket
@@ -123,9 +145,13 @@ class BucketFS(FileSystem[PurePosixPath]):
         body: AsyncIterator[bytes],
         offset: int = 0,
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
     ) -> None:
         assert offset == 0, "Buckets do not support offset write"
-        await self._provider.put_blob(self._as_file_key(path), body, progress)
+        await self._provider.put_blob(
+            self._as_file_key(path), body, progress, size=size
+        )
 
     @asyncgeneratorcontextmanager
     async def iter_dir(self, path: PurePosixPath) -> AsyncIterator[PurePosixPath]:
@@ -137,6 +163,38 @@ class BucketFS(FileSystem[PurePosixPath]):
                 if res != path:  # Directory can be listed as self child
                     yield res
 
+    @asyncgeneratorcontextmanager
+    async def iter_dir_stat(
+        self, path: PurePosixPath
+    ) -> AsyncIterator["FileSystem.DirEntry[PurePosixPath]"]:
+        async with self._provider.list_blobs(
+            prefix=self._as_dir_key(path), recursive=False
+        ) as it:
+            async for item in it:
+                res = PurePosixPath(item.key)
+                if res == path:  # Directory can be listed as self child
+                    continue
+                if item.is_dir():
+                    yield FileSystem.DirEntry(
+                        path=res,
+                        name=res.name,
+                        size=0,
+                        modification_time=None,
+                        is_dir=True,
+                        is_file=False,
+                    )
+                else:
+                    yield FileSystem.DirEntry(
+                        path=res,
+                        name=res.name,
+                        size=item.size,
+                        modification_time=(
+                            item.modified_at.timestamp() if item.modified_at else None
+                        ),
+                        is_dir=False,
+                        is_file=True,
+                    )
+
     async def mkdir(self, path: PurePosixPath) -> None:
         key = self._as_dir_key(path)
         if key == "":
@@ -156,6 +214,64 @@ class BucketFS(FileSystem[PurePosixPath]):
         key = self._as_file_key(path)
         await self._provider.delete_blob(key=key)
 
+    async def rm_tree(
+        self,
+        path: PurePosixPath,
+        progress: Optional[AbstractDeleteProgress] = None,
+        *,
+        parallel: int = MAX_CONCURRENT_DELETES,
+    ) -> None:
+        """Recursively remove *path* with bulk delete requests.
+
+        Keys are deleted while the recursive listing is still in progress,
+        up to *parallel* delete requests are sent at once.
+        """
+        if not await self.exists(path):
+            raise FileNotFoundError(
+                errno.ENOENT, "No such file or directory", str(path)
+            )
+        dir_key = self._as_dir_key(path)
+        batch_size = self._provider.MAX_DELETE_BATCH
+        async_progress: _AsyncAbstractDeleteProgress
+        queue, async_progress = queue_calls(progress)
+        batches: "asyncio.Queue[Optional[List[str]]]" = asyncio.Queue(parallel)
+
+        async def lister() -> None:
+            batch: List[str] = []
+            async with self._provider.list_blobs(dir_key, recursive=True) as it:
+                async for entry in it:
+                    batch.append(entry.key)
+                    if len(batch) == batch_size:
+                        await batches.put(batch)
+                        batch = []
+            if batch:
+                await batches.put(batch)
+            for _ in range(parallel):
+                await batches.put(None)
+
+        async def deleter() -> None:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    return
+                await self._provider.delete_blobs(batch)
+                for key in batch:
+                    if key != dir_key:
+                        await async_progress.delete(
+                            StorageProgressDelete(
+                                uri=self.to_url(PurePosixPath(key)),
+                                is_dir=key.endswith("/"),
+                            )
+                        )
+
+        async def _rm() -> None:
+            await run_concurrently([lister(), *(deleter() for _ in range(parallel))])
+            await async_progress.delete(
+                StorageProgressDelete(uri=self.to_url(path), is_dir=True)
+            )
+
+        await run_progress(queue, _rm())
+
     def to_url(self, path: PurePosixPath) -> URL:
         return self._provider.bucket.uri / self._as_file_key(path)
 
@@ -172,13 +288,111 @@ class BucketFS(FileSystem[PurePosixPath]):
         return path / child
 
 
+class BucketCopier(FileTransferer[PurePosixPath, PurePosixPath]):
+    # Copies blobs between buckets on the server side when the destination
+    # provider supports the source one, otherwise streams them through
+    # the client with concurrent range requests.
+
+    def __init__(self, src_fs: BucketFS, dst_fs: BucketFS) -> None:
+        super().__init__(src_fs, dst_fs)
+        self._src_bucket_fs = src_fs
+        self._dst_bucket_fs = dst_fs
+
+    async def _transfer_file(
+        self,
+        src: PurePosixPath,
+        dst: PurePosixPath,
+        *,
+        offset: int = 0,
+        size: Optional[int] = None,
+        progress: _AsyncAbstractFileProgress,
+    ) -> None:
+        src_provider = self._src_bucket_fs._provider
+        dst_provider = self._dst_bucket_fs._provider
+        if offset or not dst_provider.can_copy_from(src_provider):
+            await super()._transfer_file(
+                src, dst, offset=offset, size=size, progress=progress
+            )
+            return
+        src_url = self.src_fs.to_url(src)
+        dst_url = self.dst_fs.to_url(dst)
+        if size is None:
+            size = (await self.src_fs.stat(src)).size
+        total = size
+        await progress.start(StorageProgressStart(src_url, dst_url, total))
+        pos = 0
+
+        async def _progress(bytes_copied: int) -> None:
+            nonlocal pos
+            pos += bytes_copied
+            await progress.step(StorageProgressStep(src_url, dst_url, pos, total))
+
+        await dst_provider.copy_blob(
+            src_provider,
+            self._src_bucket_fs._as_file_key(src),
+            self._dst_bucket_fs._as_file_key(dst),
+            size=size,
+            progress=_progress,
+        )
+        await progress.complete(StorageProgressComplete(src_url, dst_url, total))
+
+
 @rewrite_module
 class Buckets(metaclass=NoPublicConstructor):
-    def __init__(self, core: _Core, config: Config, parser: Parser) -> None:
+    def __init__(
+        self, core: _Core, config: Config, parser: Parser, io_executor: IOExecutor
+    ) -> None:
         self._core = core
         self._config = config
         self._parser = parser
+        self._io_executor = io_executor
         self._providers: Dict[Bucket.Provider, Type[BucketProvider]] = {}
+        self._chunk_sizes: Dict[Bucket.Provider, ChunkSizeController] = {}
+        # Resolved buckets and open providers are reused by later calls,
+        # providers refresh their credentials by themselves.
+        self._buckets_by_ref: Dict[Tuple[str, str, str, str], Bucket] = {}
+        self._buckets_by_uri: Dict[str, Bucket] = {}
+        self._provider_cache: Dict[
+            Tuple[str, str], Tuple[BucketProvider, AsyncExitStack]
+        ] = {}
+        self._provider_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    async def _close(self) -> None:
+        cache = list(self._provider_cache.values())
+        self._provider_cache.clear()
+        self._buckets_by_ref.clear()
+        self._buckets_by_uri.clear()
+        for _, stack in cache:
+            await stack.aclose()
+
+    async def _forget_bucket(self, bucket_id_or_name: str) -> None:
+        buckets = {
+            bucket.id: bucket
+            for bucket in [
+                *self._buckets_by_ref.values(),
+                *self._buckets_by_uri.values(),
+            ]
+            if bucket_id_or_name in (bucket.id, bucket.name)
+        }
+        self._buckets_by_ref = {
+            ref: bucket
+            for ref, bucket in self._buckets_by_ref.items()
+            if bucket.id not in buckets
+        }
+        self._buckets_by_uri = {
+            uri: bucket
+            for uri, bucket in self._buckets_by_uri.items()
+            if bucket.id not in buckets
+        }
+        for bucket in buckets.values():
+            entry = self._provider_cache.pop((bucket.cluster_name, bucket.id), None)
+            if entry is not None:
+                await entry[1].aclose()
+
+    def _remember_bucket(self, bucket: Bucket) -> None:
+        self._buckets_by_uri[str(bucket.uri)] = bucket
+        if bucket.name:
+            self._buckets_by_uri[str(bucket.uri.parent / bucket.id)] = bucket
 
     def _parse_bucket_payload(self, payload: Mapping[str, Any]) -> Bucket:
         return Bucket(
@@ -316,6 +530,7 @@ class Buckets(metaclass=NoPublicConstructor):
         auth = await self._config._api_auth()
         async with self._core.request("DELETE", url, auth=auth, params=params):
             pass
+        await self._forget_bucket(bucket_id_or_name)
 
     async def set_public_access(
         self,
@@ -362,6 +577,8 @@ class Buckets(metaclass=NoPublicConstructor):
         cluster_name: Optional[str] = None,
         org_name: Optional[str] = None,
         project_name: Optional[str] = None,
+        *,
+        parallel: int = 1,
     ) -> AsyncIterator[BucketUsage]:
         total_bytes = 0
         obj_count = 0
@@ -371,7 +588,7 @@ class Buckets(metaclass=NoPublicConstructor):
             org_name=org_name,
             project_name=project_name,
         ) as provider:
-            async with provider.list_blobs("", recursive=True) as it:
+            async with provider._list_blobs_sharded("", parallel, ordered=False) as it:
                 async for obj in it:
                     total_bytes += obj.size
                     obj_count += 1
@@ -380,6 +597,10 @@ class Buckets(metaclass=NoPublicConstructor):
     # Helper functions
 
     async def _get_bucket_for_uri(self, uri: URL) -> Bucket:
+        uri_str = str(uri)
+        for bucket_uri, bucket in self._buckets_by_uri.items():
+            if uri_str == bucket_uri or uri_str.startswith(bucket_uri + "/"):
+                return bucket
         cluster_name = uri.host
 
         url = self._get_buckets_url(cluster_name) / "find" / "by_path"
@@ -387,7 +608,9 @@ class Buckets(metaclass=NoPublicConstructor):
         auth = await self._config._api_auth()
         async with self._core.request("GET", url, auth=auth, params=query) as resp:
             payload = await resp.json()
-            return self._parse_bucket_payload(payload)
+            bucket = self._parse_bucket_payload(payload)
+        self._remember_bucket(bucket)
+        return bucket
 
     @asynccontextmanager
     async def _get_provider(self, uri: URL) -> AsyncIterator[BucketProvider]:
@@ -403,12 +626,23 @@ class Buckets(metaclass=NoPublicConstructor):
         org_name: Optional[str] = None,
         project_name: Optional[str] = None,
     ) -> AsyncIterator[BucketProvider]:
-        bucket = await self.get(
+        params = self._get_bucket_url_params(org_name, project_name)
+        ref = (
+            cluster_name or self._config.cluster_name,
+            params["org_name"],
+            params["project_name"],
             bucket_id_or_name,
-            cluster_name=cluster_name,
-            org_name=org_name,
-            project_name=project_name,
         )
+        bucket = self._buckets_by_ref.get(ref)
+        if bucket is None:
+            bucket = await self.get(
+                bucket_id_or_name,
+                cluster_name=cluster_name,
+                org_name=org_name,
+                project_name=project_name,
+            )
+            self._buckets_by_ref[ref] = bucket
+            self._remember_bucket(bucket)
         async with self._get_provider_for_bucket(bucket) as provider:
             yield provider
 
@@ -416,6 +650,18 @@ class Buckets(metaclass=NoPublicConstructor):
     async def _get_provider_for_bucket(
         self, bucket: Bucket
     ) -> AsyncIterator[BucketProvider]:
+        cache_key = (bucket.cluster_name, bucket.id)
+        lock = self._provider_locks.setdefault(cache_key, asyncio.Lock())
+        async with lock:
+            entry = self._provider_cache.get(cache_key)
+            if entry is None:
+                entry = await self._create_provider(bucket)
+                self._provider_cache[cache_key] = entry
+        yield entry[0]
+
+    async def _create_provider(
+        self, bucket: Bucket
+    ) -> Tuple[BucketProvider, AsyncExitStack]:
         async def _get_new_credentials() -> BucketCredentials:
             return await self.request_tmp_credentials(bucket.id, bucket.cluster_name)
 
@@ -440,8 +686,30 @@ class Buckets(metaclass=NoPublicConstructor):
             else:
                 assert False, f"Unknown provider {bucket.provider}"
 
-        async with provider_factory.create(bucket, _get_new_credentials) as provider:
-            yield provider
+        chunk_size = self._chunk_sizes.get(bucket.provider)
+        if chunk_size is None:
+            chunk_size = self._chunk_sizes[bucket.provider] = (
+                ChunkSizeController.from_user_config(
+                    self._config._get_user_config(),
+                    size=provider_factory.MIN_CHUNK_SIZE,
+                    lower_bound=provider_factory.MIN_CHUNK_SIZE,
+                )
+            )
+
+        stack = AsyncExitStack()
+        provider = await stack.enter_async_context(
+            provider_factory.create(bucket, _get_new_credentials)
+        )
+        provider._chunk_size = chunk_size
+        provider._parallel_parts = self._get_parallel_parts()
+        return provider, stack
+
+    def _get_parallel_parts(self) -> int:
+        section = self._config._get_user_config().get("storage", {})
+        return section.get("parallel-parts", DEFAULT_PARALLEL_PARTS)
+
+    def _local_fs(self, chunk_size: Optional[ChunkSizeController] = None) -> LocalFS:
+        return LocalFS(chunk_size, executor=self._io_executor)
 
     @asynccontextmanager
     async def _get_bucket_fs(self, uri: URL) -> AsyncIterator[BucketFS]:
@@ -527,76 +795,113 @@ class Buckets(metaclass=NoPublicConstructor):
         uri: URL,
         recursive: bool = False,
         limit: Optional[int] = None,
+        *,
+        parallel: int = 1,
     ) -> AsyncIterator[BucketEntry]:
         uri = self._parser.normalize_uri(uri, allowed_schemes=("blob",))
         async with self._get_provider(uri) as provider:
             key = provider.bucket.get_key_for_uri(uri)
-            async with provider.list_blobs(key, recursive=recursive, limit=limit) as it:
+            if not recursive or parallel <= 1:
+                async with provider.list_blobs(
+                    key, recursive=recursive, limit=limit
+                ) as it:
+                    async for entry in it:
+                        yield entry
+                return
+            count = 0
+            async with provider._list_blobs_sharded(key, parallel) as it:
                 async for entry in it:
                     yield entry
+                    count += 1
+                    if count == limit:
+                        return
 
     @asyncgeneratorcontextmanager
     async def glob_blobs(self, uri: URL) -> AsyncIterator[BucketEntry]:
         uri = self._parser.normalize_uri(uri, allowed_schemes=("blob",))
         async with self._get_provider(uri) as provider:
             key = provider.bucket.get_key_for_uri(uri)
-            async with self._glob_blobs("", key, provider) as it:
+            async with self._glob_blobs(key, provider) as it:
                 async for entry in it:
                     yield entry
 
     @asyncgeneratorcontextmanager
     async def _glob_blobs(
-        self, prefix: str, pattern: str, provider: BucketProvider
+        self, pattern: str, provider: BucketProvider
     ) -> AsyncIterator[BucketEntry]:
-        # TODO: factor out code with storage
-
-        part, _, remaining = pattern.partition("/")
-
-        if _isrecursive(part):
-            # Patter starts with ** => any key may match it
-            full_match = re.compile(translate(pattern)).fullmatch
-            async with provider.list_blobs(prefix, recursive=True) as it:
-                async for entry in it:
-                    if full_match(entry.key[len(prefix) :]):
-                        yield entry
-            return
-
-        has_magic = _has_magic(part)
-        # Optimize the prefix for matching. If we have a pattern `folder1/b*/*.json`
-        # it's better to scan with prefix `folder1/b` on the 2nd step, not `folder1/`
-        if has_magic:
-            opt_prefix = prefix + _glob_safe_prefix(part)
-        else:
-            opt_prefix = prefix
-        match = re.compile(translate(part)).fullmatch
-
-        # If this is the last part in the search pattern we have to scan keys, not
-        # just prefixes
-        if not remaining:
-            async with provider.list_blobs(opt_prefix, recursive=False) as it:
-                async for entry in it:
-                    if match(entry.name) and not entry.key == opt_prefix:
-                        yield entry
-            return
-
-        # We can be sure no blobs on this level will match the pattern, as results are
-        # deeper down the tree. Recursively scan folders only.
-        if has_magic:
-            async with provider.list_blobs(opt_prefix, recursive=False) as it:
-                async for entry in it:
-                    if not entry.is_dir() or not match(entry.name):
-                        continue
-                    async with self._glob_blobs(
-                        entry.key, remaining, provider
-                    ) as blob_iter:
-                        async for blob in blob_iter:
-                            yield blob
-        else:
-            async with self._glob_blobs(
-                prefix + part + "/", remaining, provider
-            ) as blob_iter:
-                async for blob in blob_iter:
-                    yield blob
+        # Matching prefixes are expanded segment by segment, prefixes
+        # of the same level are listed concurrently.
+        segments = compile_glob(pattern)
+
+        async def _list(prefix: str, segment: GlobSegment) -> List[BucketEntry]:
+            # Only scan keys starting with the literal part of the segment,
+            # e.g. with `folder1/b` for `folder1/b*/*.json`
+            async with provider.list_blobs(
+                prefix + segment.prefix, recursive=False
+            ) as it:
+                return [
+                    entry
+                    async for entry in it
+                    if entry.key != prefix
+                    and segment.match(entry.key[len(prefix) :].rstrip("/"))
+                ]
+
+        async def _expand(
+            prefixes: AsyncIterator[str], segment: GlobSegment
+        ) -> AsyncGenerator[str, None]:
+            if segment.is_literal:
+                # No need to check existence, the next listing would be empty
+                async for prefix in prefixes:
+                    yield prefix + segment.pattern + "/"
+                return
+            async with aclosing(
+                map_ordered(
+                    functools.partial(_list, segment=segment),
+                    prefixes,
+                    MAX_GLOB_LISTINGS,
+                )
+            ) as it:
+                async for entries in it:
+                    for entry in entries:
+                        if entry.is_dir():
+                            yield entry.key
+
+        async def _root() -> AsyncIterator[str]:
+            yield ""
+
+        async with AsyncExitStack() as stack:
+            prefixes = _root()
+            for segment in segments[:-1]:
+                if segment.is_recursive:
+                    break
+                prefixes = await stack.enter_async_context(
+                    aclosing(_expand(prefixes, segment))
+                )
+            else:
+                segment = segments[-1]
+
+            if segment.is_recursive:
+                # Any key may match the rest of the pattern
+                async for prefix in prefixes:
+                    async with provider.list_blobs(prefix, recursive=True) as it:
+                        async for entry in it:
+                            if segment.match(entry.key[len(prefix) :]):
+                                yield entry
+                return
+
+            # The last segment matches keys, not only prefixes
+            matches = await stack.enter_async_context(
+                aclosing(
+                    map_ordered(
+                        functools.partial(_list, segment=segment),
+                        prefixes,
+                        MAX_GLOB_LISTINGS,
+                    )
+                )
+            )
+            async for entries in matches:
+                for entry in entries:
+                    yield entry
 
     # High level transfer operations
 
@@ -612,7 +917,7 @@ class Buckets(metaclass=NoPublicConstructor):
         dst = self._parser.normalize_uri(dst, allowed_schemes=("blob",))
         async with self._get_bucket_fs(dst) as bucket_fs:
             dst_key = bucket_fs.bucket.get_key_for_uri(dst)
-            transferer = FileTransferer(LocalFS(), bucket_fs)
+            transferer = FileTransferer(self._local_fs(bucket_fs.chunk_size), bucket_fs)
             await transferer.transfer_file(
                 src=_extract_path(src),
                 dst=PurePosixPath(dst_key),
@@ -633,7 +938,7 @@ class Buckets(metaclass=NoPublicConstructor):
         dst = normalize_local_path_uri(dst)
         async with self._get_bucket_fs(src) as bucket_fs:
             src_key = bucket_fs.bucket.get_key_for_uri(src)
-            transferer = FileTransferer(bucket_fs, LocalFS())
+            transferer = FileTransferer(bucket_fs, self._local_fs())
             await transferer.transfer_file(
                 src=PurePosixPath(src_key),
                 dst=_extract_path(dst),
@@ -656,7 +961,7 @@ class Buckets(metaclass=NoPublicConstructor):
         dst = self._parser.normalize_uri(dst, allowed_schemes=("blob",))
         async with self._get_bucket_fs(dst) as bucket_fs:
             dst_key = bucket_fs.bucket.get_key_for_uri(dst)
-            transferer = FileTransferer(LocalFS(), bucket_fs)
+            transferer = FileTransferer(self._local_fs(bucket_fs.chunk_size), bucket_fs)
             await transferer.transfer_dir(
                 src=_extract_path(src),
                 dst=PurePosixPath(dst_key),
@@ -680,7 +985,7 @@ class Buckets(metaclass=NoPublicConstructor):
         dst = normalize_local_path_uri(dst)
         async with self._get_bucket_fs(src) as bucket_fs:
             src_key = bucket_fs.bucket.get_key_for_uri(src)
-            transferer = FileTransferer(bucket_fs, LocalFS())
+            transferer = FileTransferer(bucket_fs, self._local_fs())
             await transferer.transfer_dir(
                 src=PurePosixPath(src_key),
                 dst=_extract_path(dst),
@@ -690,6 +995,63 @@ class Buckets(metaclass=NoPublicConstructor):
                 progress=progress,
             )
 
+    async def copy_file(
+        self,
+        src: URL,
+        dst: URL,
+        *,
+        update: bool = False,
+        progress: Optional[AbstractFileProgress] = None,
+    ) -> None:
+        src = self._parser.normalize_uri(src, allowed_schemes=("blob",))
+        dst = self._parser.normalize_uri(dst, allowed_schemes=("blob",))
+        async with self._get_bucket_fs(src) as src_fs:
+            async with self._get_bucket_fs(dst) as dst_fs:
+                src_key = src_fs.bucket.get_key_for_uri(src)
+                dst_key = dst_fs.bucket.get_key_for_uri(dst)
+                if src_fs.bucket == dst_fs.bucket and src_key == dst_key:
+                    raise ValueError(f"{str(src)!r} and {str(dst)!r} are the same blob")
+                transferer = BucketCopier(src_fs, dst_fs)
+                await transferer.transfer_file(
+                    src=PurePosixPath(src_key),
+                    dst=PurePosixPath(dst_key),
+                    update=update,
+                    progress=progress,
+                )
+
+    async def copy_dir(
+        self,
+        src: URL,
+        dst: URL,
+        *,
+        update: bool = False,
+        filter: Optional[AsyncFilterFunc] = None,
+        progress: Optional[AbstractRecursiveFileProgress] = None,
+    ) -> None:
+        src = self._parser.normalize_uri(src, allowed_schemes=("blob",))
+        dst = self._parser.normalize_uri(dst, allowed_schemes=("blob",))
+        async with self._get_bucket_fs(src) as src_fs:
+            async with self._get_bucket_fs(dst) as dst_fs:
+                src_key = src_fs.bucket.get_key_for_uri(src)
+                dst_key = dst_fs.bucket.get_key_for_uri(dst)
+                if src_fs.bucket == dst_fs.bucket and (
+                    src_fs._as_dir_key(PurePosixPath(dst_key)).startswith(
+                        src_fs._as_dir_key(PurePosixPath(src_key))
+                    )
+                ):
+                    raise ValueError(
+                        f"Cannot copy a directory {str(src)!r} "
+                        f"into itself {str(dst)!r}"
+                    )
+                transferer = BucketCopier(src_fs, dst_fs)
+                await transferer.transfer_dir(
+                    src=PurePosixPath(src_key),
+                    dst=PurePosixPath(dst_key),
+                    update=update,
+                    filter=filter,
+                    progress=progress,
+                )
+
     async def blob_is_dir(self, uri: URL) -> bool:
         uri = self._parser.normalize_uri(uri, allowed_schemes=("blob",))
         if uri.path.endswith("/"):
@@ -708,7 +1070,10 @@ class Buckets(metaclass=NoPublicConstructor):
         uri = self._parser.normalize_uri(uri, allowed_schemes=("blob",))
         async with self._get_bucket_fs(uri) as bucket_fs:
             key = bucket_fs.bucket.get_key_for_uri(uri)
-            await rm(bucket_fs, PurePosixPath(key), recursive, progress)
+            if recursive:
+                await bucket_fs.rm_tree(PurePosixPath(key), progress)
+            else:
+                await rm(bucket_fs, PurePosixPath(key), recursive, progress)
 
     async def make_signed_url(
         self,
@@ -0,0 +1,104 @@
+import contextlib
+import time
+from typing import Any, Iterator, Mapping
+
+DEFAULT_CHUNK_SIZE = 2**20  # 1 MiB
+DEFAULT_MIN_CHUNK_SIZE = 256 * 2**10  # 256 KiB
+DEFAULT_MAX_CHUNK_SIZE = 64 * 2**20  # 64 MiB
+# A chunk is grown if it was transferred faster than FAST_REQUEST_TIME
+# and shrunk if it took more than SLOW_REQUEST_TIME seconds.
+FAST_REQUEST_TIME = 0.5
+SLOW_REQUEST_TIME = 5.0
+
+
+class ChunkSizeController:
+    """Chooses the size of transferred chunks from the observed latency.
+
+    The size is doubled when a chunk of the current size is transferred
+    fast, so that high-bandwidth links are not bound by the request latency,
+    and halved when a request is slow or fails, so that retries are cheap
+    on unreliable links.  The size stays a power of two multiple of the
+    initial size within [min_size, max_size].  A non-adaptive controller
+    always returns the initial size.
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_CHUNK_SIZE,
+        *,
+        min_size: int = DEFAULT_MIN_CHUNK_SIZE,
+        max_size: int = DEFAULT_MAX_CHUNK_SIZE,
+        adaptive: bool = True,
+    ) -> None:
+        if size <= 0:
+            raise ValueError("chunk size should be positive")
+        self._min_size = min(min_size, size)
+        self._max_size = max(max_size, size)
+        self._size = size
+        self._adaptive = adaptive
+
+    @classmethod
+    def from_user_config(
+        cls,
+        config: Mapping[str, Any],
+        *,
+        size: int = DEFAULT_CHUNK_SIZE,
+        lower_bound: int = 1,
+    ) -> "ChunkSizeController":
+        """Create a controller tuned by the [storage] section of user config.
+
+        *size* is the initial size if it is not configured, *lower_bound*
+        is the smallest size supported by the transfer protocol.
+        """
+        section = config.get("storage", {})
+        return cls(
+            max(section.get("chunk-size", size), lower_bound),
+            min_size=max(
+                section.get("min-chunk-size", DEFAULT_MIN_CHUNK_SIZE), lower_bound
+            ),
+            max_size=section.get("max-chunk-size", DEFAULT_MAX_CHUNK_SIZE),
+            adaptive=section.get("adaptive-chunk-size", True),
+        )
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def adaptive(self) -> bool:
+        return self._adaptive
+
+    def observe(self, nbytes: int, elapsed: float) -> None:
+        """Record a successful transfer of *nbytes* in *elapsed* seconds."""
+        if not self._adaptive:
+            return
+        if elapsed > SLOW_REQUEST_TIME:
+            self._shrink()
+        elif elapsed < FAST_REQUEST_TIME and nbytes >= self._size:
+            # Small chunks (e.g. the tail of the file) say nothing
+            # about the throughput.
+            self._grow()
+
+    def failed(self) -> None:
+        """Record a failed transfer."""
+        if self._adaptive:
+            self._shrink()
+
+    @contextlib.contextmanager
+    def measure(self, nbytes: int) -> Iterator[None]:
+        """Measure a single request transferring *nbytes*."""
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.failed()
+            raise
+        self.observe(nbytes, time.monotonic() - start)
+
+    def _grow(self) -> None:
+        if self._size * 2 <= self._max_size:
+            self._size *= 2
+
+    def _shrink(self) -> None:
+        if self._size // 2 >= self._min_size:
+            self._size //= 2
@@ -11,6 +11,7 @@ from ._config import Config
 from ._core import _Core
 from ._disks import Disks
 from ._images import Images
+from ._io_executor import MAX_IO_THREADS, IOExecutor
 from ._jobs import Jobs
 from ._parser import Parser
 from ._plugins import PluginManager
@@ -51,20 +52,29 @@ class Client(metaclass=NoPublicConstructor):
                 db,
             )
         self._parser = Parser._create(self._config)
+        self._io_executor = IOExecutor(self._get_io_threads)
         self._admin = _Admin._create(self._core, self._config)
         self._clusters = _Clusters._create(self._core, self._config)
-        self._jobs = Jobs._create(self._core, self._config, self._parser)
-        self._storage = Storage._create(self._core, self._config)
+        self._jobs = Jobs._create(
+            self._core, self._config, self._parser, self._io_executor
+        )
+        self._storage = Storage._create(self._core, self._config, self._io_executor)
         self._users = Users._create(self._core, self._config, self._admin)
         self._secrets = Secrets._create(self._core, self._config)
         self._disks = Disks._create(self._core, self._config)
         self._service_accounts = ServiceAccounts._create(self._core, self._config)
-        self._buckets = Buckets._create(self._core, self._config, self._parser)
+        self._buckets = Buckets._create(
+            self._core, self._config, self._parser, self._io_executor
+        )
         self._images: Optional[Images] = None
         self._version_checker: VersionChecker = VersionChecker._create(
             self._core, self._config, plugin_manager
         )
 
+    def _get_io_threads(self) -> int:
+        section = self._config._get_user_config().get("storage", {})
+        return section.get("io-threads", MAX_IO_THREADS)
+
     @property
     def closed(self) -> bool:
         return self._closed
@@ -76,9 +86,11 @@ class Client(metaclass=NoPublicConstructor):
         with self._config._open_db() as db:
             self._core._save_cookies(db)
         await self._core.close()
+        await self._buckets._close()
         if self._images is not None:
             await self._images._close()
         await self._session.close()
+        self._io_executor.shutdown(wait=False)
 
     async def __aenter__(self) -> "Client":
         return self
@@ -24,6 +24,7 @@ from ._errors import (
     ServerNotAvailable,
 )
 from ._tracing import gen_trace_id
+from ._utils import ensure_schema
 
 log = logging.getLogger(__package__)
 
@@ -202,30 +203,6 @@ class _Core:
             self._raise_error(e.status, err_text)
 
 
-def _ensure_schema(db: sqlite3.Connection, *, update: bool) -> bool:
-    cur = db.cursor()
-    ok = True
-    found = set()
-    cur.execute("SELECT type, name, sql from sqlite_master")
-    for type, name, sql in cur:
-        if type not in ("table", "index"):
-            continue
-        if name in SCHEMA:
-            if SCHEMA[name] != sql:
-                ok = False
-                break
-            else:
-                found.add(name)
-
-    if not ok or found < SCHEMA.keys():
-        for sql in reversed(list(DROP.values())):
-            cur.execute(sql)
-        for sql in SCHEMA.values():
-            cur.execute(sql)
-        return True
-    return False
-
-
 def _save_cookies(
     db: sqlite3.Connection,
     cookies: Sequence["Morsel[str]"],
@@ -234,7 +211,7 @@ def _save_cookies(
 ) -> None:
     if now is None:
         now = time.time()
-    _ensure_schema(db, update=True)
+    ensure_schema(db, SCHEMA, DROP)
     cur = db.cursor()
     for cookie in cookies:
         cur.execute(
@@ -256,7 +233,7 @@ def _load_cookies(
 ) -> List["Morsel[str]"]:
     if now is None:
         now = time.time()
-    if _ensure_schema(db, update=False):
+    if ensure_schema(db, SCHEMA, DROP):
         return []
     cur = db.execute(
         """\
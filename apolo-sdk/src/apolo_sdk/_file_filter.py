@@ -1,4 +1,6 @@
+import functools
 import re
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Awaitable, Callable, List, Tuple, cast
 
@@ -6,6 +8,9 @@ from ._rewrite import rewrite_module
 
 AsyncFilterFunc = Callable[[str], Awaitable[bool]]
 
+# Directories listed at once when searching by a glob pattern
+MAX_GLOB_LISTINGS = 8
+
 
 async def _always_match(path: str) -> bool:
     return True
@@ -79,6 +84,48 @@ def _isrecursive(pattern: str) -> bool:
     return pattern == "**"
 
 
+@dataclass(frozen=True)
+class GlobSegment:
+    # A single component with wildcards or adjacent literal components
+    pattern: str
+    is_literal: bool
+    # "**", matches the rest of the pattern at any depth
+    is_recursive: bool
+    # The literal beginning of the pattern, for narrowing listings
+    prefix: str
+    # Matches the segment, or the rest of the path for a recursive segment
+    match: Callable[[str], Any]
+
+
+@functools.lru_cache(maxsize=128)
+def compile_glob(pattern: str) -> Tuple[GlobSegment, ...]:
+    """Split a glob pattern into segments with compiled matchers.
+
+    Adjacent literal path components are joined into a single segment,
+    so they can be looked up at once instead of level by level.
+    """
+    groups: List[str] = []
+    for part in pattern.split("/"):
+        if groups and not _has_magic(part) and not _has_magic(groups[-1]):
+            groups[-1] += "/" + part
+        else:
+            groups.append(part)
+    segments = []
+    for i, group in enumerate(groups):
+        is_recursive = _isrecursive(group)
+        regex = translate("/".join(groups[i:]) if is_recursive else group)
+        segments.append(
+            GlobSegment(
+                pattern=group,
+                is_literal=not _has_magic(group),
+                is_recursive=is_recursive,
+                prefix=_glob_safe_prefix(group),
+                match=re.compile(regex).fullmatch,
+            )
+        )
+    return tuple(segments)
+
+
 def translate(pat: str) -> str:
     """Translate a shell PATTERN to a regular expression."""
 
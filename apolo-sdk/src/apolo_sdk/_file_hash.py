@@ -0,0 +1,166 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import hashlib
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from ._config import Config
+from ._file_reader import READ_SIZE
+from ._io_executor import run_io
+from ._utils import ensure_schema
+
+MAX_HASH_CACHE_SIZE = 100_000
+
+HASH_SCHEMA = {
+    "file_hash": (
+        "CREATE TABLE file_hash "
+        "(dev INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, "
+        "ctime_ns INTEGER, hash TEXT, timestamp REAL)"
+    ),
+    "file_hash_index": "CREATE UNIQUE INDEX file_hash_index ON file_hash (dev, inode)",
+}
+HASH_DROP = {
+    "file_hash_index": "DROP INDEX IF EXISTS file_hash_index",
+    "file_hash": "DROP TABLE IF EXISTS file_hash",
+}
+
+_Key = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class _HashEntry:
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+    hash: str
+
+    def matches(self, stat: os.stat_result) -> bool:
+        return (
+            self.size == stat.st_size
+            and self.mtime_ns == stat.st_mtime_ns
+            and self.ctime_ns == stat.st_ctime_ns
+        )
+
+
+class FileHashCache:
+    """Persistent cache of content hashes of local files.
+
+    Entries are keyed by the device and the inode of the file and are valid
+    while its size, modification time and status change time are the same.
+    The least recently used entries are evicted when the cache is saved.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        *,
+        max_size: int = MAX_HASH_CACHE_SIZE,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
+        self._config = config
+        self._executor = executor
+        self._max_size = max_size
+        self._entries: Optional[Dict[_Key, _HashEntry]] = None
+        self._load_lock = asyncio.Lock()
+        self._changed: Dict[_Key, _HashEntry] = {}
+        self._used: Set[_Key] = set()
+
+    async def hash(self, path: Path, stat: Optional[os.stat_result] = None) -> str:
+        """Return the hex SHA-256 digest of the file content."""
+        if stat is None:
+            stat = await run_io(self._executor, path.stat)
+        if self._entries is None:
+            async with self._load_lock:
+                if self._entries is None:
+                    self._entries = await run_io(self._executor, self._load)
+        key = (stat.st_dev, stat.st_ino)
+        entry = self._entries.get(key)
+        if entry is not None and entry.matches(stat):
+            self._used.add(key)
+            return entry.hash
+        digest, new_stat = await run_io(self._executor, _hash_file, path)
+        entry = _HashEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            ctime_ns=stat.st_ctime_ns,
+            hash=digest,
+        )
+        # Don't remember the hash if the file was changed during hashing.
+        if (new_stat.st_dev, new_stat.st_ino) == key and entry.matches(new_stat):
+            self._entries[key] = entry
+            self._changed[key] = entry
+        return digest
+
+    def _load(self) -> Dict[_Key, _HashEntry]:
+        ret: Dict[_Key, _HashEntry] = {}
+        with self._config._open_db() as db:
+            if ensure_schema(db, HASH_SCHEMA, HASH_DROP):
+                return ret
+            cur = db.execute(
+                "SELECT dev, inode, size, mtime_ns, ctime_ns, hash FROM file_hash"
+            )
+            for dev, inode, size, mtime_ns, ctime_ns, hash in cur:
+                ret[(dev, inode)] = _HashEntry(
+                    size=size, mtime_ns=mtime_ns, ctime_ns=ctime_ns, hash=hash
+                )
+        return ret
+
+    def save(self) -> None:
+        """Store new entries and evict the least recently used ones."""
+        if not self._changed and not self._used:
+            return
+        now = time.time()
+        with self._config._open_db() as db:
+            ensure_schema(db, HASH_SCHEMA, HASH_DROP)
+            db.executemany(
+                """\
+                    INSERT OR REPLACE INTO file_hash
+                    (dev, inode, size, mtime_ns, ctime_ns, hash, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (
+                        dev,
+                        inode,
+                        entry.size,
+                        entry.mtime_ns,
+                        entry.ctime_ns,
+                        entry.hash,
+                        now,
+                    )
+                    for (dev, inode), entry in self._changed.items()
+                ],
+            )
+            db.executemany(
+                "UPDATE file_hash SET timestamp = ? WHERE dev = ? AND inode = ?",
+                [(now, dev, inode) for dev, inode in self._used - self._changed.keys()],
+            )
+            db.execute(
+                """\
+                    DELETE FROM file_hash WHERE rowid IN (
+                        SELECT rowid FROM file_hash
+                        ORDER BY timestamp DESC
+                        LIMIT -1 OFFSET ?
+                    )""",
+                (self._max_size,),
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
+        self._changed.clear()
+        self._used.clear()
+
+
+def _hash_file(path: Path) -> Tuple[str, os.stat_result]:
+    hasher = hashlib.sha256()
+    with path.open("rb") as stream:
+        while True:
+            chunk = stream.read(READ_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+        stat = os.fstat(stream.fileno())
+    return hasher.hexdigest(), stat
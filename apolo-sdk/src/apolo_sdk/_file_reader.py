@@ -0,0 +1,141 @@
+import concurrent.futures
+import contextlib
+import mmap
+import os
+from typing import AsyncIterator, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from ._chunk_size import ChunkSizeController
+from ._io_executor import run_io
+
+READ_SIZE = 2**20  # 1 MiB
+MMAP_MIN_SIZE = 64 * 2**20  # 64 MiB
+MAX_IDLE_BUFFERS = 16
+
+
+class BufferPool:
+    """Pool of reusable buffers for reading local files.
+
+    Reading a file with ``readinto()`` into a buffer taken from the pool
+    does not allocate a new bytes object for every chunk.  At most
+    *max_idle* released buffers are kept for reuse.
+    """
+
+    def __init__(self, *, max_idle: int = MAX_IDLE_BUFFERS) -> None:
+        self._max_idle = max_idle
+        self._idle: Dict[int, List[bytearray]] = {}
+        self._idle_count = 0
+
+    def acquire(self, size: int = READ_SIZE) -> bytearray:
+        idle = self._idle.get(size)
+        if idle:
+            self._idle_count -= 1
+            return idle.pop()
+        return bytearray(size)
+
+    def release(self, buf: bytearray) -> None:
+        if self._idle_count < self._max_idle:
+            self._idle.setdefault(len(buf), []).append(buf)
+            self._idle_count += 1
+
+    @contextlib.contextmanager
+    def buffer(self, size: int = READ_SIZE) -> Iterator[bytearray]:
+        buf = self.acquire(size)
+        try:
+            yield buf
+        finally:
+            self.release(buf)
+
+
+buffer_pool = BufferPool()
+
+
+async def read_into(
+    stream: BinaryIO,
+    buf: bytearray,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> memoryview:
+    """Read the next chunk of *stream* into *buf*.
+
+    Return a view of the read data, it is empty at the end of the file.
+    """
+    size = await run_io(executor, stream.readinto, buf)  # type: ignore
+    return memoryview(buf)[:size]
+
+
+def _get_size(chunk_size: Union[int, ChunkSizeController]) -> int:
+    if isinstance(chunk_size, ChunkSizeController):
+        return chunk_size.size
+    return chunk_size
+
+
+async def iter_file_chunks(
+    stream: BinaryIO,
+    chunk_size: Union[int, ChunkSizeController] = READ_SIZE,
+    *,
+    pool: BufferPool = buffer_pool,
+    use_mmap: Optional[bool] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> AsyncIterator[memoryview]:
+    """Read *stream* in chunks starting from the current position.
+
+    The chunks are views of a reused buffer or of the memory-mapped file,
+    every chunk is valid only until the next one is requested.  By default
+    files of MMAP_MIN_SIZE bytes or more are memory-mapped.  If *chunk_size*
+    is a controller, its current size is used for every chunk.  Blocking
+    calls are run in *executor*.
+    """
+    pos = stream.tell()
+    size = (await run_io(executor, os.fstat, stream.fileno())).st_size
+    if use_mmap is None:
+        use_mmap = size - pos >= MMAP_MIN_SIZE
+    if use_mmap and size > pos:
+        async for chunk in _iter_mmap_chunks(stream, pos, size, chunk_size, executor):
+            yield chunk
+        return
+    buf = pool.acquire(_get_size(chunk_size))
+    try:
+        while True:
+            buf_size = _get_size(chunk_size)
+            if len(buf) != buf_size:
+                pool.release(buf)
+                buf = pool.acquire(buf_size)
+            chunk = await read_into(stream, buf, executor)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        pool.release(buf)
+
+
+async def _iter_mmap_chunks(
+    stream: BinaryIO,
+    pos: int,
+    size: int,
+    chunk_size: Union[int, ChunkSizeController],
+    executor: Optional[concurrent.futures.Executor],
+) -> AsyncIterator[memoryview]:
+    mm = mmap.mmap(stream.fileno(), size, access=mmap.ACCESS_READ)
+    view = memoryview(mm)
+    try:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        while pos < size:
+            end = min(pos + _get_size(chunk_size), size)
+            # Start reading the pages ahead in a worker thread to not
+            # block the event loop on page faults.
+            await run_io(executor, _prefetch, mm, pos, end)
+            yield view[pos:end]
+            pos = end
+        stream.seek(pos)
+    finally:
+        # The map is closed on garbage collection if the consumer
+        # still holds a chunk.
+        with contextlib.suppress(BufferError):
+            view.release()
+            mm.close()
+
+
+def _prefetch(mm: mmap.mmap, start: int, stop: int) -> None:
+    if hasattr(mmap, "MADV_WILLNEED"):
+        start -= start % mmap.PAGESIZE
+        mm.madvise(mmap.MADV_WILLNEED, start, stop - start)
@@ -1,19 +1,26 @@
 import abc
 import asyncio
+import concurrent.futures
 import errno
+import functools
 import logging
+import os
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
 from typing import (
     AbstractSet,
     AsyncIterator,
     Awaitable,
     Callable,
+    Dict,
     Generic,
+    List,
     Optional,
     Tuple,
     TypeVar,
+    Union,
 )
 
 from yarl import URL
@@ -33,8 +40,12 @@ from ._abc import (
     _AsyncAbstractFileProgress,
     _AsyncAbstractRecursiveFileProgress,
 )
+from ._chunk_size import ChunkSizeController
 from ._file_filter import AsyncFilterFunc, FileFilter
-from ._storage import _always, run_concurrently, run_progress
+from ._file_reader import iter_file_chunks
+from ._io_executor import run_io
+from ._scheduler import Scheduler, WorkGroup, WorkKind
+from ._storage import _always, run_progress
 from ._utils import AsyncContextManager, asyncgeneratorcontextmanager, queue_calls
 
 logger = logging.getLogger(__package__)
@@ -64,6 +75,12 @@ class FileSystem(Generic[FS_PATH], abc.ABC):
         size: int
         modification_time: Optional[float]
 
+    @dataclass(frozen=True)
+    class DirEntry(BasicStat[FS_PATH_STAT]):
+        # Directories have zero size and no modification time.
+        is_dir: bool
+        is_file: bool
+
     @abc.abstractmethod
     async def exists(self, path: FS_PATH) -> bool:
         pass
@@ -87,11 +104,11 @@ class FileSystem(Generic[FS_PATH], abc.ABC):
         pass
 
     async def read(self, path: FS_PATH) -> bytes:
-        data = b""
+        data = bytearray()
         async with self.read_chunks(path) as chunks:
             async for chunk in chunks:
                 data += chunk
-        return data
+        return bytes(data)
 
     @abc.abstractmethod
     async def write_chunks(
@@ -100,6 +117,8 @@ class FileSystem(Generic[FS_PATH], abc.ABC):
         body: AsyncIterator[bytes],
         offset: int = 0,
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
     ) -> None:
         pass
 
@@ -111,6 +130,14 @@ class FileSystem(Generic[FS_PATH], abc.ABC):
     def iter_dir(self, path: FS_PATH) -> AsyncContextManager[AsyncIterator[FS_PATH]]:
         pass
 
+    @abc.abstractmethod
+    def iter_dir_stat(
+        self, path: FS_PATH
+    ) -> AsyncContextManager[AsyncIterator["FileSystem.DirEntry[FS_PATH]"]]:
+        # Like iter_dir() but with the type, size and modification time
+        # of entries, without requesting them one by one.
+        pass
+
     @abc.abstractmethod
     async def mkdir(self, dst: FS_PATH) -> None:
         pass
@@ -146,20 +173,30 @@ class LocalFS(FileSystem[Path]):
     supports_offset_read = True
     supports_offset_write = True
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        chunk_size: Optional[ChunkSizeController] = None,
+        *,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> None:
         self._file_sem = asyncio.BoundedSemaphore(MAX_OPEN_FILES)
+        # Read chunks follow the sizes chosen for the destination.
+        self._chunk_size: Union[int, ChunkSizeController] = chunk_size or READ_SIZE
+        # All blocking calls are run in the executor, the default executor
+        # of the event loop if not specified.
+        self._executor = executor
 
     async def exists(self, path: Path) -> bool:
-        return path.exists()
+        return await run_io(self._executor, path.exists)
 
     async def is_dir(self, path: Path) -> bool:
-        return path.is_dir()
+        return await run_io(self._executor, path.is_dir)
 
     async def is_file(self, path: Path) -> bool:
-        return path.is_file()
+        return await run_io(self._executor, path.is_file)
 
     async def stat(self, path: Path) -> "FileSystem.BasicStat[Path]":
-        stat = path.stat()
+        stat = await run_io(self._executor, path.stat)
         return FileSystem.BasicStat(
             name=path.name,
             path=path,
@@ -171,16 +208,18 @@ class LocalFS(FileSystem[Path]):
     async def read_chunks(
         self, path: Path, offset: int = 0
     ) -> AsyncIterator[AsyncIterator[bytes]]:
-        loop = asyncio.get_event_loop()
         async with self._file_sem:
 
             async def _gen() -> AsyncIterator[bytes]:
-                with path.open("rb") as stream:
+                # The chunks are views of a reused buffer or of the
+                # memory-mapped file, consumers should not keep them.
+                stream = await run_io(self._executor, lambda: path.open("rb"))
+                with stream:
                     stream.seek(offset)
-                    chunk = await loop.run_in_executor(None, stream.read, READ_SIZE)
-                    while chunk:
+                    async for chunk in iter_file_chunks(
+                        stream, self._chunk_size, executor=self._executor
+                    ):
                         yield chunk
-                        chunk = await loop.run_in_executor(None, stream.read, READ_SIZE)
 
             gen = _gen()
             try:
@@ -194,25 +233,37 @@ class LocalFS(FileSystem[Path]):
         body: AsyncIterator[bytes],
         offset: int = 0,
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
     ) -> None:
-        loop = asyncio.get_event_loop()
-        with path.open("rb+" if offset else "wb") as stream:
+        stream = await run_io(self._executor, path.open, "rb+" if offset else "wb")
+        with stream:
             if offset:
                 stream.seek(offset)
             async for chunk in body:
-                await loop.run_in_executor(None, stream.write, chunk)
+                await run_io(self._executor, stream.write, chunk)
                 if progress:
                     await progress(len(chunk))
 
     @asyncgeneratorcontextmanager
     async def iter_dir(self, path: Path) -> AsyncIterator[Path]:
-        loop = asyncio.get_event_loop()
         async with self._file_sem:
-            for item in await loop.run_in_executor(None, lambda: list(path.iterdir())):
+            for item in await run_io(self._executor, lambda: list(path.iterdir())):
                 yield item
 
+    @asyncgeneratorcontextmanager
+    async def iter_dir_stat(
+        self, path: Path
+    ) -> AsyncIterator["FileSystem.DirEntry[Path]"]:
+        async with self._file_sem:
+            entries = await run_io(self._executor, _scan_dir, path)
+        for entry in entries:
+            yield entry
+
     async def mkdir(self, dst: Path) -> None:
-        dst.mkdir(parents=True, exist_ok=True)
+        await run_io(
+            self._executor, functools.partial(dst.mkdir, parents=True, exist_ok=True)
+        )
 
     def to_url(self, path: Path) -> URL:
         return URL(path.as_uri())
@@ -230,10 +281,44 @@ class LocalFS(FileSystem[Path]):
         return path / child
 
     async def rm(self, path: Path) -> None:
-        path.unlink()
+        await run_io(self._executor, path.unlink)
 
     async def rmdir(self, path: Path) -> None:
-        path.rmdir()
+        await run_io(self._executor, path.rmdir)
+
+
+def _scan_dir(path: Path) -> List["FileSystem.DirEntry[Path]"]:
+    ret: List[FileSystem.DirEntry[Path]] = []
+    with os.scandir(path) as it:
+        for entry in it:
+            child = path / entry.name
+            try:
+                stat = entry.stat()
+            except OSError:
+                # Broken symlink or removed file.
+                ret.append(
+                    FileSystem.DirEntry(
+                        path=child,
+                        name=entry.name,
+                        size=0,
+                        modification_time=None,
+                        is_dir=False,
+                        is_file=False,
+                    )
+                )
+                continue
+            is_dir = S_ISDIR(stat.st_mode)
+            ret.append(
+                FileSystem.DirEntry(
+                    path=child,
+                    name=entry.name,
+                    size=0 if is_dir else stat.st_size,
+                    modification_time=None if is_dir else stat.st_mtime,
+                    is_dir=is_dir,
+                    is_file=S_ISREG(stat.st_mode),
+                )
+            )
+    return ret
 
 
 async def rm(
@@ -258,27 +343,34 @@ async def rm(
             StorageProgressDelete(uri=fs.to_url(file_path), is_dir=False)
         )
 
-    async def _rm_dir(dir_path: FS_PATH) -> None:
-        tasks = []
-        async with fs.iter_dir(dir_path) as dir_it:
-            async for sub_path in dir_it:
-                if await fs.is_dir(sub_path):
-                    tasks.append(_rm_dir(sub_path))
-                elif await fs.is_file(sub_path):
-                    tasks.append(_rm_file(sub_path))
-                else:
-                    raise ValueError(
-                        f"Cannot delete {sub_path}, not regular file/directory"
-                    )
-        await run_concurrently(tasks)
-        await fs.rmdir(dir_path)
-        await async_progress.delete(
-            StorageProgressDelete(uri=fs.to_url(dir_path), is_dir=True)
-        )
+    async def _rm_dir(dir_path: FS_PATH, group: WorkGroup) -> None:
+        async def _rmdir() -> None:
+            await fs.rmdir(dir_path)
+            await async_progress.delete(
+                StorageProgressDelete(uri=fs.to_url(dir_path), is_dir=True)
+            )
+
+        async with group.group(on_done=_rmdir) as dir_group:
+            async with fs.iter_dir_stat(dir_path) as dir_it:
+                async for entry in dir_it:
+                    if entry.is_dir:
+                        await dir_group.submit(
+                            WorkKind.LIST,
+                            functools.partial(_rm_dir, entry.path, group=dir_group),
+                        )
+                    elif entry.is_file:
+                        await dir_group.submit(
+                            WorkKind.SMALL_FILE,
+                            functools.partial(_rm_file, entry.path),
+                        )
+                    else:
+                        raise ValueError(
+                            f"Cannot delete {entry.path}, not regular file/directory"
+                        )
 
     async def _rm() -> None:
         if recursive:
-            await _rm_dir(dir_path=path)
+            await Scheduler().run(functools.partial(_rm_dir, path))
         else:
             await _rm_file(file_path=path)
 
@@ -307,10 +399,19 @@ class FileTransferer(Generic[S_PATH, D_PATH]):
             )
 
     async def _check_transfer(
-        self, src: S_PATH, dst: D_PATH, update: bool, continue_: bool
+        self,
+        src: S_PATH,
+        dst: D_PATH,
+        update: bool,
+        continue_: bool,
+        *,
+        src_stat: Optional["FileSystem.BasicStat[S_PATH]"] = None,
+        dst_stat: Optional["FileSystem.BasicStat[D_PATH]"] = None,
     ) -> Optional[int]:
-        src_stat = await self.src_fs.stat(src)
-        dst_stat = await self.dst_fs.stat(dst)
+        if src_stat is None:
+            src_stat = await self.src_fs.stat(src)
+        if dst_stat is None:
+            dst_stat = await self.dst_fs.stat(dst)
 
         if src_stat.modification_time is None or dst_stat.modification_time is None:
             return 0  # Cannot check, re-transfer required
@@ -375,22 +476,27 @@ class FileTransferer(Generic[S_PATH, D_PATH]):
         dst: D_PATH,
         *,
         offset: int = 0,
+        size: Optional[int] = None,
         progress: _AsyncAbstractFileProgress,
     ) -> None:
         src_url = self.src_fs.to_url(src)
         dst_url = self.dst_fs.to_url(dst)
-        size = (await self.src_fs.stat(src)).size
+        if size is None:
+            size = (await self.src_fs.stat(src)).size
+        total = size
         async with self.src_fs.read_chunks(src, offset) as chunks:
-            await progress.start(StorageProgressStart(src_url, dst_url, size))
+            await progress.start(StorageProgressStart(src_url, dst_url, total))
             pos = offset
 
             async def _progress(bytes_sent: int) -> None:
                 nonlocal pos
                 pos += bytes_sent
-                await progress.step(StorageProgressStep(src_url, dst_url, pos, size))
+                await progress.step(StorageProgressStep(src_url, dst_url, pos, total))
 
-            await self.dst_fs.write_chunks(dst, chunks, offset, _progress)
-            await progress.complete(StorageProgressComplete(src_url, dst_url, size))
+            await self.dst_fs.write_chunks(
+                dst, chunks, offset, _progress, size=size - offset
+            )
+            await progress.complete(StorageProgressComplete(src_url, dst_url, total))
 
     async def transfer_dir(
         self,
@@ -420,15 +526,18 @@ class FileTransferer(Generic[S_PATH, D_PATH]):
         queue, async_progress = queue_calls(progress)
         await run_progress(
             queue,
-            self._transfer_dir(
-                src,
-                dst,
-                "",
-                continue_=continue_,
-                update=update,
-                filter=filter,
-                ignore_file_names=ignore_file_names,
-                progress=async_progress,
+            Scheduler().run(
+                functools.partial(
+                    self._transfer_dir,
+                    src,
+                    dst,
+                    "",
+                    continue_=continue_,
+                    update=update,
+                    filter=filter,
+                    ignore_file_names=ignore_file_names,
+                    progress=async_progress,
+                )
             ),
         )
 
@@ -443,84 +552,109 @@ class FileTransferer(Generic[S_PATH, D_PATH]):
         filter: AsyncFilterFunc,
         ignore_file_names: AbstractSet[str],
         progress: _AsyncAbstractRecursiveFileProgress,
+        group: WorkGroup,
+        dst_exists: Optional[bool] = None,
     ) -> None:
+        # *dst_exists* is known from the listing of the parent destination
+        # directory for subdirectories, only the root is checked with extra
+        # requests.
         src_url = self.src_fs.to_url(src)
         dst_url = self.dst_fs.to_url(dst)
 
-        dst_files = {}
-        if update or continue_:
-            async with self.dst_fs.iter_dir(dst) as it:
-                dst_files = {self.dst_fs.name(entry): entry async for entry in it}
-
-        if await self.dst_fs.exists(dst):
-            if not await self.dst_fs.is_dir(dst):
+        if dst_exists is None:
+            dst_exists = await self.dst_fs.exists(dst)
+            if dst_exists and not await self.dst_fs.is_dir(dst):
                 raise NotADirectoryError(errno.ENOTDIR, "Not a directory", dst)
+
+        dst_files: Dict[str, FileSystem.DirEntry[D_PATH]] = {}
+        if dst_exists:
+            async with self.dst_fs.iter_dir_stat(dst) as it:
+                dst_files = {entry.name: entry async for entry in it}
         else:
             await self.dst_fs.mkdir(dst)
 
         await progress.enter(StorageProgressEnterDir(src_url, dst_url))
 
-        async with self.src_fs.iter_dir(src) as src_files_it:
+        async with self.src_fs.iter_dir_stat(src) as src_files_it:
             src_files = [entry async for entry in src_files_it]
 
         if ignore_file_names:
-            for child in src_files:
-                name = self.src_fs.name(child)
-                if name in ignore_file_names and await self.src_fs.is_file(child):
-                    logger.debug(f"Load ignore file {rel_path}{name}")
+            for entry in src_files:
+                if entry.name in ignore_file_names and entry.is_file:
+                    logger.debug(f"Load ignore file {rel_path}{entry.name}")
                     file_filter = FileFilter(filter)
-                    data = await self.src_fs.read(child)
+                    data = await self.src_fs.read(entry.path)
                     file_filter.read_from_buffer(data, prefix=rel_path)
                     filter = file_filter.match
-        tasks = []
-        for child in src_files:
-            name = self.src_fs.name(child)
-            child_rel_path = f"{rel_path}{name}"
-            if await self.src_fs.is_dir(child):
-                child_rel_path += "/"
-            if not await filter(child_rel_path):
-                logger.debug(f"Skip {child_rel_path}")
-                continue
-            if await self.src_fs.is_file(child):
-                offset: Optional[int] = 0
-                if (update or continue_) and name in dst_files:
-                    offset = await self._check_transfer(
-                        child, dst_files[name], update=update, continue_=continue_
-                    )
-                    if offset is None:
-                        continue
-                assert offset is not None
-                tasks.append(
-                    self._transfer_file(
-                        child,
-                        self.dst_fs.child(dst, name),
-                        offset=offset,
-                        progress=progress,
+
+        async def leave() -> None:
+            await progress.leave(StorageProgressLeaveDir(src_url, dst_url))
+
+        async with group.group(on_done=leave) as dir_group:
+            for entry in src_files:
+                name = entry.name
+                child_rel_path = f"{rel_path}{name}"
+                if entry.is_dir:
+                    child_rel_path += "/"
+                if not await filter(child_rel_path):
+                    logger.debug(f"Skip {child_rel_path}")
+                    continue
+                dst_entry = dst_files.get(name)
+                if entry.is_file:
+                    offset: Optional[int] = 0
+                    if (update or continue_) and dst_entry and dst_entry.is_file:
+                        offset = await self._check_transfer(
+                            entry.path,
+                            dst_entry.path,
+                            update=update,
+                            continue_=continue_,
+                            src_stat=entry,
+                            dst_stat=dst_entry,
+                        )
+                        if offset is None:
+                            continue
+                    assert offset is not None
+                    await dir_group.submit(
+                        WorkKind.for_file(entry.size),
+                        functools.partial(
+                            self._transfer_file,
+                            entry.path,
+                            self.dst_fs.child(dst, name),
+                            offset=offset,
+                            size=entry.size,
+                            progress=progress,
+                        ),
                     )
-                )
-            elif await self.src_fs.is_dir(child):
-                tasks.append(
-                    self._transfer_dir(
-                        child,
-                        self.dst_fs.child(dst, name),
-                        child_rel_path,
-                        continue_=continue_,
-                        update=update,
-                        filter=filter,
-                        ignore_file_names=ignore_file_names,
-                        progress=progress,
+                elif entry.is_dir:
+                    child_dst_exists: Optional[bool] = False
+                    if dst_entry is not None:
+                        # Let the child check and report a file.
+                        child_dst_exists = True if dst_entry.is_dir else None
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(
+                            self._transfer_dir,
+                            entry.path,
+                            self.dst_fs.child(dst, name),
+                            child_rel_path,
+                            continue_=continue_,
+                            update=update,
+                            filter=filter,
+                            ignore_file_names=ignore_file_names,
+                            progress=progress,
+                            group=dir_group,
+                            dst_exists=child_dst_exists,
+                        ),
                     )
-                )
-            else:
-                await progress.fail(
-                    StorageProgressFail(
-                        src_url / name,
-                        dst_url / name,
-                        f"Cannot transfer {child}, not regular file/directory",
+                else:
+                    await progress.fail(
+                        StorageProgressFail(
+                            src_url / name,
+                            dst_url / name,
+                            f"Cannot transfer {entry.path}, "
+                            "not regular file/directory",
+                        )
                     )
-                )
-        await run_concurrently(tasks)
-        await progress.leave(StorageProgressLeaveDir(src_url, dst_url))
 
 
 async def load_parent_ignore_files(
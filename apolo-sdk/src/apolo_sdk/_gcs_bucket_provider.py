@@ -3,14 +3,31 @@ import asyncio
 import base64
 import json
 import logging
+import secrets
 import urllib.parse
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
 from email.utils import parsedate_to_datetime
 from io import BytesIO
-from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
-from aiohttp import ClientResponse, ClientSession
+from aiohttp import (
+    ClientResponse,
+    ClientResponseError,
+    ClientSession,
+    MultipartReader,
+    MultipartWriter,
+)
 from dateutil.parser import isoparse
 from google.auth.transport._aiohttp_requests import Request
 from google.oauth2._service_account_async import Credentials as SACredentials
@@ -26,7 +43,7 @@ from ._bucket_base import (
     MeasureTimeDiffMixin,
 )
 from ._errors import ResourceNotFound
-from ._utils import asyncgeneratorcontextmanager
+from ._utils import aclosing, asyncgeneratorcontextmanager, run_concurrently
 
 logger = logging.getLogger(__package__)
 
@@ -107,7 +124,14 @@ class ServiceAccountRefreshingGCSToken(AutoRefreshingGCSToken):
 class GCSProvider(MeasureTimeDiffMixin, BucketProvider):
     BASE_URL = "https://storage.googleapis.com/storage/v1"
     UPLOAD_BASE_URL = "https://storage.googleapis.com/upload/storage/v1"
+    BATCH_URL = "https://storage.googleapis.com/batch/storage/v1"
     MIN_CHUNK_SIZE = 10 * 262144
+    # A composite object can have at most 1024 components
+    MAX_PARTS = 1024
+    # Compose accepts at most 32 source objects per request
+    MAX_COMPOSE_SOURCES = 32
+    # Smaller blobs are uploaded in a single resumable session
+    COMPOSITE_UPLOAD_THRESHOLD = 150 * 2**20  # 150 MiB
 
     def __init__(
         self,
@@ -249,6 +273,24 @@ class GCSProvider(MeasureTimeDiffMixin, BucketProvider):
         key: str,
         body: Union[AsyncIterator[bytes], bytes],
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
+    ) -> None:
+        if (
+            isinstance(body, bytes)
+            or size is None
+            or size < self.COMPOSITE_UPLOAD_THRESHOLD
+            or self._parallel_parts < 2
+        ):
+            await self._put_blob_resumable(key, body, progress)
+        else:
+            await self._put_blob_composite(key, body, size, progress)
+
+    async def _put_blob_resumable(
+        self,
+        key: str,
+        body: Union[AsyncIterator[bytes], bytes],
+        progress: Optional[Callable[[int], Awaitable[None]]],
     ) -> None:
         # Step 1: initiate multipart upload
         url = f"{self.UPLOAD_BASE_URL}/b/{self._gcs_bucket_name}/o"
@@ -263,7 +305,9 @@ class GCSProvider(MeasureTimeDiffMixin, BucketProvider):
             session_url = URL(resp.headers["Location"])
 
         uploaded_bytes = 0
-        buffer = b""
+        # Accumulate chunks in a mutable buffer, ``bytes += chunk`` would
+        # copy the accumulated data on every append.
+        buffer: Union[bytes, bytearray] = bytearray()
 
         async def _upload_chunk(*, final: bool = False) -> None:
             nonlocal uploaded_bytes
@@ -277,47 +321,163 @@ class GCSProvider(MeasureTimeDiffMixin, BucketProvider):
                 data_range = "*"
             else:
                 data_range = f"{uploaded_bytes}-{uploaded_bytes + size - 1}"
-            async with self._request(
-                "PUT",
-                url=str(session_url),
-                data=BytesIO(buffer),
-                headers={"Content-Range": (f"bytes {data_range}/{total}")},
-            ):
-                pass
+            with self._measure(size):
+                async with self._request(
+                    "PUT",
+                    url=str(session_url),
+                    data=BytesIO(buffer),
+                    headers={"Content-Range": (f"bytes {data_range}/{total}")},
+                ):
+                    pass
             if progress:
                 await progress(size)
             uploaded_bytes += size
-            buffer = b""
+            buffer = bytearray()
 
         if isinstance(body, bytes):
             buffer = body
         else:
             async for chunk in body:
                 buffer += chunk
-                if len(buffer) > self.MIN_CHUNK_SIZE:
+                if len(buffer) > self._get_part_size():
                     await _upload_chunk()
 
         # Complete file:
         await _upload_chunk(final=True)
 
+    async def _put_blob_composite(
+        self,
+        key: str,
+        body: AsyncIterator[bytes],
+        size: int,
+        progress: Optional[Callable[[int], Awaitable[None]]],
+    ) -> None:
+        # Upload parts as separate objects concurrently and compose them
+        # into the target blob, temporary objects are always removed.
+        prefix = f"{key}.upload-{secrets.token_hex(8)}-"
+        temporary: List[str] = []
+
+        async def _upload_component(part_number: int, data: bytearray) -> str:
+            name = f"{prefix}{part_number}"
+            temporary.append(name)
+            await self._upload_object(name, data)
+            return name
+
+        try:
+            names = await self._upload_parts(
+                body, _upload_component, size=size, progress=progress
+            )
+            level = 0
+            while len(names) > self.MAX_COMPOSE_SOURCES:
+                level += 1
+                groups = [
+                    names[i : i + self.MAX_COMPOSE_SOURCES]
+                    for i in range(0, len(names), self.MAX_COMPOSE_SOURCES)
+                ]
+                names = [f"{prefix}{level}-{i}" for i in range(len(groups))]
+                temporary.extend(names)
+                await run_concurrently(
+                    self._compose(name, group) for name, group in zip(names, groups)
+                )
+            await self._compose(key, names)
+        finally:
+            await run_concurrently(self._delete_temporary(name) for name in temporary)
+
+    async def _upload_object(self, key: str, data: bytearray) -> None:
+        url = f"{self.UPLOAD_BASE_URL}/b/{self._gcs_bucket_name}/o"
+        params = {"uploadType": "media", "name": key}
+        with self._measure(len(data)):
+            async with self._request(
+                "POST",
+                url=url,
+                params=params,
+                headers=await self._get_auth_headers(),
+                data=BytesIO(data),
+            ):
+                pass
+
+    async def _compose(self, key: str, sources: List[str]) -> None:
+        key = urllib.parse.quote(key, safe="")
+        url = f"{self.BASE_URL}/b/{self._gcs_bucket_name}/o/{key}/compose"
+        async with self._request(
+            "POST",
+            url=url,
+            headers=await self._get_auth_headers(),
+            json={
+                "sourceObjects": [{"name": name} for name in sources],
+                "destination": {"contentType": "application/octet-stream"},
+            },
+        ):
+            pass
+
+    async def _delete_temporary(self, key: str) -> None:
+        try:
+            await self.delete_blob(key)
+        except ResourceNotFound:
+            pass
+        except Exception as e:
+            # Do not hide the result of the upload
+            logger.warning(f"Failed to delete temporary object {key}: {e}")
+
     @asyncgeneratorcontextmanager
     async def fetch_blob(self, key: str, offset: int = 0) -> AsyncIterator[bytes]:
         key = urllib.parse.quote(key, safe="")
         url = f"{self.BASE_URL}/b/{self._gcs_bucket_name}/o/{key}"
         params = {"alt": "media"}
-        headers = dict(await self._get_auth_headers())
-        if offset:
-            headers["Range"] = f"bytes={offset}-"
+        part_size = self._get_part_size()
+        size: Optional[int] = None
+        generation = ""
         try:
-            async with self._request(
-                "GET", url=url, params=params, headers=headers
-            ) as resp:
-                async for data in resp.content.iter_any():
-                    yield data
+            # The first range also tells the size and the generation of the blob
+            headers = dict(await self._get_auth_headers())
+            headers["Range"] = f"bytes={offset}-{offset + part_size - 1}"
+            try:
+                async with self._request(
+                    "GET", url=url, params=params, headers=headers
+                ) as resp:
+                    if resp.status == 206:
+                        size = int(resp.headers["Content-Range"].rpartition("/")[2])
+                        generation = resp.headers.get("x-goog-generation", "")
+                    async for data in resp.content.iter_any():
+                        yield data
+            except ClientResponseError as e:
+                if e.status != 416:
+                    raise
+                # Empty blob or offset at the end, retry with an open range
+                headers = dict(await self._get_auth_headers())
+                if offset:
+                    headers["Range"] = f"bytes={offset}-"
+                async with self._request(
+                    "GET", url=url, params=params, headers=headers
+                ) as resp:
+                    async for data in resp.content.iter_any():
+                        yield data
+                return
         except ResourceNotFound:
             raise ResourceNotFound(
                 f"There is no object with key {key} in bucket {self.bucket.name}"
             )
+        if size is None or offset + part_size >= size:
+            return
+
+        # Ranges of a blob overwritten in the meantime must not be mixed
+        range_params = dict(params)
+        if generation:
+            range_params["ifGenerationMatch"] = generation
+
+        async def _fetch_range(start: int, end: int) -> bytes:
+            headers = dict(await self._get_auth_headers())
+            headers["Range"] = f"bytes={start}-{end - 1}"
+            async with self._request(
+                "GET", url=url, params=range_params, headers=headers
+            ) as resp:
+                return await resp.read()
+
+        async with aclosing(
+            self._fetch_ranges(_fetch_range, offset + part_size, size)
+        ) as it:
+            async for chunk in it:
+                yield chunk
 
     async def delete_blob(self, key: str) -> None:
         key = urllib.parse.quote(key, safe="")
@@ -331,3 +491,74 @@ class GCSProvider(MeasureTimeDiffMixin, BucketProvider):
             raise ResourceNotFound(
                 f"There is no object with key {key} in bucket {self.bucket.name}"
             )
+
+    # A batch request can contain at most 100 calls
+    MAX_DELETE_BATCH = 100
+
+    async def delete_blobs(self, keys: Sequence[str]) -> None:
+        path = URL(self.BASE_URL).path
+        with MultipartWriter("mixed") as writer:
+            for i, key in enumerate(keys):
+                key = urllib.parse.quote(key, safe="")
+                writer.append(
+                    f"DELETE {path}/b/{self._gcs_bucket_name}/o/{key} HTTP/1.1\r\n\r\n",
+                    {"Content-Type": "application/http", "Content-ID": f"<{i}>"},
+                )
+        async with self._request(
+            "POST",
+            url=self.BATCH_URL,
+            headers=await self._get_auth_headers(),
+            data=writer,
+        ) as resp:
+            reader = MultipartReader.from_response(resp)
+            while True:
+                part = await reader.next()
+                if part is None:
+                    break
+                # The body of every part is a response like "HTTP/1.1 204 ..."
+                status_line = (await part.text()).partition("\r\n")[0]  # type: ignore
+                _, status_str, *reason = status_line.split(" ", 2)
+                status = int(status_str)
+                if status >= 400 and status != 404:
+                    raise ClientResponseError(
+                        resp.request_info,
+                        resp.history,
+                        status=status,
+                        message="".join(reason),
+                    )
+
+    def can_copy_from(self, src: BucketProvider) -> bool:
+        # The destination token should allow reading of the source bucket
+        return isinstance(src, GCSProvider)
+
+    async def copy_blob(
+        self,
+        src: BucketProvider,
+        src_key: str,
+        key: str,
+        *,
+        size: int,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> None:
+        assert isinstance(src, GCSProvider)
+        src_key = urllib.parse.quote(src_key, safe="")
+        key = urllib.parse.quote(key, safe="")
+        url = (
+            f"{self.BASE_URL}/b/{src._gcs_bucket_name}/o/{src_key}"
+            f"/rewriteTo/b/{self._gcs_bucket_name}/o/{key}"
+        )
+        # Large blobs are rewritten in several calls continuing each other
+        params: Mapping[str, str] = {}
+        copied = 0
+        while True:
+            async with self._request(
+                "POST", url=url, params=params, headers=await self._get_auth_headers()
+            ) as resp:
+                data = await resp.json()
+            rewritten = int(data["totalBytesRewritten"])
+            if progress is not None and rewritten > copied:
+                await progress(rewritten - copied)
+            copied = rewritten
+            if data["done"]:
+                return
+            params = {"rewriteToken": data["rewriteToken"]}
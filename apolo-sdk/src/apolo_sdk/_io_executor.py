@@ -0,0 +1,56 @@
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Callable, Optional, TypeVar
+
+MAX_IO_THREADS = 16
+
+_T = TypeVar("_T")
+
+
+class IOExecutor(concurrent.futures.Executor):
+    """Thread pool for blocking file system calls of the SDK.
+
+    It is separate from the event loop's default executor, so slow disks
+    and network mounts do not delay DNS resolution and other users of the
+    default executor, and vice versa.  The threads are started on demand,
+    *get_max_workers* is called once when the pool is created.
+    """
+
+    def __init__(
+        self, get_max_workers: Callable[[], int] = lambda: MAX_IO_THREADS
+    ) -> None:
+        self._get_max_workers = get_max_workers
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self._get_max_workers(),
+                    thread_name_prefix="apolo-io",
+                )
+            return self._pool
+
+    def submit(
+        self, fn: Callable[..., _T], /, *args: Any, **kwargs: Any
+    ) -> "concurrent.futures.Future[_T]":
+        return self._get_pool().submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+        if pool is not None:
+            pool.shutdown(wait, cancel_futures=cancel_futures)
+
+
+async def run_io(
+    executor: Optional[concurrent.futures.Executor],
+    func: Callable[..., _T],
+    *args: Any,
+) -> _T:
+    """Run a blocking call in *executor* or in the default executor if None."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, func, *args)
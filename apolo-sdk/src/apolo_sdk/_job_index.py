@@ -0,0 +1,200 @@
+import contextlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ._config import Config
+from ._utils import ensure_schema
+
+# id, owner, cluster_name, org_name, project_name, name, status, created_at
+# org_name is "NO_ORG" for jobs without an organization
+JobIndexRecord = Tuple[str, str, str, str, str, Optional[str], str, float]
+
+JOB_INDEX_SCHEMA = {
+    "job_index": (
+        "CREATE TABLE job_index "
+        "(id TEXT PRIMARY KEY, owner TEXT, cluster_name TEXT, org_name TEXT, "
+        "project_name TEXT, name TEXT, status TEXT, created_at REAL, checked REAL)"
+    ),
+    "job_index_name": (
+        "CREATE INDEX job_index_name ON job_index (cluster_name, project_name, name)"
+    ),
+    "job_index_cursor": (
+        "CREATE TABLE job_index_cursor (key TEXT PRIMARY KEY, since REAL, checked REAL)"
+    ),
+}
+JOB_INDEX_DROP = {
+    "job_index_name": "DROP INDEX IF EXISTS job_index_name",
+    "job_index": "DROP TABLE IF EXISTS job_index",
+    "job_index_cursor": "DROP TABLE IF EXISTS job_index_cursor",
+}
+
+
+class JobIndex:
+    """Jobs seen recently by the client, stored in the config database.
+
+    Used to resolve job names and to complete job ids and names
+    without a round trip to the server.  The methods are blocking,
+    Jobs calls them in the IO executor.
+    """
+
+    # Records of jobs created earlier are dropped on refresh
+    MAX_AGE = 7 * 24 * 3600
+    # Seconds between fetches of jobs created since the previous refresh
+    REFRESH_INTERVAL = 30.0
+    # Seconds an active job found by name is not checked on the server
+    CHECK_INTERVAL = 60.0
+
+    _COLUMNS = (
+        "id, owner, cluster_name, org_name, project_name, name, status, created_at"
+    )
+
+    def __init__(self, config: Config) -> None:
+        self._config = config
+        # Last written statuses, unchanged statuses are not written again
+        self._statuses: Dict[str, str] = {}
+        # The schema is checked once, the methods are called from IO threads
+        self._schema_checked = False
+        self._schema_lock = threading.Lock()
+
+    def _ensure_schema(self, db: sqlite3.Connection) -> None:
+        if self._schema_checked:
+            return
+        with self._schema_lock:
+            if not self._schema_checked:
+                ensure_schema(db, JOB_INDEX_SCHEMA, JOB_INDEX_DROP)
+                self._schema_checked = True
+
+    def find(
+        self, cluster_name: str, project_names: Iterable[str], name: str
+    ) -> List[Tuple[JobIndexRecord, float]]:
+        """Return records of jobs with the given name, the most recent first.
+
+        Every record is paired with the time it was last fetched from the server.
+        """
+        project_names = list(project_names)
+        placeholders = ", ".join("?" * len(project_names))
+        with self._config._open_db() as db:
+            self._ensure_schema(db)
+            cur = db.execute(
+                f"""
+                SELECT {self._COLUMNS}, checked FROM job_index
+                WHERE cluster_name = ? AND project_name IN ({placeholders})
+                    AND name = ?
+                ORDER BY created_at DESC
+                """,
+                (cluster_name, *project_names, name),
+            )
+            return [(tuple(row[:-1]), row[-1]) for row in cur]
+        return []
+
+    def recent(
+        self,
+        cluster_name: str,
+        org_name: str,
+        project_names: Sequence[str],
+        since: float,
+        limit: Optional[int],
+        *,
+        statuses: Sequence[str] = (),
+    ) -> List[JobIndexRecord]:
+        """Return records of jobs created after since, the most recent first."""
+        query = f"""
+            SELECT {self._COLUMNS} FROM job_index
+            WHERE cluster_name = ? AND org_name = ? AND created_at >= ?
+        """
+        args: List[object] = [cluster_name, org_name, since]
+        if project_names:
+            placeholders = ", ".join("?" * len(project_names))
+            query += f" AND project_name IN ({placeholders})"
+            args.extend(project_names)
+        if statuses:
+            placeholders = ", ".join("?" * len(statuses))
+            query += f" AND status IN ({placeholders})"
+            args.extend(statuses)
+        query += " ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            args.append(limit)
+        with self._config._open_db() as db:
+            self._ensure_schema(db)
+            cur = db.execute(query, args)
+            return [tuple(row) for row in cur]
+        return []
+
+    def add(
+        self, records: Iterable[JobIndexRecord], *, now: Optional[float] = None
+    ) -> None:
+        """Add or replace records of jobs just fetched from the server."""
+        if now is None:
+            now = time.time()
+        records = list(records)
+        with self._config._open_db() as db:
+            self._ensure_schema(db)
+            db.executemany(
+                f"INSERT OR REPLACE INTO job_index ({self._COLUMNS}, checked) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(*record, now) for record in records],
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
+        for record in records:
+            self._statuses[record[0]] = record[6]
+
+    def remove(self, ids: Iterable[str]) -> None:
+        ids = list(ids)
+        with self._config._open_db() as db:
+            self._ensure_schema(db)
+            db.executemany("DELETE FROM job_index WHERE id = ?", [(id,) for id in ids])
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
+        for id in ids:
+            self._statuses.pop(id, None)
+
+    def set_status(self, id: str, status: str) -> None:
+        if self._statuses.get(id) == status:
+            return
+        with self._config._open_db() as db:
+            self._ensure_schema(db)
+            db.execute(
+                "UPDATE job_index SET status = ? WHERE id = ? AND status != ?",
+                (status, id, status),
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
+        self._statuses[id] = status
+
+    def get_cursor(self, key: str) -> Optional[Tuple[float, float]]:
+        """Return the creation time of the newest fetched job
+        and the time of the last refresh."""
+        with self._config._open_db() as db:
+            self._ensure_schema(db)
+            cur = db.execute(
+                "SELECT since, checked FROM job_index_cursor WHERE key = ?", (key,)
+            )
+            row = cur.fetchone()
+            return None if row is None else (row["since"], row["checked"])
+        return None
+
+    def set_cursor(
+        self, key: str, since: float, *, now: Optional[float] = None
+    ) -> None:
+        if now is None:
+            now = time.time()
+        with self._config._open_db() as db:
+            self._ensure_schema(db)
+            db.execute(
+                "INSERT OR REPLACE INTO job_index_cursor (key, since, checked) "
+                "VALUES (?, ?, ?)",
+                (key, since, now),
+            )
+            db.execute(
+                "DELETE FROM job_index WHERE created_at < ?", (now - self.MAX_AGE,)
+            )
+            db.execute(
+                "DELETE FROM job_index_cursor WHERE checked < ?",
+                (now - self.MAX_AGE,),
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
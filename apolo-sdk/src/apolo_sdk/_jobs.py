@@ -1,21 +1,31 @@
 import asyncio
+import collections.abc
 import enum
 import json
 import logging
+import random
+import re
+import time
 from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from decimal import Decimal
 from functools import partial
 from typing import (
+    AbstractSet,
     Any,
+    AsyncGenerator,
+    AsyncIterable,
     AsyncIterator,
     Dict,
     Iterable,
+    List,
     Mapping,
     Optional,
     Sequence,
     Set,
+    Tuple,
+    Union,
     overload,
 )
 
@@ -37,21 +47,36 @@ from ._abc import (
 )
 from ._config import Config
 from ._core import _Core
-from ._errors import NDJSONError, StdStreamError
+from ._errors import (
+    BadGateway,
+    IllegalArgumentError,
+    NDJSONError,
+    ResourceNotFound,
+    ServerNotAvailable,
+    StdStreamError,
+)
 from ._images import (
     _DummyProgress,
     _raise_on_error_chunk,
     _try_parse_image_progress_step,
 )
+from ._io_executor import IOExecutor, run_io
+from ._job_index import JobIndex, JobIndexRecord
 from ._parser import DiskVolume, Parser, SecretFile, Volume
-from ._parsing_utils import LocalImage, RemoteImage
+from ._parsing_utils import LocalImage, RemoteImage, _ImageNameParser
 from ._rewrite import rewrite_module
 from ._url_utils import (
     normalize_disk_uri,
     normalize_secret_uri,
     normalize_storage_path_uri,
 )
-from ._utils import NoPublicConstructor, asyncgeneratorcontextmanager
+from ._utils import (
+    LazySequence,
+    NoPublicConstructor,
+    aclosing,
+    asyncgeneratorcontextmanager,
+    json_loads,
+)
 
 log = logging.getLogger(__package__)
 
@@ -255,6 +280,101 @@ class JobDescription:
     _internal: JobDescriptionInternal = JobDescriptionInternal()
 
 
+@rewrite_module
+@dataclass(frozen=True)
+class JobSummary:
+    __slots__ = (
+        "id",
+        "owner",
+        "cluster_name",
+        "org_name",
+        "project_name",
+        "status",
+        "name",
+        "created_at",
+        "started_at",
+        "finished_at",
+        "changed_at",
+        "tags",
+        "description",
+        "image",
+        "command",
+        "working_dir",
+        "life_span",
+        "preset_name",
+    )
+
+    id: str
+    owner: str
+    cluster_name: str
+    org_name: Optional[str]
+    project_name: str
+    status: JobStatus
+    name: Optional[str]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    changed_at: Optional[datetime]
+    # Filled in only if requested by fields of Jobs.list_summaries()
+    tags: Sequence[str]
+    description: Optional[str]
+    image: Optional[RemoteImage]
+    command: Optional[str]
+    working_dir: Optional[str]
+    life_span: Optional[float]
+    preset_name: Optional[str]
+
+    @classmethod
+    def from_job(cls, job: JobDescription) -> "JobSummary":
+        return cls(
+            id=job.id,
+            owner=job.owner,
+            cluster_name=job.cluster_name,
+            org_name=job.org_name,
+            project_name=job.project_name,
+            status=job.status,
+            name=job.name,
+            created_at=job.history.created_at,
+            started_at=job.history.started_at,
+            finished_at=job.history.finished_at,
+            changed_at=job.history.changed_at,
+            tags=job.tags,
+            description=job.description,
+            image=job.container.image,
+            command=job.container.command,
+            working_dir=job.container.working_dir,
+            life_span=job.life_span,
+            preset_name=job.preset_name,
+        )
+
+
+# Fields of the API job documents required for JobSummary
+_JOB_SUMMARY_BASE_API_FIELDS = (
+    "id",
+    "owner",
+    "cluster_name",
+    "org_name",
+    "project_name",
+    "status",
+    "name",
+    "history",
+)
+
+# Errors of servers that do not support field projection mention the parameter
+_FIELD_PARAM_RE = re.compile(r"\bfields?\b", re.IGNORECASE)
+
+# Fields of the API job documents for optional fields of JobSummary
+_JOB_SUMMARY_API_FIELDS = {
+    "tags": "tags",
+    "description": "description",
+    "image": "container.image",
+    "command": "container.command",
+    "working_dir": "container.working_dir",
+    "life_span": "max_run_time_minutes",
+    "preset_name": "preset_name",
+}
+
+
 @rewrite_module
 @dataclass(frozen=True)
 class JobTelemetry:
@@ -326,10 +446,25 @@ class StdStream:
 
 @rewrite_module
 class Jobs(metaclass=NoPublicConstructor):
-    def __init__(self, core: _Core, config: Config, parse: Parser) -> None:
+    # Delays between job status checks in watch(), the delay grows
+    # while the job does not change
+    WATCH_MIN_DELAY = 0.2
+    WATCH_MAX_DELAY = 2.0
+    # Broken telemetry streams of top_many() are reconnected a few times,
+    # a job which telemetry is still unavailable is dropped from the stream
+    TOP_MANY_RETRIES = 3
+    TOP_MANY_RETRY_DELAY = 1.0
+
+    def __init__(
+        self, core: _Core, config: Config, parse: Parser, io_executor: IOExecutor
+    ) -> None:
         self._core = core
         self._config = config
         self._parse = parse
+        self._io_executor = io_executor
+        # Cleared if the server rejects the field projection of listings
+        self._list_fields_supported = True
+        self._index = JobIndex(config)
 
     def _get_monitoring_url(self, cluster_name: Optional[str]) -> URL:
         if cluster_name is None:
@@ -389,7 +524,13 @@ class Jobs(metaclass=NoPublicConstructor):
         auth = await self._config._api_auth()
         async with self._core.request("POST", url, json=payload, auth=auth) as resp:
             res = await resp.json()
-            return _job_description_from_api(res, self._parse)
+            job = _job_description_from_api(res, self._parse)
+        await run_io(
+            self._io_executor,
+            self._index.add,
+            [_job_index_record(JobSummary.from_job(job))],
+        )
+        return job
 
     async def start(
         self,
@@ -459,7 +600,13 @@ class Jobs(metaclass=NoPublicConstructor):
         auth = await self._config._api_auth()
         async with self._core.request("POST", url, json=payload, auth=auth) as resp:
             res = await resp.json()
-            return _job_description_from_api(res, self._parse)
+            job = _job_description_from_api(res, self._parse)
+        await run_io(
+            self._io_executor,
+            self._index.add,
+            [_job_index_record(JobSummary.from_job(job))],
+        )
+        return job
 
     @asyncgeneratorcontextmanager
     async def list(
@@ -480,10 +627,263 @@ class Jobs(metaclass=NoPublicConstructor):
         _being_dropped: Optional[bool] = False,
         _logs_removed: Optional[bool] = False,
     ) -> AsyncIterator[JobDescription]:
+        params = self._list_params(
+            statuses=statuses,
+            name=name,
+            tags=tags,
+            owners=owners,
+            since=since,
+            until=until,
+            reverse=reverse,
+            limit=limit,
+            cluster_name=cluster_name,
+            org_names=org_names,
+            project_names=project_names,
+            materialized=_materialized,
+            being_dropped=_being_dropped,
+            logs_removed=_logs_removed,
+        )
+        # Image name defaults come from the user config,
+        # they are resolved once per cluster rather than for every job
+        image_parsers: Dict[str, _ImageNameParser] = {}
+        async with aclosing(self._list_raw(params)) as it:
+            async for res in it:
+                yield _job_description_from_api(res, self._parse, image_parsers)
+
+    @asyncgeneratorcontextmanager
+    async def list_summaries(
+        self,
+        *,
+        fields: Iterable[str] = (),
+        statuses: Iterable[JobStatus] = (),
+        name: str = "",
+        tags: Iterable[str] = (),
+        owners: Iterable[str] = (),
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+        cluster_name: Optional[str] = None,
+        org_names: Iterable[Optional[str]] = (),
+        project_names: Iterable[str] = (),
+    ) -> AsyncIterator[JobSummary]:
+        field_set = frozenset(fields)
+        unknown = ", ".join(sorted(field_set - _JOB_SUMMARY_API_FIELDS.keys()))
+        if unknown:
+            raise ValueError(f"Unknown job summary fields: {unknown}")
+        params = self._list_params(
+            statuses=statuses,
+            name=name,
+            tags=tags,
+            owners=owners,
+            since=since,
+            until=until,
+            reverse=reverse,
+            limit=limit,
+            cluster_name=cluster_name,
+            org_names=org_names,
+            project_names=project_names,
+        )
+        image_parsers: Dict[str, _ImageNameParser] = {}
+        if self._list_fields_supported:
+            projected = params.copy()
+            for api_field in _JOB_SUMMARY_BASE_API_FIELDS:
+                projected.add("field", api_field)
+            for field_name in sorted(field_set):
+                projected.add("field", _JOB_SUMMARY_API_FIELDS[field_name])
+            started = False
+            try:
+                async with aclosing(self._list_raw(projected)) as it:
+                    async for res in it:
+                        started = True
+                        yield _job_summary_from_api(
+                            res, self._parse, field_set, image_parsers
+                        )
+                return
+            except IllegalArgumentError as e:
+                # Other bad arguments are reported by the server the same way
+                if started or not _FIELD_PARAM_RE.search(str(e)):
+                    raise
+                log.debug("Field projection of jobs is not supported by the server")
+                self._list_fields_supported = False
+        async with aclosing(self._list_raw(params)) as it:
+            async for res in it:
+                yield _job_summary_from_api(res, self._parse, field_set, image_parsers)
+
+    async def resolve_name(
+        self,
+        name: str,
+        *,
+        cluster_name: Optional[str] = None,
+        projects: Optional[Mapping[str, Optional[str]]] = None,
+    ) -> Optional[str]:
+        if cluster_name is None:
+            cluster_name = self._config.cluster_name
+        if projects is None:
+            projects = {self._config.project_name_or_raise: self._config.org_name}
+        # Names of active jobs are unique, the most recent job with the name
+        # is looked up on the server if it is finished or not indexed yet
+        records = await run_io(
+            self._io_executor, self._index.find, cluster_name, list(projects), name
+        )
+        now = time.time()
+        for record, checked in records:
+            indexed = _job_summary_from_index(record)
+            if indexed.org_name == (projects[indexed.project_name] or "NO_ORG"):
+                if not indexed.status.is_finished:
+                    if now - checked < self._index.CHECK_INTERVAL:
+                        return indexed.id
+                    # The job could be finished by another client
+                    # and the name could be taken by a new job since
+                    try:
+                        current = await self.status(indexed.id)
+                    except ResourceNotFound:
+                        await run_io(
+                            self._io_executor, self._index.remove, [indexed.id]
+                        )
+                    else:
+                        if not current.status.is_finished and current.name == name:
+                            await run_io(
+                                self._io_executor,
+                                self._index.add,
+                                [_job_index_record(JobSummary.from_job(current))],
+                            )
+                            return current.id
+                break
+        async with self.list_summaries(
+            name=name,
+            project_names=projects.keys(),
+            reverse=True,
+            cluster_name=cluster_name,
+        ) as it:
+            async for job in it:
+                if (
+                    job.project_name in projects
+                    and job.org_name == projects[job.project_name]
+                ):
+                    await run_io(
+                        self._io_executor, self._index.add, [_job_index_record(job)]
+                    )
+                    return job.id
+        return None
+
+    @asyncgeneratorcontextmanager
+    async def list_cached(
+        self,
+        *,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cluster_name: Optional[str] = None,
+        org_name: Optional[str] = None,
+        project_names: Iterable[str] = (),
+    ) -> AsyncIterator[JobSummary]:
+        if cluster_name is None:
+            cluster_name = self._config.cluster_name
+        org_name = org_name or self._config.org_name
+        projects = sorted(set(project_names))
+        since_ts = since.timestamp() if since is not None else 0.0
+        key = repr((cluster_name, org_name, projects))
+        now = time.time()
+        cursor = await run_io(self._io_executor, self._index.get_cursor, key)
+        if cursor is None or now - cursor[1] >= self._index.REFRESH_INTERVAL:
+            # Only jobs created since the previous refresh are fetched
+            if cursor is None:
+                newest = since_ts or now - self._index.MAX_AGE
+                fetch_since, fetch_limit = since, limit
+            else:
+                newest = cursor[0]
+                fetch_since = datetime.fromtimestamp(newest, timezone.utc)
+                fetch_limit = None
+            records: List[JobIndexRecord] = []
+            async with self.list_summaries(
+                since=fetch_since,
+                reverse=True,
+                limit=fetch_limit,
+                cluster_name=cluster_name,
+                org_names=[org_name],
+                project_names=projects,
+            ) as it:
+                async for job in it:
+                    record = _job_index_record(job)
+                    records.append(record)
+                    newest = max(newest, record[-1])
+            await run_io(self._io_executor, self._index.add, records)
+            if cursor is not None:
+                await self._refresh_index_statuses(cluster_name, org_name, projects)
+            await run_io(
+                self._io_executor,
+                partial(self._index.set_cursor, key, newest, now=now),
+            )
+        records = await run_io(
+            self._io_executor,
+            self._index.recent,
+            cluster_name,
+            org_name,
+            projects,
+            since_ts,
+            limit,
+        )
+        for record in records:
+            yield _job_summary_from_index(record)
+
+    async def _refresh_index_statuses(
+        self, cluster_name: str, org_name: str, project_names: Sequence[str]
+    ) -> None:
+        # Jobs can be finished by other clients, indexed active jobs
+        # missing in the list of active jobs are finished or deleted,
+        # they are dropped since their final statuses are unknown
+        active = await run_io(
+            self._io_executor,
+            partial(
+                self._index.recent,
+                cluster_name,
+                org_name,
+                project_names,
+                0.0,
+                None,
+                statuses=[
+                    status.value for status in JobStatus if not status.is_finished
+                ],
+            ),
+        )
+        if not active:
+            return
+        records: List[JobIndexRecord] = []
+        async with self.list_summaries(
+            statuses=JobStatus.active_items(),
+            since=datetime.fromtimestamp(active[-1][-1], timezone.utc),
+            cluster_name=cluster_name,
+            org_names=[org_name],
+            project_names=project_names,
+        ) as it:
+            async for job in it:
+                records.append(_job_index_record(job))
+        await run_io(self._io_executor, self._index.add, records)
+        seen = {record[0] for record in records}
+        gone = [record[0] for record in active if record[0] not in seen]
+        if gone:
+            await run_io(self._io_executor, self._index.remove, gone)
+
+    def _list_params(
+        self,
+        *,
+        statuses: Iterable[JobStatus],
+        name: str,
+        tags: Iterable[str],
+        owners: Iterable[str],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        reverse: bool,
+        limit: Optional[int],
+        cluster_name: Optional[str],
+        org_names: Iterable[Optional[str]],
+        project_names: Iterable[str],
+        materialized: Optional[bool] = None,
+        being_dropped: Optional[bool] = False,
+        logs_removed: Optional[bool] = False,
+    ) -> MultiDict[str]:
         if not org_names:
             org_names = [self._config.org_name]
-        url = self._config.api_url / "jobs"
-        headers = {"Accept": "application/x-ndjson"}
         params: MultiDict[str] = MultiDict()
         for status in statuses:
             params.add("status", status.value)
@@ -509,37 +909,48 @@ class Jobs(metaclass=NoPublicConstructor):
             params.add("reverse", "1")
         if limit is not None:
             params.add("limit", str(limit))
-        if _materialized is not None:
-            params.add("materialized", str(_materialized))
-        if _being_dropped is not None:
-            params.add("being_dropped", str(_being_dropped))
-        if _logs_removed is not None:
-            params.add("logs_removed", str(_logs_removed))
+        if materialized is not None:
+            params.add("materialized", str(materialized))
+        if being_dropped is not None:
+            params.add("being_dropped", str(being_dropped))
+        if logs_removed is not None:
+            params.add("logs_removed", str(logs_removed))
         for org_name in org_names:
             params.add("org_name", org_name or "NO_ORG")
         for project_name in project_names:
             params.add("project_name", project_name)
+        return params
+
+    async def _list_raw(
+        self, params: MultiDict[str]
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        url = self._config.api_url / "jobs"
+        headers = {"Accept": "application/x-ndjson"}
         auth = await self._config._api_auth()
         async with self._core.request(
             "GET", url, headers=headers, params=params, auth=auth
         ) as resp:
             if resp.headers.get("Content-Type", "").startswith("application/x-ndjson"):
                 async for line in resp.content:
-                    server_message = json.loads(line)
+                    server_message = json_loads(line)
                     if "error" in server_message:
                         raise NDJSONError(server_message["error"])
-                    yield _job_description_from_api(server_message, self._parse)
+                    yield server_message
             else:
-                ret = await resp.json()
+                ret = await resp.json(loads=json_loads)
                 for j in ret["jobs"]:
-                    yield _job_description_from_api(j, self._parse)
+                    yield j
 
     async def kill(self, id: str) -> None:
         url = self._config.api_url / "jobs" / id
         auth = await self._config._api_auth()
         async with self._core.request("DELETE", url, auth=auth):
             # an error is raised for status >= 400
-            return None  # 201 status code
+            pass  # 201 status code
+        # Killed jobs are never found by name in the index again
+        await run_io(
+            self._io_executor, self._index.set_status, id, JobStatus.CANCELLED.value
+        )
 
     async def bump_life_span(self, id: str, additional_life_span: float) -> None:
         url = self._config.api_url / "jobs" / id / "max_run_time_minutes"
@@ -595,7 +1006,46 @@ class Jobs(metaclass=NoPublicConstructor):
         auth = await self._config._api_auth()
         async with self._core.request("GET", url, auth=auth) as resp:
             ret = await resp.json()
-            return _job_description_from_api(ret, self._parse)
+            job = _job_description_from_api(ret, self._parse)
+        await run_io(
+            self._io_executor, self._index.set_status, job.id, job.status.value
+        )
+        return job
+
+    @asyncgeneratorcontextmanager
+    async def watch(self, id: str) -> AsyncIterator[JobDescription]:
+        url = self._config.api_url / "jobs" / id
+        # Unchanged job documents are not sent again if the server
+        # supports conditional requests
+        headers: Dict[str, str] = {}
+        ret: Any = None
+        job: Optional[JobDescription] = None
+        delay = self.WATCH_MIN_DELAY
+        while True:
+            auth = await self._config._api_auth()
+            async with self._core.request(
+                "GET", url, headers=headers, auth=auth
+            ) as resp:
+                if resp.status == 304:
+                    changed = False
+                else:
+                    etag = resp.headers.get("ETag")
+                    if etag:
+                        headers["If-None-Match"] = etag
+                    new_ret = await resp.json()
+                    changed = new_ret != ret
+                    ret = new_ret
+            if changed:
+                job = _job_description_from_api(ret, self._parse)
+                await run_io(
+                    self._io_executor, self._index.set_status, job.id, job.status.value
+                )
+                delay = self.WATCH_MIN_DELAY
+            else:
+                delay = min(delay * 1.5, self.WATCH_MAX_DELAY)
+            assert job is not None
+            yield job
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
 
     @asyncgeneratorcontextmanager
     async def top(
@@ -621,6 +1071,83 @@ class Jobs(metaclass=NoPublicConstructor):
                 raise ValueError(f"Job not found. Job Id = {id}")
             raise
 
+    @asyncgeneratorcontextmanager
+    async def top_many(
+        self,
+        ids: Union[Iterable[str], AsyncIterable[str]],
+        *,
+        cluster_name: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, Optional[JobTelemetry]]]:
+        # The monitoring API streams telemetry of a single job,
+        # streams of all jobs are merged into one iterator
+        loop = asyncio.get_event_loop()
+        queue: "asyncio.Queue[Optional[Tuple[str, Optional[JobTelemetry]]]]"
+        queue = asyncio.Queue()
+        streams: Dict[str, "asyncio.Task[None]"] = {}
+        active = 1
+
+        async def stream(id: str) -> None:
+            retries = 0
+            try:
+                while True:
+                    try:
+                        async with self.top(id, cluster_name=cluster_name) as it:
+                            async for info in it:
+                                queue.put_nowait((id, info))
+                                retries = 0
+                        return
+                    except (
+                        aiohttp.ClientError,
+                        asyncio.TimeoutError,
+                        BadGateway,
+                        ServerNotAvailable,
+                    ) as e:
+                        if retries >= self.TOP_MANY_RETRIES:
+                            log.warning("Cannot get telemetry of job %s: %s", id, e)
+                            return
+                        retries += 1
+                    except ValueError:
+                        return  # Job is finished
+                    await asyncio.sleep(self.TOP_MANY_RETRY_DELAY)
+            except Exception as e:
+                # An error of one job does not stop telemetry of other jobs
+                log.warning("Cannot get telemetry of job %s: %s", id, e)
+            finally:
+                queue.put_nowait((id, None))
+
+        def start(id: str) -> None:
+            nonlocal active
+            if id not in streams:
+                streams[id] = loop.create_task(stream(id))
+                active += 1
+
+        async def feed() -> None:
+            try:
+                if isinstance(ids, collections.abc.AsyncIterable):
+                    async for id in ids:
+                        start(id)
+                else:
+                    for id in ids:
+                        start(id)
+            finally:
+                queue.put_nowait(None)
+
+        feeder = loop.create_task(feed())
+        try:
+            while active:
+                item = await queue.get()
+                if item is None:
+                    active -= 1
+                    feeder.result()
+                    continue
+                if item[1] is None:
+                    active -= 1
+                yield item
+        finally:
+            for task in [feeder, *streams.values()]:
+                task.cancel()
+            await asyncio.gather(feeder, *streams.values(), return_exceptions=True)
+
     async def save(
         self,
         id: str,
@@ -927,28 +1454,45 @@ def _http_port_from_api(data: Dict[str, Any]) -> HTTPPort:
     )
 
 
-def _container_from_api(
-    data: Dict[str, Any],
+def _image_from_api(
+    image: str,
     cluster_name: str,
     parse: Parser,
-) -> Container:
+    image_parsers: Optional[Dict[str, _ImageNameParser]] = None,
+) -> RemoteImage:
+    image_parser: Optional[_ImageNameParser] = None
+    if image_parsers is not None:
+        image_parser = image_parsers.get(cluster_name)
+    if image_parser is None:
+        image_parser = parse._get_image_parser(cluster_name)
+        if image_parsers is not None:
+            image_parsers[cluster_name] = image_parser
     try:
-        image = parse.remote_image(data["image"], cluster_name=cluster_name)
+        return image_parser.parse_remote(image)
     except ValueError:
-        image = RemoteImage.new_external_image(name=INVALID_IMAGE_NAME)
+        return RemoteImage.new_external_image(name=INVALID_IMAGE_NAME)
+
 
+def _container_from_api(
+    data: Dict[str, Any],
+    cluster_name: str,
+    parse: Parser,
+    image_parsers: Optional[Dict[str, _ImageNameParser]] = None,
+) -> Container:
     return Container(
-        image=image,
+        image=_image_from_api(data["image"], cluster_name, parse, image_parsers),
         resources=_resources_from_api(data["resources"]),
         entrypoint=data.get("entrypoint", None),
         command=data.get("command", None),
         working_dir=data.get("working_dir"),
         http=_http_port_from_api(data["http"]) if "http" in data else None,
         env=data.get("env", dict()),
-        volumes=[_volume_from_api(v) for v in data.get("volumes", [])],
+        volumes=LazySequence(data.get("volumes", []), _volume_from_api),
         secret_env={name: URL(val) for name, val in data.get("secret_env", {}).items()},
-        secret_files=[_secret_file_from_api(v) for v in data.get("secret_volumes", [])],
-        disk_volumes=[_disk_volume_from_api(v) for v in data.get("disk_volumes", [])],
+        secret_files=LazySequence(
+            data.get("secret_volumes", []), _secret_file_from_api
+        ),
+        disk_volumes=LazySequence(data.get("disk_volumes", []), _disk_volume_from_api),
         tty=data.get("tty", False),
     )
 
@@ -1026,11 +1570,17 @@ def _job_status_item_from_api(res: Dict[str, Any]) -> JobStatusItem:
     )
 
 
-def _job_description_from_api(res: Dict[str, Any], parse: Parser) -> JobDescription:
+def _job_description_from_api(
+    res: Dict[str, Any],
+    parse: Parser,
+    image_parsers: Optional[Dict[str, _ImageNameParser]] = None,
+) -> JobDescription:
     # TODO y.s.: maybe, catch KeyErrors and re-raise with an error message like
     #   "SDK and API has incompatible versions: {key} was not found in the API response"
     cluster_name = res["cluster_name"]
-    container = _container_from_api(res["container"], cluster_name, parse)
+    container = _container_from_api(
+        res["container"], cluster_name, parse, image_parsers
+    )
     owner = res["owner"]
     name = res.get("name")
     tags = res.get("tags", ())
@@ -1046,9 +1596,8 @@ def _job_description_from_api(res: Dict[str, Any], parse: Parser) -> JobDescript
         finished_at=_parse_datetime(res["history"].get("finished_at")),
         run_time_seconds=res["history"].get("run_time_seconds"),
         exit_code=res["history"].get("exit_code"),
-        transitions=[
-            _job_status_item_from_api(item_raw) for item_raw in res.get("statuses", [])
-        ],
+        # Long histories are only decoded when they are looked at
+        transitions=LazySequence(res.get("statuses", []), _job_status_item_from_api),
     )
     http_url = URL(res.get("http_url", ""))
     http_url_named = URL(res.get("http_url_named", ""))
@@ -1099,6 +1648,100 @@ def _job_description_from_api(res: Dict[str, Any], parse: Parser) -> JobDescript
     )
 
 
+def _job_summary_from_api(
+    res: Dict[str, Any],
+    parse: Parser,
+    fields: AbstractSet[str],
+    image_parsers: Optional[Dict[str, _ImageNameParser]] = None,
+) -> JobSummary:
+    # Servers without field projection send full documents,
+    # only the requested fields are decoded anyway
+    cluster_name = res["cluster_name"]
+    owner = res["owner"]
+    history = res["history"]
+    history_status = _calc_status(history.get("status", "unknown"))
+    created_at = _parse_datetime(history.get("created_at"))
+    started_at = _parse_datetime(history.get("started_at"))
+    finished_at = _parse_datetime(history.get("finished_at"))
+    # Same as JobStatusHistory.changed_at
+    if history_status == JobStatus.PENDING:
+        changed_at = created_at
+    elif history_status in (JobStatus.RUNNING, JobStatus.SUSPENDED):
+        changed_at = started_at
+    elif history_status.is_finished:
+        changed_at = finished_at
+    else:
+        # Transitions are not fetched for summaries
+        changed_at = created_at
+    container = res.get("container", {})
+    image = None
+    if "image" in fields and "image" in container:
+        image = _image_from_api(container["image"], cluster_name, parse, image_parsers)
+    life_span = None
+    if "life_span" in fields:
+        max_run_time_minutes = res.get("max_run_time_minutes")
+        if max_run_time_minutes is not None:
+            life_span = max_run_time_minutes * 60.0
+    return JobSummary(
+        id=res["id"],
+        owner=owner,
+        cluster_name=cluster_name,
+        org_name=res.get("org_name"),
+        project_name=res.get("project_name", owner),
+        status=_calc_status(res["status"]),
+        name=res.get("name"),
+        created_at=created_at,
+        started_at=started_at,
+        finished_at=finished_at,
+        changed_at=changed_at,
+        tags=res.get("tags", ()) if "tags" in fields else (),
+        description=res.get("description") if "description" in fields else None,
+        image=image,
+        command=container.get("command") if "command" in fields else None,
+        working_dir=container.get("working_dir") if "working_dir" in fields else None,
+        life_span=life_span,
+        preset_name=res.get("preset_name") if "preset_name" in fields else None,
+    )
+
+
+def _job_index_record(job: JobSummary) -> JobIndexRecord:
+    created_at = job.created_at.timestamp() if job.created_at else time.time()
+    return (
+        job.id,
+        job.owner,
+        job.cluster_name,
+        job.org_name or "NO_ORG",
+        job.project_name,
+        job.name,
+        job.status.value,
+        created_at,
+    )
+
+
+def _job_summary_from_index(record: JobIndexRecord) -> JobSummary:
+    id, owner, cluster_name, org_name, project_name, name, status, created_at = record
+    return JobSummary(
+        id=id,
+        owner=owner,
+        cluster_name=cluster_name,
+        org_name=org_name,
+        project_name=project_name,
+        status=_calc_status(status),
+        name=name,
+        created_at=datetime.fromtimestamp(created_at, timezone.utc),
+        started_at=None,
+        finished_at=None,
+        changed_at=None,
+        tags=(),
+        description=None,
+        image=None,
+        command=None,
+        working_dir=None,
+        life_span=None,
+        preset_name=None,
+    )
+
+
 def _job_to_api(
     cluster_name: str,
     project_name: str,
@@ -1234,4 +1877,8 @@ def _parse_datetime(dt: Optional[str]) -> Optional[datetime]: ...
 def _parse_datetime(dt: Optional[str]) -> Optional[datetime]:
     if dt is None:
         return None
-    return isoparse(dt)
+    try:
+        # Much faster, but older Pythons support only a subset of ISO 8601
+        return datetime.fromisoformat(dt)
+    except ValueError:
+        return isoparse(dt)
@@ -1,7 +1,18 @@
 from contextlib import asynccontextmanager
 from datetime import datetime
 from email.utils import parsedate_to_datetime
-from typing import Any, AsyncIterator, Awaitable, Callable, Mapping, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import aiobotocore.session
 import botocore.exceptions
@@ -20,7 +31,7 @@ from ._bucket_base import (
     MeasureTimeDiffMixin,
 )
 from ._errors import ResourceNotFound
-from ._utils import asyncgeneratorcontextmanager
+from ._utils import aclosing, asyncgeneratorcontextmanager, run_concurrently
 
 
 class S3Provider(MeasureTimeDiffMixin, BucketProvider):
@@ -136,12 +147,18 @@ class S3Provider(MeasureTimeDiffMixin, BucketProvider):
             raise
 
     MIN_CHUNK_SIZE = 10 * (2**20)  # 10mb
+    # CopyObject copies blobs up to 5 GiB, larger ones are copied in parts
+    MAX_COPY_OBJECT_SIZE = 5 * 2**30
+    # Copied parts do not pass through the client, so they can be large
+    COPY_PART_SIZE = 512 * 2**20
 
     async def put_blob(
         self,
         key: str,
         body: Union[AsyncIterator[bytes], bytes],
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
     ) -> None:
         if isinstance(body, bytes):
             await self._client.put_object(
@@ -150,39 +167,37 @@ class S3Provider(MeasureTimeDiffMixin, BucketProvider):
                 Body=body,
             )
             return
-        upload_id = (
-            await self._client.create_multipart_upload(
-                Bucket=self._bucket_name,
-                Key=key,
-            )
-        )["UploadId"]
-        try:
-            part_id = 1
-            parts_info = []
-            buffer = b""
 
-            async def _upload_chunk() -> None:
-                nonlocal buffer, part_id
+        async def _upload_parts(upload_id: str) -> List[Dict[str, Any]]:
+            async def _upload_part(part_id: int, data: bytearray) -> Dict[str, Any]:
                 part = await self._client.upload_part(
                     Bucket=self._bucket_name,
                     Key=key,
                     UploadId=upload_id,
                     PartNumber=part_id,
-                    Body=buffer,
+                    Body=data,
                 )
-                if progress is not None:
-                    await progress(len(buffer))
-                buffer = b""
-                parts_info.append({"ETag": part["ETag"], "PartNumber": part_id})
-                part_id += 1
-
-            async for chunk in body:
-                buffer += chunk
-                if len(buffer) > self.MIN_CHUNK_SIZE:
-                    await _upload_chunk()
-            if buffer or len(parts_info) == 0:
-                # Either there is final part of file or file is zero-length file
-                await _upload_chunk()
+                return {"ETag": part["ETag"], "PartNumber": part_id}
+
+            return await self._upload_parts(
+                body, _upload_part, size=size, progress=progress
+            )
+
+        await self._multipart_upload(key, _upload_parts)
+
+    async def _multipart_upload(
+        self,
+        key: str,
+        upload_parts: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+    ) -> None:
+        upload_id = (
+            await self._client.create_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=key,
+            )
+        )["UploadId"]
+        try:
+            parts_info = await upload_parts(upload_id)
         except Exception:
             await self._client.abort_multipart_upload(
                 Bucket=self._bucket_name,
@@ -202,14 +217,120 @@ class S3Provider(MeasureTimeDiffMixin, BucketProvider):
 
     @asyncgeneratorcontextmanager
     async def fetch_blob(self, key: str, offset: int = 0) -> AsyncIterator[bytes]:
-        response = await self._client.get_object(
-            Bucket=self._bucket_name,
-            Key=key,
-            Range=f"bytes={offset}-" if offset else "",
-        )
+        part_size = self._get_part_size()
+        # The first range also tells the size of the blob
+        try:
+            response = await self._client.get_object(
+                Bucket=self._bucket_name,
+                Key=key,
+                Range=f"bytes={offset}-{offset + part_size - 1}",
+            )
+        except botocore.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] != "InvalidRange" or offset:
+                raise
+            # An empty blob has no ranges
+            response = await self._client.get_object(
+                Bucket=self._bucket_name, Key=key, Range=""
+            )
         async with response["Body"] as stream:
             async for chunk in stream.content.iter_any():
                 yield chunk
+        content_range = response.get("ContentRange")
+        if not content_range:
+            return
+        size = int(content_range.rpartition("/")[2])
+        if offset + part_size >= size:
+            return
+
+        # Ranges of an object overwritten in the meantime must not be mixed
+        etag = response["ETag"]
+
+        async def _fetch_range(start: int, end: int) -> bytes:
+            response = await self._client.get_object(
+                Bucket=self._bucket_name,
+                Key=key,
+                Range=f"bytes={start}-{end - 1}",
+                IfMatch=etag,
+            )
+            async with response["Body"] as stream:
+                return await stream.read()
+
+        async with aclosing(
+            self._fetch_ranges(_fetch_range, offset + part_size, size)
+        ) as it:
+            async for chunk in it:
+                yield chunk
 
     async def delete_blob(self, key: str) -> None:
         await self._client.delete_object(Bucket=self._bucket_name, Key=key)
+
+    MAX_DELETE_BATCH = 1000
+
+    async def delete_blobs(self, keys: Sequence[str]) -> None:
+        resp = await self._client.delete_objects(
+            Bucket=self._bucket_name,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+        )
+        # Deleting a missing key is not an error for S3
+        for error in resp.get("Errors", []):
+            raise botocore.exceptions.ClientError(
+                {"Error": {"Code": error["Code"], "Message": error["Message"]}},
+                "DeleteObjects",
+            )
+
+    def can_copy_from(self, src: BucketProvider) -> bool:
+        # Any bucket of the same service, the destination credentials
+        # should allow reading of the source bucket
+        return (
+            isinstance(src, S3Provider)
+            and src._client.meta.endpoint_url == self._client.meta.endpoint_url
+        )
+
+    async def copy_blob(
+        self,
+        src: BucketProvider,
+        src_key: str,
+        key: str,
+        *,
+        size: int,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> None:
+        assert isinstance(src, S3Provider)
+        copy_source = {"Bucket": src._bucket_name, "Key": src_key}
+        if size <= self.MAX_COPY_OBJECT_SIZE:
+            await self._client.copy_object(
+                Bucket=self._bucket_name, Key=key, CopySource=copy_source
+            )
+            if progress is not None:
+                await progress(size)
+            return
+
+        part_size = max(self.COPY_PART_SIZE, -(-size // self.MAX_PARTS))
+
+        async def _copy_parts(upload_id: str) -> List[Dict[str, Any]]:
+            parts = iter(enumerate(range(0, size, part_size), 1))
+            results: Dict[int, Dict[str, Any]] = {}
+
+            async def worker() -> None:
+                for part_id, start in parts:
+                    end = min(start + part_size, size)
+                    part = await self._client.upload_part_copy(
+                        Bucket=self._bucket_name,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=part_id,
+                        CopySource=copy_source,
+                        CopySourceRange=f"bytes={start}-{end - 1}",
+                    )
+                    results[part_id] = {
+                        "ETag": part["CopyPartResult"]["ETag"],
+                        "PartNumber": part_id,
+                    }
+                    if progress is not None:
+                        await progress(end - start)
+
+            parallel = max(self._parallel_parts, 1)
+            await run_concurrently(worker() for _ in range(parallel))
+            return [results[part_id] for part_id in sorted(results)]
+
+        await self._multipart_upload(key, _copy_parts)
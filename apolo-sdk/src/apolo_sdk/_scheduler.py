@@ -0,0 +1,173 @@
+import asyncio
+import enum
+from types import TracebackType
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+MAX_LIST_WORKERS = 4
+MAX_SMALL_FILE_WORKERS = 16
+MAX_LARGE_FILE_WORKERS = 4
+LARGE_FILE_SIZE = 16 * 2**20  # 16 MiB
+WORK_QUEUE_SIZE = 1000
+
+Job = Callable[[], Awaitable[None]]
+
+
+class WorkKind(enum.Enum):
+    LIST = "list"
+    SMALL_FILE = "small-file"
+    LARGE_FILE = "large-file"
+
+    @classmethod
+    def for_file(cls, size: Optional[int]) -> "WorkKind":
+        if size is not None and size >= LARGE_FILE_SIZE:
+            return cls.LARGE_FILE
+        return cls.SMALL_FILE
+
+
+class WorkGroup:
+    """A set of jobs, e.g. processing of directory entries.
+
+    The *on_done* callback is called when all jobs submitted to the group
+    and to all its subgroups are finished.  It is used for reporting
+    leaving the directory or removing the emptied directory.
+    """
+
+    def __init__(
+        self,
+        scheduler: "Scheduler",
+        parent: Optional["WorkGroup"],
+        on_done: Optional[Job],
+    ) -> None:
+        self._scheduler = scheduler
+        self._parent = parent
+        self._on_done = on_done
+        # The group is pending until it is closed.
+        self._pending = 1
+        if parent is not None:
+            parent._pending += 1
+
+    def group(self, on_done: Optional[Job] = None) -> "WorkGroup":
+        return WorkGroup(self._scheduler, self, on_done)
+
+    async def submit(self, kind: WorkKind, job: Job) -> None:
+        self._pending += 1
+        queue = self._scheduler._queues[kind]
+        if kind == WorkKind.LIST:
+            # Listing jobs submit other jobs.  If all listing workers
+            # wait for the free slot in the full queue, nobody can
+            # make a progress, so process the directory in place instead
+            # (depth-first).
+            try:
+                queue.put_nowait((self, job))
+            except asyncio.QueueFull:
+                await job()
+                await self._done()
+        else:
+            # File jobs never submit other jobs, wait for the free slot
+            # to limit the memory used by the queue.
+            await queue.put((self, job))
+
+    async def close(self) -> None:
+        await self._done()
+
+    async def _done(self) -> None:
+        self._pending -= 1
+        if self._pending:
+            return
+        if self._on_done is not None:
+            await self._on_done()
+        if self._parent is not None:
+            await self._parent._done()
+        else:
+            self._scheduler._finish()
+
+    async def __aenter__(self) -> "WorkGroup":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            await self.close()
+
+
+class Scheduler:
+    """Run recursive work on fixed pools of workers.
+
+    Every kind of work has its own pool of workers and a bounded queue,
+    so the memory is bounded by the queue size rather than by the size
+    of the processed tree.
+    """
+
+    def __init__(
+        self,
+        *,
+        list_workers: int = MAX_LIST_WORKERS,
+        small_file_workers: int = MAX_SMALL_FILE_WORKERS,
+        large_file_workers: int = MAX_LARGE_FILE_WORKERS,
+        queue_size: int = WORK_QUEUE_SIZE,
+    ) -> None:
+        self._limits = {
+            WorkKind.LIST: list_workers,
+            WorkKind.SMALL_FILE: small_file_workers,
+            WorkKind.LARGE_FILE: large_file_workers,
+        }
+        self._queues: Dict[WorkKind, "asyncio.Queue[Tuple[WorkGroup, Job]]"] = {
+            kind: asyncio.Queue(queue_size) for kind in WorkKind
+        }
+        self._waiter: Optional["asyncio.Future[None]"] = None
+
+    async def run(self, root: Callable[..., Awaitable[None]]) -> None:
+        """Call *root(group=...)* and wait for all submitted jobs.
+
+        The first error cancels all running and pending jobs and is reraised.
+        """
+        loop = asyncio.get_event_loop()
+        self._waiter = loop.create_future()
+        tasks: List["asyncio.Task[None]"] = [
+            loop.create_task(self._worker(self._queues[kind]))
+            for kind, limit in self._limits.items()
+            for _ in range(limit)
+        ]
+        tasks.append(loop.create_task(self._run_root(root)))
+        try:
+            await self._waiter
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_root(self, root: Callable[..., Awaitable[None]]) -> None:
+        group = WorkGroup(self, None, None)
+        try:
+            await root(group=group)
+            await group.close()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            self._fail(exc)
+
+    async def _worker(self, queue: "asyncio.Queue[Tuple[WorkGroup, Job]]") -> None:
+        while True:
+            group, job = await queue.get()
+            try:
+                await job()
+                await group._done()
+            except asyncio.CancelledError:
+                raise
+            except BaseException as exc:
+                self._fail(exc)
+                return
+
+    def _finish(self) -> None:
+        assert self._waiter is not None
+        if not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _fail(self, exc: BaseException) -> None:
+        assert self._waiter is not None
+        if not self._waiter.done():
+            self._waiter.set_exception(exc)
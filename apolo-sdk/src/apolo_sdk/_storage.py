@@ -1,27 +1,34 @@
 import asyncio
+import contextlib
 import enum
 import errno
-import fnmatch
+import functools
 import json
 import logging
 import os
 import re
+import shutil
+import sqlite3
+import threading
 import time
 from dataclasses import dataclass
 from email.utils import parsedate_to_datetime
 from pathlib import Path
-from stat import S_ISREG
+from stat import S_ISDIR, S_ISREG
 from typing import (
     AbstractSet,
     Any,
     AsyncGenerator,
     AsyncIterator,
     Awaitable,
+    BinaryIO,
     Callable,
     Dict,
-    Iterable,
+    FrozenSet,
+    List,
     Mapping,
     Optional,
+    Set,
     Tuple,
     Union,
     cast,
@@ -46,11 +53,23 @@ from ._abc import (
     _AsyncAbstractFileProgress,
     _AsyncAbstractRecursiveFileProgress,
 )
+from ._chunk_size import ChunkSizeController
 from ._config import Config
 from ._core import _Core
 from ._errors import NDJSONError, ResourceNotFound
-from ._file_filter import AsyncFilterFunc, FileFilter
+from ._file_filter import (
+    MAX_GLOB_LISTINGS,
+    AsyncFilterFunc,
+    FileFilter,
+    GlobSegment,
+    _has_magic,
+    compile_glob,
+)
+from ._file_hash import FileHashCache
+from ._file_reader import buffer_pool, iter_file_chunks, read_into
+from ._io_executor import IOExecutor, run_io
 from ._rewrite import rewrite_module
+from ._scheduler import Scheduler, WorkGroup, WorkKind
 from ._url_utils import (
     _extract_path,
     normalize_local_path_uri,
@@ -62,8 +81,11 @@ from ._utils import (
     QueuedCall,
     aclosing,
     asyncgeneratorcontextmanager,
+    ensure_schema,
+    map_ordered,
     queue_calls,
     retries,
+    run_concurrently,
 )
 
 log = logging.getLogger(__package__)
@@ -71,6 +93,40 @@ log = logging.getLogger(__package__)
 MAX_OPEN_FILES = 20
 READ_SIZE = 2**20  # 1 MiB
 TIME_THRESHOLD = 1.0
+MIN_SEGMENT_SIZE = 8 * 2**20  # 8 MiB
+MAX_SEGMENT_SIZE = 64 * 2**20  # 64 MiB
+DOWNLOAD_RECORD_MAXAGE = 7 * 24 * 3600  # 1 week
+DOWNLOAD_RECORD_INTERVAL = 1.0
+
+DOWNLOAD_SCHEMA = {
+    "storage_download": (
+        "CREATE TABLE storage_download "
+        "(path TEXT, src TEXT, size INTEGER, modification_time INTEGER, "
+        "segments TEXT, timestamp REAL)"
+    ),
+    "storage_download_index": (
+        "CREATE UNIQUE INDEX storage_download_index ON storage_download (path)"
+    ),
+}
+DOWNLOAD_DROP = {
+    "storage_download_index": "DROP INDEX IF EXISTS storage_download_index",
+    "storage_download": "DROP TABLE IF EXISTS storage_download",
+}
+
+SYNC_SCHEMA = {
+    "storage_sync": (
+        "CREATE TABLE storage_sync "
+        "(root TEXT, path TEXT, size INTEGER, mtime_ns INTEGER, "
+        "ctime_ns INTEGER, hash TEXT, remote_time INTEGER)"
+    ),
+    "storage_sync_index": (
+        "CREATE UNIQUE INDEX storage_sync_index ON storage_sync (root, path)"
+    ),
+}
+SYNC_DROP = {
+    "storage_sync_index": "DROP INDEX IF EXISTS storage_sync_index",
+    "storage_sync": "DROP TABLE IF EXISTS storage_sync",
+}
 
 Printer = Callable[[str], None]
 
@@ -119,14 +175,89 @@ class DiskUsageInfo:
     uri: Optional[URL] = None
 
 
+_Segment = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class _DownloadRecord:
+    # State of interrupted segmented download, *segments* contains
+    # (start, stop) ranges of completely downloaded segments.
+    src: str
+    size: int
+    modification_time: int
+    segments: FrozenSet[_Segment]
+
+
+@dataclass(frozen=True)
+class _SyncRecord:
+    # State of the file after the last sync: the size, the modification
+    # and the status change times and the content hash of the local file
+    # and the modification time of the remote file.  The status change time
+    # cannot be set by user, it catches edits which preserve the modification
+    # time.
+    size: int
+    mtime_ns: int
+    ctime_ns: int
+    hash: str
+    remote_time: int
+
+
+class _SyncState:
+    def __init__(
+        self, records: Mapping[str, _SyncRecord], hash_cache: FileHashCache
+    ) -> None:
+        self.records = records
+        self.hash_cache = hash_cache
+        self.changed: Dict[str, _SyncRecord] = {}
+        self.seen: Set[str] = set()
+
+    def is_unchanged(
+        self,
+        record: Optional[_SyncRecord],
+        local_hash: str,
+        remote: Optional[FileStatus],
+    ) -> bool:
+        return (
+            record is not None
+            and record.hash == local_hash
+            and remote is not None
+            and remote.is_file()
+            and remote.size == record.size
+            and remote.modification_time == record.remote_time
+        )
+
+    def update(
+        self, path: str, local: os.stat_result, hash: str, remote_time: int
+    ) -> None:
+        record = _SyncRecord(
+            size=local.st_size,
+            mtime_ns=local.st_mtime_ns,
+            ctime_ns=local.st_ctime_ns,
+            hash=hash,
+            remote_time=remote_time,
+        )
+        if self.records.get(path) != record:
+            self.changed[path] = record
+
+
 @rewrite_module
 class Storage(metaclass=NoPublicConstructor):
-    def __init__(self, core: _Core, config: Config) -> None:
+    def __init__(self, core: _Core, config: Config, io_executor: IOExecutor) -> None:
         self._core = core
         self._config = config
+        self._io_executor = io_executor
         self._file_sem = asyncio.BoundedSemaphore(MAX_OPEN_FILES)
         self._min_time_diff = 0.0
         self._max_time_diff = 0.0
+        self._chunk_size: Optional[ChunkSizeController] = None
+
+    def _get_chunk_size(self) -> ChunkSizeController:
+        # Created lazily to not read the user config in the constructor.
+        if self._chunk_size is None:
+            self._chunk_size = ChunkSizeController.from_user_config(
+                self._config._get_user_config(), size=READ_SIZE
+            )
+        return self._chunk_size
 
     def _normalize_uri(self, uri: URL) -> URL:
         return normalize_storage_path_uri(
@@ -194,6 +325,93 @@ class Storage(metaclass=NoPublicConstructor):
                 return local.st_size
         return 0
 
+    def _check_download_segments(
+        self,
+        records: Mapping[str, _DownloadRecord],
+        path: Path,
+        local: os.stat_result,
+        remote: FileStatus,
+    ) -> Optional[FrozenSet[_Segment]]:
+        # Segmented download preallocates the whole file, so the local size
+        # cannot be used to detect the partial download.
+        record = records.get(os.path.abspath(path))
+        if (
+            record is not None
+            and record.src == str(remote.uri)
+            and record.size == remote.size == local.st_size
+            and record.modification_time == remote.modification_time
+        ):
+            return record.segments
+        return None
+
+    async def _check_unchanged(self, uri: URL, stat: FileStatus) -> None:
+        current = await self.stat(uri)
+        if (
+            current.size != stat.size
+            or current.modification_time != stat.modification_time
+        ):
+            raise RuntimeError(f"File {uri} was modified during download")
+
+    def _read_download_records(self) -> Dict[str, _DownloadRecord]:
+        ret: Dict[str, _DownloadRecord] = {}
+        with self._config._open_db() as db:
+            if ensure_schema(db, DOWNLOAD_SCHEMA, DOWNLOAD_DROP):
+                return ret
+            cur = db.execute(
+                """\
+                    SELECT path, src, size, modification_time, segments
+                    FROM storage_download
+                    WHERE timestamp >= ?
+                """,
+                (time.time() - DOWNLOAD_RECORD_MAXAGE,),
+            )
+            for path, src, size, modification_time, segments in cur:
+                ret[path] = _DownloadRecord(
+                    src=src,
+                    size=size,
+                    modification_time=modification_time,
+                    segments=frozenset(
+                        (start, stop) for start, stop in json.loads(segments)
+                    ),
+                )
+        return ret
+
+    def _save_download_record(
+        self, path: Path, src_stat: FileStatus, segments: AbstractSet[_Segment]
+    ) -> None:
+        now = time.time()
+        with self._config._open_db() as db:
+            ensure_schema(db, DOWNLOAD_SCHEMA, DOWNLOAD_DROP)
+            db.execute(
+                """\
+                    INSERT OR REPLACE INTO storage_download
+                    (path, src, size, modification_time, segments, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)""",
+                (
+                    os.path.abspath(path),
+                    str(src_stat.uri),
+                    src_stat.size,
+                    src_stat.modification_time,
+                    json.dumps(sorted(segments)),
+                    now,
+                ),
+            )
+            db.execute(
+                "DELETE FROM storage_download WHERE timestamp < ?",
+                (now - DOWNLOAD_RECORD_MAXAGE,),
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
+
+    def _delete_download_record(self, path: Path) -> None:
+        with self._config._open_db() as db:
+            ensure_schema(db, DOWNLOAD_SCHEMA, DOWNLOAD_DROP)
+            db.execute(
+                "DELETE FROM storage_download WHERE path = ?", (os.path.abspath(path),)
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
+
     @asyncgeneratorcontextmanager
     async def list(self, uri: URL) -> AsyncIterator[FileStatus]:
         uri = self._normalize_uri(uri)
@@ -223,54 +441,90 @@ class Storage(metaclass=NoPublicConstructor):
         if not _has_magic(uri.path):
             yield uri
             return
-        basename = uri.name
-        glob_in_dir: Callable[[URL, str, bool], AsyncGenerator[URL, None]]
         trailing_slash = uri.path.endswith("/")
-        if not _has_magic(basename):
-            glob_in_dir = self._glob0
-        elif not _isrecursive(basename):
-            glob_in_dir = self._glob1
-        else:
-            glob_in_dir = self._glob2
-        async with self.glob(uri.parent, dironly=True) as parent_iter:
-            async for parent in parent_iter:
-                async with aclosing(glob_in_dir(parent, basename, dironly)) as it:
-                    async for x in it:
-                        sx = str(x)
-                        if trailing_slash and not sx.endswith("/"):
-                            yield URL(sx + "/")
-                        else:
-                            yield x
-
-    async def _glob2(
-        self, parent: URL, pattern: str, dironly: bool
-    ) -> AsyncGenerator[URL, None]:
-        assert _isrecursive(pattern)
-        yield parent
-        async with aclosing(self._rlistdir(parent, dironly)) as it:
+        if trailing_slash:
+            uri = uri.parent
+            dironly = True
+        # Only the part of the path starting from the first wildcard
+        # has to be searched
+        names: List[str] = []
+        base = uri
+        while _has_magic(base.path):
+            names.append(base.name)
+            base = base.parent
+        segments = compile_glob("/".join(reversed(names)))
+
+        async def _root() -> AsyncGenerator[URL, None]:
+            yield base
+
+        async with contextlib.AsyncExitStack() as stack:
+            it = _root()
+            for i, segment in enumerate(segments):
+                # Intermediate segments can only match directories
+                it = await stack.enter_async_context(
+                    aclosing(
+                        self._glob_segment(
+                            it, segment, dironly or i < len(segments) - 1
+                        )
+                    )
+                )
             async for x in it:
-                yield x
+                sx = str(x)
+                if trailing_slash and not sx.endswith("/"):
+                    yield URL(sx + "/")
+                else:
+                    yield x
 
-    async def _glob1(
-        self, parent: URL, pattern: str, dironly: bool
+    async def _glob_segment(
+        self, parents: AsyncIterator[URL], segment: GlobSegment, dironly: bool
     ) -> AsyncGenerator[URL, None]:
-        allow_hidden = _ishidden(pattern)
-        match = re.compile(fnmatch.translate(pattern)).fullmatch
-        async with aclosing(self._iterdir(parent, dironly)) as it:
-            async for stat in it:
-                name = stat.path
-                if (allow_hidden or not _ishidden(name)) and match(name):
-                    yield parent / name
+        if segment.is_recursive:
+            async for parent in parents:
+                yield parent
+                async with aclosing(self._rlistdir(parent, dironly)) as it:
+                    async for x in it:
+                        yield x
+            return
+        # Independent parents are looked up concurrently
+        if segment.is_literal:
+            func = self._glob_lookup
+        else:
+            func = self._glob_match
+        async with aclosing(
+            map_ordered(
+                functools.partial(func, segment=segment, dironly=dironly),
+                parents,
+                MAX_GLOB_LISTINGS,
+            )
+        ) as it:
+            async for uris in it:
+                for x in uris:
+                    yield x
 
-    async def _glob0(
-        self, parent: URL, basename: str, dironly: bool
-    ) -> AsyncGenerator[URL, None]:
-        uri = parent / basename
+    async def _glob_match(
+        self, parent: URL, segment: GlobSegment, dironly: bool
+    ) -> List[URL]:
+        allow_hidden = _ishidden(segment.pattern)
+        async with aclosing(self._iterdir(parent, dironly)) as it:
+            return [
+                parent / stat.path
+                async for stat in it
+                if (allow_hidden or not _ishidden(stat.path))
+                and segment.match(stat.path)
+            ]
+
+    async def _glob_lookup(
+        self, parent: URL, segment: GlobSegment, dironly: bool
+    ) -> List[URL]:
+        # Adjacent literal components are checked by a single request
+        uri = parent / segment.pattern
         try:
-            await self.stat(uri)
+            stat = await self.stat(uri)
         except ResourceNotFound:
-            return
-        yield uri
+            return []
+        if dironly and not stat.is_dir():
+            return []
+        return [uri]
 
     async def _iterdir(
         self, uri: URL, dironly: bool
@@ -525,23 +779,15 @@ class Storage(metaclass=NoPublicConstructor):
         *,
         update: bool = False,
         continue_: bool = False,
+        parallel: int = 1,
         progress: Optional[AbstractFileProgress] = None,
     ) -> None:
+        if parallel < 1:
+            raise ValueError("parallel should be >= 1")
         src = normalize_local_path_uri(src)
         dst = self._normalize_uri(dst)
         path = _extract_path(src)
-        try:
-            if not path.exists():
-                raise FileNotFoundError(errno.ENOENT, "No such file", str(path))
-            if path.is_dir():
-                raise IsADirectoryError(
-                    errno.EISDIR, "Is a directory, use recursive copy", str(path)
-                )
-        except OSError as e:
-            if getattr(e, "winerror", None) not in (1, 87):
-                raise
-            # Ignore stat errors for device files like NUL or CON on Windows.
-            # See https://bugs.python.org/issue37074
+        await run_io(self._io_executor, _check_upload_src, path)
         offset: Optional[int] = 0
         try:
             dst_stat = await self.stat(dst)
@@ -563,7 +809,7 @@ class Storage(metaclass=NoPublicConstructor):
         else:
             if update or continue_:
                 try:
-                    src_stat = path.stat()
+                    src_stat = await run_io(self._io_executor, path.stat)
                 except OSError:
                     pass
                 else:
@@ -577,7 +823,10 @@ class Storage(metaclass=NoPublicConstructor):
         async_progress: _AsyncAbstractFileProgress
         queue, async_progress = queue_calls(progress)
         await run_progress(
-            queue, self._upload_file(path, dst, offset, progress=async_progress)
+            queue,
+            self._upload_file(
+                path, dst, offset, parallel=parallel, progress=async_progress
+            ),
         )
 
     async def _upload_file(
@@ -586,37 +835,102 @@ class Storage(metaclass=NoPublicConstructor):
         dst: URL,
         offset: int,
         *,
+        parallel: int,
         progress: _AsyncAbstractFileProgress,
     ) -> None:
         src = URL(src_path.as_uri())
-        loop = asyncio.get_event_loop()
+        chunk_size = self._get_chunk_size()
         async with self._file_sem:
-            with src_path.open("rb") as stream:
-                size = os.stat(stream.fileno()).st_size
+            stream = await run_io(self._io_executor, lambda: src_path.open("rb"))
+            with stream:
+                stat = await run_io(self._io_executor, os.fstat, stream.fileno())
+                size = stat.st_size
                 await progress.start(StorageProgressStart(src, dst, size))
 
                 if offset:
                     stream.seek(offset)
                 else:
-                    chunk = await loop.run_in_executor(None, stream.read, READ_SIZE)
-                    for retry in retries(f"Fail to upload {dst}"):
-                        async with retry:
-                            await self.create(dst, chunk)
+                    with buffer_pool.buffer(chunk_size.size) as buf:
+                        chunk = await read_into(stream, buf, self._io_executor)
+                        for retry in retries(f"Fail to upload {dst}"):
+                            async with retry:
+                                with chunk_size.measure(len(chunk)):
+                                    await self.create(dst, chunk)
                     offset = len(chunk)
 
-                if offset:
-                    while True:
-                        await progress.step(StorageProgressStep(src, dst, offset, size))
-                        chunk = await loop.run_in_executor(None, stream.read, READ_SIZE)
-                        if not chunk:
-                            break
+                if offset and parallel > 1 and size - offset > chunk_size.size:
+                    await progress.step(StorageProgressStep(src, dst, offset, size))
+                    await self._write_parallel(
+                        stream, src, dst, offset, size, parallel, progress
+                    )
+                elif offset:
+                    await progress.step(StorageProgressStep(src, dst, offset, size))
+                    async for chunk in iter_file_chunks(
+                        stream, chunk_size, executor=self._io_executor
+                    ):
                         for retry in retries(f"Fail to upload {dst}"):
                             async with retry:
-                                await self.write(dst, chunk, offset)
+                                with chunk_size.measure(len(chunk)):
+                                    await self.write(dst, chunk, offset)
                         offset += len(chunk)
+                        await progress.step(StorageProgressStep(src, dst, offset, size))
 
                 await progress.complete(StorageProgressComplete(src, dst, size))
 
+    async def _write_parallel(
+        self,
+        stream: BinaryIO,
+        src: URL,
+        dst: URL,
+        offset: int,
+        size: int,
+        parallel: int,
+        progress: _AsyncAbstractFileProgress,
+    ) -> None:
+        # Read the file sequentially and keep up to *parallel* WRITE requests
+        # in flight.  The queue is bounded, so at most 2 * parallel chunks
+        # are kept in memory, in buffers reused through the pool.  Progress
+        # is reported only for the contiguous written prefix of the file.
+        queue: "asyncio.Queue[Optional[Tuple[int, bytearray, memoryview]]]"
+        queue = asyncio.Queue(parallel)
+        written: Dict[int, int] = {}
+        pos = offset
+        chunk_size = self._get_chunk_size()
+
+        async def reader() -> None:
+            read_pos = offset
+            while True:
+                buf = buffer_pool.acquire(chunk_size.size)
+                chunk = await read_into(stream, buf, self._io_executor)
+                if not chunk:
+                    buffer_pool.release(buf)
+                    break
+                await queue.put((read_pos, buf, chunk))
+                read_pos += len(chunk)
+            for _ in range(parallel):
+                await queue.put(None)
+
+        async def writer() -> None:
+            nonlocal pos
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                chunk_pos, buf, chunk = item
+                try:
+                    for retry in retries(f"Fail to upload {dst}"):
+                        async with retry:
+                            with chunk_size.measure(len(chunk)):
+                                await self.write(dst, chunk, chunk_pos)
+                finally:
+                    buffer_pool.release(buf)
+                written[chunk_pos] = len(chunk)
+                while pos in written:
+                    pos += written.pop(pos)
+                    await progress.step(StorageProgressStep(src, dst, pos, size))
+
+        await run_concurrently([reader(), *(writer() for _ in range(parallel))])
+
     async def upload_dir(
         self,
         src: URL,
@@ -626,35 +940,46 @@ class Storage(metaclass=NoPublicConstructor):
         continue_: bool = False,
         filter: Optional[AsyncFilterFunc] = None,
         ignore_file_names: AbstractSet[str] = frozenset(),
+        parallel: int = 1,
         progress: Optional[AbstractRecursiveFileProgress] = None,
     ) -> None:
+        if parallel < 1:
+            raise ValueError("parallel should be >= 1")
         src = normalize_local_path_uri(src)
         dst = self._normalize_uri(dst)
-        path = _extract_path(src).resolve()
-        if not path.exists():
-            raise FileNotFoundError(errno.ENOENT, "No such file", str(path))
-        if not path.is_dir():
-            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", str(path))
+        path = await run_io(
+            self._io_executor, _check_upload_src_dir, _extract_path(src)
+        )
 
         if filter is None:
             filter = _always
         if ignore_file_names:
-            filter = load_parent_ignore_files(filter, ignore_file_names, path)
+            filter = await run_io(
+                self._io_executor,
+                load_parent_ignore_files,
+                filter,
+                ignore_file_names,
+                path,
+            )
 
         async_progress: _AsyncAbstractRecursiveFileProgress
         queue, async_progress = queue_calls(progress)
         await run_progress(
             queue,
-            self._upload_dir(
-                src,
-                path,
-                dst,
-                "",
-                update=update,
-                continue_=continue_,
-                filter=filter,
-                ignore_file_names=ignore_file_names,
-                progress=async_progress,
+            Scheduler().run(
+                functools.partial(
+                    self._upload_dir,
+                    src,
+                    path,
+                    dst,
+                    "",
+                    update=update,
+                    continue_=continue_,
+                    filter=filter,
+                    ignore_file_names=ignore_file_names,
+                    parallel=parallel,
+                    progress=async_progress,
+                )
             ),
         )
 
@@ -669,9 +994,10 @@ class Storage(metaclass=NoPublicConstructor):
         continue_: bool,
         filter: AsyncFilterFunc,
         ignore_file_names: AbstractSet[str],
+        parallel: int,
         progress: _AsyncAbstractRecursiveFileProgress,
+        group: WorkGroup,
     ) -> None:
-        tasks = []
         try:
             exists = False
             if update or continue_:
@@ -695,66 +1021,87 @@ class Storage(metaclass=NoPublicConstructor):
             raise NotADirectoryError(errno.ENOTDIR, "Not a directory", str(dst))
 
         await progress.enter(StorageProgressEnterDir(src, dst))
-        loop = asyncio.get_event_loop()
         async with self._file_sem:
-            folder = await loop.run_in_executor(None, lambda: list(src_path.iterdir()))
+            folder = await run_io(self._io_executor, _stat_dir, src_path)
 
         if ignore_file_names:
-            for child in folder:
-                if child.name in ignore_file_names and child.is_file():
-                    log.debug(f"Load ignore file {rel_path}{child.name}")
+            for name, child_stat in folder:
+                if (
+                    name in ignore_file_names
+                    and child_stat is not None
+                    and S_ISREG(child_stat.st_mode)
+                ):
+                    log.debug(f"Load ignore file {rel_path}{name}")
                     file_filter = FileFilter(filter)
-                    file_filter.read_from_file(child, prefix=rel_path)
+                    await run_io(
+                        self._io_executor,
+                        functools.partial(
+                            file_filter.read_from_file, src_path / name, prefix=rel_path
+                        ),
+                    )
                     filter = file_filter.match
 
-        for child in folder:
-            name = child.name
-            child_rel_path = f"{rel_path}{name}"
-            if child.is_dir():
-                child_rel_path += "/"
-            if not await filter(child_rel_path):
-                log.debug(f"Skip {child_rel_path}")
-                continue
-            if child.is_file():
-                offset: Optional[int] = 0
-                if (update or continue_) and name in dst_files:
-                    offset = self._check_upload(
-                        child.stat(), dst_files[name], update, continue_
-                    )
-                if offset is None:
+        async def leave() -> None:
+            await progress.leave(StorageProgressLeaveDir(src, dst))
+
+        async with group.group(on_done=leave) as dir_group:
+            for name, child_stat in folder:
+                is_dir = child_stat is not None and S_ISDIR(child_stat.st_mode)
+                child_rel_path = f"{rel_path}{name}"
+                if is_dir:
+                    child_rel_path += "/"
+                if not await filter(child_rel_path):
+                    log.debug(f"Skip {child_rel_path}")
                     continue
-                tasks.append(
-                    self._upload_file(
-                        src_path / name, dst / name, offset, progress=progress
+                if child_stat is not None and S_ISREG(child_stat.st_mode):
+                    offset: Optional[int] = 0
+                    if (update or continue_) and name in dst_files:
+                        offset = self._check_upload(
+                            child_stat, dst_files[name], update, continue_
+                        )
+                    if offset is None:
+                        continue
+                    await dir_group.submit(
+                        WorkKind.for_file(child_stat.st_size),
+                        functools.partial(
+                            self._upload_file,
+                            src_path / name,
+                            dst / name,
+                            offset,
+                            parallel=parallel,
+                            progress=progress,
+                        ),
                     )
-                )
-            elif child.is_dir():
-                tasks.append(
-                    self._upload_dir(
-                        src / name,
-                        src_path / name,
-                        dst / name,
-                        child_rel_path,
-                        update=update,
-                        continue_=continue_,
-                        filter=filter,
-                        ignore_file_names=ignore_file_names,
-                        progress=progress,
+                elif is_dir:
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(
+                            self._upload_dir,
+                            src / name,
+                            src_path / name,
+                            dst / name,
+                            child_rel_path,
+                            update=update,
+                            continue_=continue_,
+                            filter=filter,
+                            ignore_file_names=ignore_file_names,
+                            parallel=parallel,
+                            progress=progress,
+                            group=dir_group,
+                        ),
                     )
-                )
-            else:
-                # This case is for uploading non-regular file,
-                # e.g. blocking device or unix socket
-                # Coverage temporary skipped, the line is waiting for a champion
-                await progress.fail(
-                    StorageProgressFail(
-                        src / name,
-                        dst / name,
-                        f"Cannot upload {child}, not regular file/directory",
-                    ),
-                )  # pragma: no cover
-        await run_concurrently(tasks)
-        await progress.leave(StorageProgressLeaveDir(src, dst))
+                else:
+                    # This case is for uploading non-regular file,
+                    # e.g. blocking device or unix socket
+                    # Coverage temporary skipped, the line is waiting for a champion
+                    await progress.fail(
+                        StorageProgressFail(
+                            src / name,
+                            dst / name,
+                            f"Cannot upload {src_path / name}, "
+                            "not regular file/directory",
+                        ),
+                    )  # pragma: no cover
 
     async def download_file(
         self,
@@ -763,8 +1110,11 @@ class Storage(metaclass=NoPublicConstructor):
         *,
         update: bool = False,
         continue_: bool = False,
+        parallel: int = 1,
         progress: Optional[AbstractFileProgress] = None,
     ) -> None:
+        if parallel < 1:
+            raise ValueError("parallel should be >= 1")
         src = self._normalize_uri(src)
         dst = normalize_local_path_uri(dst)
         path = _extract_path(dst)
@@ -772,14 +1122,25 @@ class Storage(metaclass=NoPublicConstructor):
         if not src_stat.is_file():
             raise IsADirectoryError(errno.EISDIR, "Is a directory", str(src))
         offset: Optional[int] = 0
+        segments: Optional[AbstractSet[_Segment]] = None
         if update or continue_:
             try:
-                dst_stat = path.stat()
+                dst_stat = await run_io(self._io_executor, path.stat)
             except OSError:
                 pass
             else:
                 if S_ISREG(dst_stat.st_mode):
-                    offset = self._check_download(dst_stat, src_stat, update, continue_)
+                    if continue_:
+                        records = await run_io(
+                            self._io_executor, self._read_download_records
+                        )
+                        segments = self._check_download_segments(
+                            records, path, dst_stat, src_stat
+                        )
+                    if segments is None:
+                        offset = self._check_download(
+                            dst_stat, src_stat, update, continue_
+                        )
         if offset is None:
             return
 
@@ -788,7 +1149,14 @@ class Storage(metaclass=NoPublicConstructor):
         await run_progress(
             queue,
             self._download_file(
-                src, dst, path, src_stat.size, offset, progress=async_progress
+                src,
+                dst,
+                path,
+                src_stat,
+                offset,
+                segments=segments,
+                parallel=parallel,
+                progress=async_progress,
             ),
         )
 
@@ -797,15 +1165,32 @@ class Storage(metaclass=NoPublicConstructor):
         src: URL,
         dst: URL,
         dst_path: Path,
-        size: int,
+        src_stat: FileStatus,
         offset: int,
         *,
+        segments: Optional[AbstractSet[_Segment]] = None,
+        parallel: int,
         progress: _AsyncAbstractFileProgress,
     ) -> None:
-        loop = asyncio.get_event_loop()
+        size = src_stat.size
+        if segments is not None or (parallel > 1 and size > MIN_SEGMENT_SIZE):
+            await self._download_segments(
+                src,
+                dst,
+                dst_path,
+                src_stat,
+                offset,
+                segments or frozenset(),
+                parallel=parallel,
+                progress=progress,
+            )
+            return
         async with self._file_sem:
             await progress.start(StorageProgressStart(src, dst, size))
-            with dst_path.open("rb+" if offset else "wb") as stream:
+            stream = await run_io(
+                self._io_executor, dst_path.open, "rb+" if offset else "wb"
+            )
+            with stream:
                 if offset:
                     stream.seek(offset)
                 for retry in retries(f"Fail to download {src}"):
@@ -819,12 +1204,109 @@ class Storage(metaclass=NoPublicConstructor):
                                 await progress.step(
                                     StorageProgressStep(src, dst, pos, size)
                                 )
-                                await loop.run_in_executor(None, stream.write, chunk)
+                                await run_io(self._io_executor, stream.write, chunk)
                                 if chunk:
                                     retry.reset()
 
             await progress.complete(StorageProgressComplete(src, dst, size))
 
+    async def _download_segments(
+        self,
+        src: URL,
+        dst: URL,
+        dst_path: Path,
+        src_stat: FileStatus,
+        offset: int,
+        segments: AbstractSet[_Segment],
+        *,
+        parallel: int,
+        progress: _AsyncAbstractFileProgress,
+    ) -> None:
+        # Split the file into segments which are fetched with ranged requests
+        # concurrently and written at their positions into the preallocated
+        # file.  Completed segments are saved in the config database, so
+        # the interrupted download can be continued.
+        size = src_stat.size
+        done = set(segments)
+        if offset:
+            # The first *offset* bytes are already downloaded.
+            done.add((0, offset))
+        pending = iter(_split_segments(size, _calc_segment_size(size, parallel), done))
+        pos = sum(stop - start for start, stop in done)
+        last_saved = 0.0
+        saving = False
+
+        async def save_record(*, force: bool = False) -> None:
+            # Segments completed while the record is written or shortly
+            # after it are saved together with the next ones.
+            nonlocal last_saved, saving
+            if not force and (
+                saving or time.monotonic() - last_saved < DOWNLOAD_RECORD_INTERVAL
+            ):
+                return
+            saving = True
+            try:
+                await run_io(
+                    self._io_executor,
+                    self._save_download_record,
+                    dst_path,
+                    src_stat,
+                    frozenset(done),
+                )
+            finally:
+                saving = False
+            last_saved = time.monotonic()
+
+        async with self._file_sem:
+            await progress.start(StorageProgressStart(src, dst, size))
+            await save_record(force=True)
+            stream = await run_io(
+                self._io_executor, dst_path.open, "rb+" if done else "wb"
+            )
+            with stream:
+                await run_io(self._io_executor, stream.truncate, size)
+
+                async def worker() -> None:
+                    nonlocal pos
+                    for start, stop in pending:
+                        current = start
+                        for retry in retries(f"Fail to download {src}"):
+                            if current >= stop:
+                                break
+                            async with retry:
+                                async with self.open(
+                                    src, offset=current, size=stop - current
+                                ) as it:
+                                    async for chunk in it:
+                                        await run_io(
+                                            self._io_executor,
+                                            _pwrite,
+                                            stream,
+                                            chunk,
+                                            current,
+                                        )
+                                        current += len(chunk)
+                                        pos += len(chunk)
+                                        await progress.step(
+                                            StorageProgressStep(src, dst, pos, size)
+                                        )
+                                        if chunk:
+                                            retry.reset()
+                        # Ranges of different versions of the file
+                        # must not be mixed.
+                        await self._check_unchanged(src, src_stat)
+                        done.add((start, stop))
+                        await save_record()
+
+                try:
+                    await run_concurrently(worker() for _ in range(parallel))
+                except BaseException:
+                    await save_record(force=True)
+                    raise
+            await run_io(self._io_executor, self._delete_download_record, dst_path)
+
+            await progress.complete(StorageProgressComplete(src, dst, size))
+
     async def download_dir(
         self,
         src: URL,
@@ -833,27 +1315,40 @@ class Storage(metaclass=NoPublicConstructor):
         update: bool = False,
         continue_: bool = False,
         filter: Optional[AsyncFilterFunc] = None,
+        parallel: int = 1,
         progress: Optional[AbstractRecursiveFileProgress] = None,
     ) -> None:
+        if parallel < 1:
+            raise ValueError("parallel should be >= 1")
         if filter is None:
             filter = _always
         src = self._normalize_uri(src)
         dst = normalize_local_path_uri(dst)
         path = _extract_path(dst)
+        download_records = (
+            await run_io(self._io_executor, self._read_download_records)
+            if continue_
+            else {}
+        )
 
         async_progress: _AsyncAbstractRecursiveFileProgress
         queue, async_progress = queue_calls(progress)
         await run_progress(
             queue,
-            self._download_dir(
-                src,
-                dst,
-                path,
-                "",
-                update=update,
-                continue_=continue_,
-                filter=filter,
-                progress=async_progress,
+            Scheduler().run(
+                functools.partial(
+                    self._download_dir,
+                    src,
+                    dst,
+                    path,
+                    "",
+                    update=update,
+                    continue_=continue_,
+                    filter=filter,
+                    parallel=parallel,
+                    download_records=download_records,
+                    progress=async_progress,
+                )
             ),
         )
 
@@ -867,90 +1362,808 @@ class Storage(metaclass=NoPublicConstructor):
         update: bool,
         continue_: bool,
         filter: AsyncFilterFunc,
+        parallel: int,
+        download_records: Mapping[str, _DownloadRecord],
         progress: _AsyncAbstractRecursiveFileProgress,
+        group: WorkGroup,
     ) -> None:
-        dst_path.mkdir(parents=True, exist_ok=True)
+        await run_io(self._io_executor, _mkdir, dst_path)
         await progress.enter(StorageProgressEnterDir(src, dst))
-        tasks = []
         if update or continue_:
-            loop = asyncio.get_event_loop()
             async with self._file_sem:
-                dst_files = await loop.run_in_executor(
-                    None,
-                    lambda: {
-                        item.name: item for item in dst_path.iterdir() if item.is_file()
-                    },
-                )
+                dst_files = {
+                    name: stat
+                    for name, stat in (
+                        await run_io(self._io_executor, _scan_dir, dst_path)
+                    ).items()
+                    if S_ISREG(stat.st_mode)
+                }
 
         for retry in retries(f"Fail to list {src}"):
             async with retry:
                 async with self.list(src) as it:
                     folder = [item async for item in it]
 
-        for child in folder:
-            name = child.name
-            child_rel_path = f"{rel_path}{name}"
-            if child.is_dir():
-                child_rel_path += "/"
-            if not await filter(child_rel_path):
-                log.debug(f"Skip {child_rel_path}")
-                continue
-            if child.is_file():
-                offset: Optional[int] = 0
-                if (update or continue_) and name in dst_files:
-                    offset = self._check_download(
-                        dst_files[name].stat(), child, update, continue_
+        async def leave() -> None:
+            await progress.leave(StorageProgressLeaveDir(src, dst))
+
+        async with group.group(on_done=leave) as dir_group:
+            for child in folder:
+                name = child.name
+                child_rel_path = f"{rel_path}{name}"
+                if child.is_dir():
+                    child_rel_path += "/"
+                if not await filter(child_rel_path):
+                    log.debug(f"Skip {child_rel_path}")
+                    continue
+                if child.is_file():
+                    offset: Optional[int] = 0
+                    segments: Optional[AbstractSet[_Segment]] = None
+                    if (update or continue_) and name in dst_files:
+                        dst_stat = dst_files[name]
+                        if continue_:
+                            segments = self._check_download_segments(
+                                download_records, dst_path / name, dst_stat, child
+                            )
+                        if segments is None:
+                            offset = self._check_download(
+                                dst_stat, child, update, continue_
+                            )
+                    if offset is None:
+                        continue
+                    await dir_group.submit(
+                        WorkKind.for_file(child.size),
+                        functools.partial(
+                            self._download_file,
+                            src / name,
+                            dst / name,
+                            dst_path / name,
+                            child,
+                            offset,
+                            segments=segments,
+                            parallel=parallel,
+                            progress=progress,
+                        ),
+                    )
+                elif child.is_dir():
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(
+                            self._download_dir,
+                            src / name,
+                            dst / name,
+                            dst_path / name,
+                            child_rel_path,
+                            update=update,
+                            continue_=continue_,
+                            filter=filter,
+                            parallel=parallel,
+                            download_records=download_records,
+                            progress=progress,
+                            group=dir_group,
+                        ),
                     )
-                if offset is None:
+                else:
+                    await progress.fail(
+                        StorageProgressFail(
+                            src / name,
+                            dst / name,
+                            f"Cannot download {child}, not regular file/directory",
+                        ),
+                    )  # pragma: no cover
+
+    def _check_copy(
+        self, src: FileStatus, dst: FileStatus, update: bool, continue_: bool
+    ) -> Optional[int]:
+        if src.modification_time > dst.modification_time:
+            # Source is newer.
+            return 0
+        # Destination is newer.
+        if update:
+            return None
+        if continue_:
+            if src.size == dst.size:  # complete
+                return None
+            if src.size > dst.size:  # partial
+                return dst.size
+        return 0
+
+    async def copy_file(
+        self,
+        src: URL,
+        dst: URL,
+        *,
+        update: bool = False,
+        continue_: bool = False,
+        parallel: int = 1,
+        progress: Optional[AbstractFileProgress] = None,
+    ) -> None:
+        if parallel < 1:
+            raise ValueError("parallel should be >= 1")
+        src = self._normalize_uri(src)
+        dst = self._normalize_uri(dst)
+        if src == dst:
+            raise ValueError(f"{str(src)!r} and {str(dst)!r} are the same file")
+        src_stat = await self.stat(src)
+        if src_stat.is_dir():
+            raise IsADirectoryError(
+                errno.EISDIR, "Is a directory, use recursive copy", str(src)
+            )
+        offset: Optional[int] = 0
+        try:
+            dst_stat = await self.stat(dst)
+            if dst_stat.is_dir():
+                raise IsADirectoryError(errno.EISDIR, "Is a directory", str(dst))
+        except ResourceNotFound:
+            try:
+                dst_parent_stat = await self.stat(dst.parent)
+                if not dst_parent_stat.is_dir():
+                    raise NotADirectoryError(
+                        errno.ENOTDIR, "Not a directory", str(dst.parent)
+                    )
+            except ResourceNotFound:
+                raise NotADirectoryError(
+                    errno.ENOTDIR, "Not a directory", str(dst.parent)
+                )
+        else:
+            if update or continue_:
+                offset = self._check_copy(src_stat, dst_stat, update, continue_)
+        if offset is None:
+            return
+
+        async_progress: _AsyncAbstractFileProgress
+        queue, async_progress = queue_calls(progress)
+        await run_progress(
+            queue,
+            self._copy_file(
+                src, dst, src_stat, offset, parallel=parallel, progress=async_progress
+            ),
+        )
+
+    async def _copy_file(
+        self,
+        src: URL,
+        dst: URL,
+        src_stat: FileStatus,
+        offset: int,
+        *,
+        parallel: int,
+        progress: _AsyncAbstractFileProgress,
+    ) -> None:
+        # The content is streamed from the source file into the destination
+        # file without touching the local disk.  Large files are split
+        # into segments copied concurrently.
+        size = src_stat.size
+        await progress.start(StorageProgressStart(src, dst, size))
+        if not offset:
+            for retry in retries(f"Fail to copy {src}"):
+                async with retry:
+                    await self.create(dst, b"")
+        pos = offset
+
+        async def step(written: int) -> None:
+            nonlocal pos
+            pos += written
+            await progress.step(StorageProgressStep(src, dst, pos, size))
+
+        await progress.step(StorageProgressStep(src, dst, pos, size))
+        if parallel > 1 and size - offset > MIN_SEGMENT_SIZE:
+            segment_size = _calc_segment_size(size, parallel)
+            done = {(0, offset)} if offset else set()
+            pending = iter(_split_segments(size, segment_size, done))
+
+            async def worker() -> None:
+                for start, stop in pending:
+                    await self._copy_range(src, dst, start, stop, step)
+
+            await run_concurrently(worker() for _ in range(parallel))
+        elif size > offset:
+            await self._copy_range(src, dst, offset, size, step)
+        await progress.complete(StorageProgressComplete(src, dst, size))
+
+    async def _copy_range(
+        self,
+        src: URL,
+        dst: URL,
+        start: int,
+        stop: int,
+        step: Callable[[int], Awaitable[None]],
+    ) -> None:
+        # Reading of the next block is overlapped with writing of the previous
+        # one.
+        queue: "asyncio.Queue[Optional[Tuple[int, bytes]]]" = asyncio.Queue(1)
+        chunk_size = self._get_chunk_size()
+
+        async def reader() -> None:
+            pos = start
+            buffer = bytearray()
+            for retry in retries(f"Fail to copy {src}"):
+                if pos + len(buffer) >= stop:
+                    break
+                async with retry:
+                    current = pos + len(buffer)
+                    async with self.open(
+                        src, offset=current, size=stop - current
+                    ) as it:
+                        async for chunk in it:
+                            buffer += chunk
+                            if chunk:
+                                retry.reset()
+                            while len(buffer) >= chunk_size.size:
+                                n = chunk_size.size
+                                await queue.put((pos, bytes(buffer[:n])))
+                                del buffer[:n]
+                                pos += n
+            if buffer:
+                await queue.put((pos, bytes(buffer)))
+            await queue.put(None)
+
+        async def writer() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                pos, chunk = item
+                for retry in retries(f"Fail to copy {src}"):
+                    async with retry:
+                        with chunk_size.measure(len(chunk)):
+                            await self.write(dst, chunk, pos)
+                await step(len(chunk))
+
+        await run_concurrently([reader(), writer()])
+
+    async def copy_dir(
+        self,
+        src: URL,
+        dst: URL,
+        *,
+        update: bool = False,
+        continue_: bool = False,
+        filter: Optional[AsyncFilterFunc] = None,
+        parallel: int = 1,
+        progress: Optional[AbstractRecursiveFileProgress] = None,
+    ) -> None:
+        if parallel < 1:
+            raise ValueError("parallel should be >= 1")
+        if filter is None:
+            filter = _always
+        src = self._normalize_uri(src)
+        dst = self._normalize_uri(dst)
+        if src == dst or str(dst).startswith(str(src).rstrip("/") + "/"):
+            raise ValueError(
+                f"Cannot copy a directory {str(src)!r} into itself {str(dst)!r}"
+            )
+        src_stat = await self.stat(src)
+        if not src_stat.is_dir():
+            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", str(src))
+
+        async_progress: _AsyncAbstractRecursiveFileProgress
+        queue, async_progress = queue_calls(progress)
+        await run_progress(
+            queue,
+            Scheduler().run(
+                functools.partial(
+                    self._copy_dir,
+                    src,
+                    dst,
+                    "",
+                    update=update,
+                    continue_=continue_,
+                    filter=filter,
+                    parallel=parallel,
+                    progress=async_progress,
+                )
+            ),
+        )
+
+    async def _copy_dir(
+        self,
+        src: URL,
+        dst: URL,
+        rel_path: str,
+        *,
+        update: bool,
+        continue_: bool,
+        filter: AsyncFilterFunc,
+        parallel: int,
+        progress: _AsyncAbstractRecursiveFileProgress,
+        group: WorkGroup,
+    ) -> None:
+        dst_files: Dict[str, FileStatus] = {}
+        try:
+            exists = False
+            if update or continue_:
+                try:
+                    for retry in retries(f"Fail to list {dst}"):
+                        async with retry:
+                            async with self.list(dst) as it:
+                                dst_files = {
+                                    item.name: item
+                                    async for item in it
+                                    if item.is_file()
+                                }
+                    exists = True
+                except ResourceNotFound:
+                    update = continue_ = False
+            if not exists:
+                for retry in retries(f"Fail to create {dst}"):
+                    async with retry:
+                        await self.mkdir(dst, exist_ok=True)
+        except FileExistsError:
+            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", str(dst))
+
+        await progress.enter(StorageProgressEnterDir(src, dst))
+        for retry in retries(f"Fail to list {src}"):
+            async with retry:
+                async with self.list(src) as it:
+                    folder = [item async for item in it]
+
+        async def leave() -> None:
+            await progress.leave(StorageProgressLeaveDir(src, dst))
+
+        async with group.group(on_done=leave) as dir_group:
+            for child in folder:
+                name = child.name
+                child_rel_path = f"{rel_path}{name}"
+                if child.is_dir():
+                    child_rel_path += "/"
+                if not await filter(child_rel_path):
+                    log.debug(f"Skip {child_rel_path}")
                     continue
-                tasks.append(
-                    self._download_file(
-                        src / name,
-                        dst / name,
-                        dst_path / name,
-                        child.size,
-                        offset,
-                        progress=progress,
+                if child.is_file():
+                    offset: Optional[int] = 0
+                    if (update or continue_) and name in dst_files:
+                        offset = self._check_copy(
+                            child, dst_files[name], update, continue_
+                        )
+                    if offset is None:
+                        continue
+                    await dir_group.submit(
+                        WorkKind.for_file(child.size),
+                        functools.partial(
+                            self._copy_file,
+                            src / name,
+                            dst / name,
+                            child,
+                            offset,
+                            parallel=parallel,
+                            progress=progress,
+                        ),
+                    )
+                elif child.is_dir():
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(
+                            self._copy_dir,
+                            src / name,
+                            dst / name,
+                            child_rel_path,
+                            update=update,
+                            continue_=continue_,
+                            filter=filter,
+                            parallel=parallel,
+                            progress=progress,
+                            group=dir_group,
+                        ),
                     )
+                else:
+                    await progress.fail(
+                        StorageProgressFail(
+                            src / name,
+                            dst / name,
+                            f"Cannot copy {child}, not regular file/directory",
+                        ),
+                    )  # pragma: no cover
+
+    def _read_sync_records(self, root: str) -> Dict[str, _SyncRecord]:
+        ret: Dict[str, _SyncRecord] = {}
+        with self._config._open_db() as db:
+            if ensure_schema(db, SYNC_SCHEMA, SYNC_DROP):
+                return ret
+            cur = db.execute(
+                """\
+                    SELECT path, size, mtime_ns, ctime_ns, hash, remote_time
+                    FROM storage_sync
+                    WHERE root = ?
+                """,
+                (root,),
+            )
+            for path, size, mtime_ns, ctime_ns, hash, remote_time in cur:
+                ret[path] = _SyncRecord(
+                    size=size,
+                    mtime_ns=mtime_ns,
+                    ctime_ns=ctime_ns,
+                    hash=hash,
+                    remote_time=remote_time,
                 )
-            elif child.is_dir():
-                tasks.append(
-                    self._download_dir(
-                        src / name,
-                        dst / name,
-                        dst_path / name,
-                        child_rel_path,
-                        update=update,
-                        continue_=continue_,
-                        filter=filter,
-                        progress=progress,
+        return ret
+
+    def _save_sync_records(
+        self,
+        root: str,
+        changed: Mapping[str, _SyncRecord],
+        obsolete: AbstractSet[str],
+    ) -> None:
+        with self._config._open_db() as db:
+            ensure_schema(db, SYNC_SCHEMA, SYNC_DROP)
+            db.executemany(
+                """\
+                    INSERT OR REPLACE INTO storage_sync
+                    (root, path, size, mtime_ns, ctime_ns, hash, remote_time)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (
+                        root,
+                        path,
+                        record.size,
+                        record.mtime_ns,
+                        record.ctime_ns,
+                        record.hash,
+                        record.remote_time,
                     )
+                    for path, record in changed.items()
+                ],
+            )
+            db.executemany(
+                "DELETE FROM storage_sync WHERE root = ? AND path = ?",
+                [(root, path) for path in obsolete],
+            )
+            with contextlib.suppress(sqlite3.OperationalError):
+                db.commit()
+
+    async def sync(
+        self,
+        src: URL,
+        dst: URL,
+        *,
+        delete: bool = False,
+        filter: Optional[AsyncFilterFunc] = None,
+        ignore_file_names: AbstractSet[str] = frozenset(),
+        progress: Optional[AbstractRecursiveFileProgress] = None,
+    ) -> None:
+        if filter is None:
+            filter = _always
+        if src.scheme == "file" and dst.scheme == "storage":
+            src = normalize_local_path_uri(src)
+            dst = self._normalize_uri(dst)
+            path = await run_io(
+                self._io_executor, _check_upload_src_dir, _extract_path(src)
+            )
+            if ignore_file_names:
+                filter = await run_io(
+                    self._io_executor,
+                    load_parent_ignore_files,
+                    filter,
+                    ignore_file_names,
+                    path,
                 )
-            else:
-                await progress.fail(
-                    StorageProgressFail(
-                        src / name,
-                        dst / name,
-                        f"Cannot download {child}, not regular file/directory",
-                    ),
-                )  # pragma: no cover
-        await run_concurrently(tasks)
-        await progress.leave(StorageProgressLeaveDir(src, dst))
+        elif src.scheme == "storage" and dst.scheme == "file":
+            src = self._normalize_uri(src)
+            dst = normalize_local_path_uri(dst)
+            path = _extract_path(dst)
+            src_stat = await self.stat(src)
+            if not src_stat.is_dir():
+                raise NotADirectoryError(errno.ENOTDIR, "Not a directory", str(src))
+        else:
+            raise ValueError(
+                f"Cannot sync {src} to {dst}, "
+                f"only local and storage directories can be synchronized"
+            )
 
+        root = f"{src} {dst}"
+        state = _SyncState(
+            self._read_sync_records(root),
+            FileHashCache(self._config, executor=self._io_executor),
+        )
+        obsolete: AbstractSet[str] = set()
+        if src.scheme == "file":
+            sync_dir = functools.partial(
+                self._sync_upload_dir,
+                path,
+                dst,
+                "",
+                delete=delete,
+                filter=filter,
+                ignore_file_names=ignore_file_names,
+            )
+        else:
+            sync_dir = functools.partial(
+                self._sync_download_dir, src, path, "", delete=delete, filter=filter
+            )
 
-_magic_check = re.compile("(?:[*?[])")
+        async_progress: _AsyncAbstractRecursiveFileProgress
+        queue, async_progress = queue_calls(progress)
+        try:
+            await run_progress(
+                queue,
+                Scheduler().run(
+                    functools.partial(sync_dir, state=state, progress=async_progress)
+                ),
+            )
+            obsolete = state.records.keys() - state.seen
+        finally:
+            self._save_sync_records(root, state.changed, obsolete)
+            state.hash_cache.save()
 
+    async def _sync_upload_dir(
+        self,
+        src_path: Path,
+        dst: URL,
+        rel_path: str,
+        *,
+        delete: bool,
+        filter: AsyncFilterFunc,
+        ignore_file_names: AbstractSet[str],
+        state: _SyncState,
+        progress: _AsyncAbstractRecursiveFileProgress,
+        group: WorkGroup,
+    ) -> None:
+        src = URL(src_path.as_uri())
+        try:
+            for retry in retries(f"Fail to list {dst}"):
+                async with retry:
+                    async with self.list(dst) as it:
+                        dst_files = {item.name: item async for item in it}
+        except ResourceNotFound:
+            dst_files = {}
+            try:
+                for retry in retries(f"Fail to create {dst}"):
+                    async with retry:
+                        await self.mkdir(dst, exist_ok=True)
+            except FileExistsError:
+                raise NotADirectoryError(errno.ENOTDIR, "Not a directory", str(dst))
 
-def _has_magic(s: str) -> bool:
-    return _magic_check.search(s) is not None
+        await progress.enter(StorageProgressEnterDir(src, dst))
+        async with self._file_sem:
+            folder = await run_io(self._io_executor, _scan_dir, src_path)
 
+        if ignore_file_names:
+            for name, child_stat in folder.items():
+                if name in ignore_file_names and S_ISREG(child_stat.st_mode):
+                    log.debug(f"Load ignore file {rel_path}{name}")
+                    file_filter = FileFilter(filter)
+                    await run_io(
+                        self._io_executor,
+                        functools.partial(
+                            file_filter.read_from_file, src_path / name, prefix=rel_path
+                        ),
+                    )
+                    filter = file_filter.match
 
-def _ishidden(name: str) -> bool:
-    return name.startswith(".")
+        async def leave() -> None:
+            await progress.leave(StorageProgressLeaveDir(src, dst))
+
+        async with group.group(on_done=leave) as dir_group:
+            for name, child_stat in folder.items():
+                is_dir = S_ISDIR(child_stat.st_mode)
+                child_rel_path = f"{rel_path}{name}"
+                if is_dir:
+                    child_rel_path += "/"
+                if not await filter(child_rel_path):
+                    log.debug(f"Skip {child_rel_path}")
+                    dst_files.pop(name, None)
+                    continue
+                remote = dst_files.pop(name, None)
+                if remote is not None and remote.is_dir() != is_dir:
+                    if not delete:
+                        await progress.fail(
+                            StorageProgressFail(
+                                src / name,
+                                dst / name,
+                                f"Cannot replace {remote.uri}, use delete mode",
+                            )
+                        )
+                        continue
+                    await self.rm(remote.uri, recursive=remote.is_dir())
+                    remote = None
+                if is_dir:
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(
+                            self._sync_upload_dir,
+                            src_path / name,
+                            dst / name,
+                            child_rel_path,
+                            delete=delete,
+                            filter=filter,
+                            ignore_file_names=ignore_file_names,
+                            state=state,
+                            progress=progress,
+                            group=dir_group,
+                        ),
+                    )
+                elif S_ISREG(child_stat.st_mode):
+                    state.seen.add(child_rel_path)
+                    await dir_group.submit(
+                        WorkKind.for_file(child_stat.st_size),
+                        functools.partial(
+                            self._sync_upload_file,
+                            src_path / name,
+                            dst / name,
+                            child_rel_path,
+                            child_stat,
+                            remote,
+                            state=state,
+                            progress=progress,
+                        ),
+                    )
+                else:
+                    await progress.fail(
+                        StorageProgressFail(
+                            src / name,
+                            dst / name,
+                            f"Cannot upload {src_path / name}, "
+                            f"not regular file/directory",
+                        ),
+                    )  # pragma: no cover
+            if delete:
+                for remote in dst_files.values():
+                    child_rel_path = remote.name + ("/" if remote.is_dir() else "")
+                    if await filter(f"{rel_path}{child_rel_path}"):
+                        await self.rm(remote.uri, recursive=remote.is_dir())
+
+    async def _sync_upload_file(
+        self,
+        src_path: Path,
+        dst: URL,
+        rel_path: str,
+        src_stat: os.stat_result,
+        remote: Optional[FileStatus],
+        *,
+        state: _SyncState,
+        progress: _AsyncAbstractFileProgress,
+    ) -> None:
+        record = state.records.get(rel_path)
+        local_hash = await self._sync_hash(state, src_path, src_stat, record)
+        if state.is_unchanged(record, local_hash, remote):
+            assert remote is not None
+            state.update(rel_path, src_stat, local_hash, remote.modification_time)
+            return
+        await self._upload_file(src_path, dst, 0, parallel=1, progress=progress)
+        dst_stat = await self.stat(dst)
+        state.update(rel_path, src_stat, local_hash, dst_stat.modification_time)
+
+    async def _sync_download_dir(
+        self,
+        src: URL,
+        dst_path: Path,
+        rel_path: str,
+        *,
+        delete: bool,
+        filter: AsyncFilterFunc,
+        state: _SyncState,
+        progress: _AsyncAbstractRecursiveFileProgress,
+        group: WorkGroup,
+    ) -> None:
+        dst = URL(dst_path.as_uri())
+        await run_io(self._io_executor, _mkdir, dst_path)
+        await progress.enter(StorageProgressEnterDir(src, dst))
+        async with self._file_sem:
+            dst_files = await run_io(self._io_executor, _scan_dir, dst_path)
+
+        for retry in retries(f"Fail to list {src}"):
+            async with retry:
+                async with self.list(src) as it:
+                    folder = [item async for item in it]
+
+        async def leave() -> None:
+            await progress.leave(StorageProgressLeaveDir(src, dst))
+
+        async with group.group(on_done=leave) as dir_group:
+            for child in folder:
+                name = child.name
+                child_rel_path = f"{rel_path}{name}"
+                if child.is_dir():
+                    child_rel_path += "/"
+                if not await filter(child_rel_path):
+                    log.debug(f"Skip {child_rel_path}")
+                    dst_files.pop(name, None)
+                    continue
+                local = dst_files.pop(name, None)
+                if local is not None and S_ISDIR(local.st_mode) != child.is_dir():
+                    if not delete:
+                        await progress.fail(
+                            StorageProgressFail(
+                                src / name,
+                                dst / name,
+                                f"Cannot replace {dst_path / name}, use delete mode",
+                            )
+                        )
+                        continue
+                    await run_io(
+                        self._io_executor, _remove_local, dst_path / name, local
+                    )
+                    local = None
+                if child.is_dir():
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(
+                            self._sync_download_dir,
+                            src / name,
+                            dst_path / name,
+                            child_rel_path,
+                            delete=delete,
+                            filter=filter,
+                            state=state,
+                            progress=progress,
+                            group=dir_group,
+                        ),
+                    )
+                elif child.is_file():
+                    state.seen.add(child_rel_path)
+                    await dir_group.submit(
+                        WorkKind.for_file(child.size),
+                        functools.partial(
+                            self._sync_download_file,
+                            child,
+                            dst_path / name,
+                            child_rel_path,
+                            local,
+                            state=state,
+                            progress=progress,
+                        ),
+                    )
+                else:
+                    await progress.fail(
+                        StorageProgressFail(
+                            src / name,
+                            dst / name,
+                            f"Cannot download {child}, not regular file/directory",
+                        ),
+                    )  # pragma: no cover
+            if delete:
+                for name, local in dst_files.items():
+                    child_rel_path = name + ("/" if S_ISDIR(local.st_mode) else "")
+                    if await filter(f"{rel_path}{child_rel_path}"):
+                        await run_io(
+                            self._io_executor, _remove_local, dst_path / name, local
+                        )
 
+    async def _sync_download_file(
+        self,
+        src_stat: FileStatus,
+        dst_path: Path,
+        rel_path: str,
+        dst_stat: Optional[os.stat_result],
+        *,
+        state: _SyncState,
+        progress: _AsyncAbstractFileProgress,
+    ) -> None:
+        record = state.records.get(rel_path)
+        if record is not None and dst_stat is not None:
+            local_hash = await self._sync_hash(state, dst_path, dst_stat, record)
+            if state.is_unchanged(record, local_hash, src_stat):
+                state.update(rel_path, dst_stat, local_hash, src_stat.modification_time)
+                return
+        dst = URL(dst_path.as_uri())
+        await self._download_file(
+            src_stat.uri, dst, dst_path, src_stat, 0, parallel=1, progress=progress
+        )
+        dst_stat = await run_io(self._io_executor, dst_path.stat)
+        local_hash = await self._sync_hash(state, dst_path, dst_stat, None)
+        state.update(rel_path, dst_stat, local_hash, src_stat.modification_time)
 
-def _isrecursive(pattern: str) -> bool:
-    return pattern == "**"
+    async def _sync_hash(
+        self,
+        state: _SyncState,
+        path: Path,
+        stat: os.stat_result,
+        record: Optional[_SyncRecord],
+    ) -> str:
+        if (
+            record is not None
+            and record.size == stat.st_size
+            and record.mtime_ns == stat.st_mtime_ns
+            and record.ctime_ns == stat.st_ctime_ns
+        ):
+            # The file was not touched since the last sync.
+            return record.hash
+        async with self._file_sem:
+            return await state.hash_cache.hash(path, stat)
+
+
+def _ishidden(name: str) -> bool:
+    return name.startswith(".")
 
 
 def _file_status_from_api_ls(base_uri: URL, values: Dict[str, Any]) -> FileStatus:
@@ -1004,6 +2217,44 @@ def _disk_usage_from_api(
     )
 
 
+def _calc_segment_size(size: int, parallel: int) -> int:
+    segment_size = -(-size // parallel)
+    return max(MIN_SEGMENT_SIZE, min(segment_size, MAX_SEGMENT_SIZE))
+
+
+def _split_segments(
+    size: int, segment_size: int, done: AbstractSet[_Segment]
+) -> List[_Segment]:
+    # Split ranges not covered by *done* into segments.
+    ret = []
+    pos = 0
+    for start, stop in sorted(done) + [(size, size)]:
+        for seg_start in range(pos, start, segment_size):
+            ret.append((seg_start, min(seg_start + segment_size, start)))
+        pos = max(pos, stop)
+    return ret
+
+
+if hasattr(os, "pwrite"):
+
+    def _pwrite(stream: BinaryIO, data: bytes, offset: int) -> None:
+        fd = stream.fileno()
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+
+else:  # pragma: no cover
+    _pwrite_lock = threading.Lock()
+
+    def _pwrite(stream: BinaryIO, data: bytes, offset: int) -> None:
+        # No positional writes on Windows
+        with _pwrite_lock:
+            stream.seek(offset)
+            stream.write(data)
+
+
 def _parse_content_range(rng_str: Optional[str]) -> slice:
     if rng_str is None:
         raise RuntimeError("Missed header Content-Range")
@@ -1040,24 +2291,6 @@ async def run_progress(
     await task
 
 
-async def run_concurrently(coros: Iterable[Awaitable[Any]]) -> None:
-    loop = asyncio.get_event_loop()
-    tasks: "Iterable[asyncio.Future[Any]]" = [loop.create_task(coro) for coro in coros]  # type: ignore  # noqa
-    if not tasks:
-        return
-    try:
-        done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
-        for task in done:
-            await task
-    except:  # noqa
-        for task in tasks:
-            task.cancel()
-        # wait for actual cancellation, ignore all exceptions raised from tasks
-        if tasks:
-            await asyncio.wait(tasks)
-        raise  # pragma: no cover
-
-
 async def _always(path: str) -> bool:
     return True
 
@@ -1081,3 +2314,64 @@ def load_parent_ignore_files(
             file_filter.read_from_file(config_path, "", rel_path)
             filter = file_filter.match
     return filter
+
+
+def _check_upload_src(path: Path) -> None:
+    try:
+        if not path.exists():
+            raise FileNotFoundError(errno.ENOENT, "No such file", str(path))
+        if path.is_dir():
+            raise IsADirectoryError(
+                errno.EISDIR, "Is a directory, use recursive copy", str(path)
+            )
+    except OSError as e:
+        if getattr(e, "winerror", None) not in (1, 87):
+            raise
+        # Ignore stat errors for device files like NUL or CON on Windows.
+        # See https://bugs.python.org/issue37074
+
+
+def _check_upload_src_dir(path: Path) -> Path:
+    path = path.resolve()
+    if not path.exists():
+        raise FileNotFoundError(errno.ENOENT, "No such file", str(path))
+    if not path.is_dir():
+        raise NotADirectoryError(errno.ENOTDIR, "Not a directory", str(path))
+    return path
+
+
+def _mkdir(path: Path) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def _stat_dir(path: Path) -> List[Tuple[str, Optional[os.stat_result]]]:
+    # Unlike _scan_dir(), keep entries which cannot be stat'ed (e.g. broken
+    # symlinks) with None status.
+    ret: List[Tuple[str, Optional[os.stat_result]]] = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                stat: Optional[os.stat_result] = entry.stat()
+            except OSError:
+                stat = None
+            ret.append((entry.name, stat))
+    return ret
+
+
+def _scan_dir(path: Path) -> Dict[str, os.stat_result]:
+    ret = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                ret[entry.name] = entry.stat()
+            except FileNotFoundError:
+                # Broken symlink or removed file.
+                pass
+    return ret
+
+
+def _remove_local(path: Path, stat: os.stat_result) -> None:
+    if S_ISDIR(stat.st_mode):
+        shutil.rmtree(path)
+    else:
+        path.unlink()
@@ -1,6 +1,9 @@
 import asyncio
+import collections
 import functools
+import json
 import logging
+import sqlite3
 import sys
 import warnings
 from functools import partial
@@ -9,17 +12,26 @@ from types import TracebackType
 from typing import (
     Any,
     AsyncContextManager,
+    AsyncGenerator,
     AsyncIterator,
     Awaitable,
     Callable,
     Coroutine,
+    Deque,
     Generator,
     Generic,
+    Iterable,
     Iterator,
+    List,
+    Mapping,
     Optional,
+    Sequence,
+    Set,
     Tuple,
     Type,
     TypeVar,
+    Union,
+    overload,
 )
 
 import aiohttp
@@ -30,6 +42,7 @@ from ._rewrite import rewrite_module
 _T = TypeVar("_T")
 _T_co = TypeVar("_T_co", covariant=True)
 _T_contra = TypeVar("_T_contra", contravariant=True)
+_R = TypeVar("_R")
 
 
 if sys.version_info >= (3, 10):
@@ -58,6 +71,19 @@ else:
             await self.thing.aclose()
 
 
+def _get_json_loads() -> Callable[[Union[bytes, str]], Any]:
+    # orjson is an optional dependency, it decodes large NDJSON
+    # responses several times faster
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        return json.loads
+    return orjson.loads
+
+
+json_loads = _get_json_loads()
+
+
 # TODO (S Storchaka 2021-06-01): Methods __aiter__ and __anext__
 # are supported for compatibility, but using the iterator without
 # "async with" is strongly discouraged. In future these methods
@@ -186,6 +212,36 @@ class retries:
         return False
 
 
+def ensure_schema(
+    db: sqlite3.Connection, schema: Mapping[str, str], drop: Mapping[str, str]
+) -> bool:
+    """Create tables and indices from *schema* if they are missing or outdated.
+
+    Returns True if the schema was (re)created, all old data is lost in this case.
+    """
+    cur = db.cursor()
+    ok = True
+    found = set()
+    cur.execute("SELECT type, name, sql from sqlite_master")
+    for type, name, sql in cur:
+        if type not in ("table", "index"):
+            continue
+        if name in schema:
+            if schema[name] != sql:
+                ok = False
+                break
+            else:
+                found.add(name)
+
+    if not ok or found < schema.keys():
+        for sql in reversed(list(drop.values())):
+            cur.execute(sql)
+        for sql in schema.values():
+            cur.execute(sql)
+        return True
+    return False
+
+
 def flat(sql: str) -> str:
     return " ".join(line.strip() for line in sql.splitlines() if line.strip())
 
@@ -261,3 +317,95 @@ def queue_calls(
         return queue, _NoopProxy()
 
     return queue, Proxy()
+
+
+async def run_concurrently(coros: Iterable[Awaitable[Any]]) -> None:
+    tasks: Set["asyncio.Future[Any]"] = {asyncio.ensure_future(coro) for coro in coros}
+    if not tasks:
+        return
+    try:
+        done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            await task
+    except:  # noqa
+        for task in tasks:
+            task.cancel()
+        # wait for actual cancellation, ignore all exceptions raised from tasks
+        if tasks:
+            await asyncio.wait(tasks)
+        raise  # pragma: no cover
+
+
+async def map_ordered(
+    func: Callable[[_T], Awaitable[_R]], items: AsyncIterator[_T], limit: int
+) -> AsyncGenerator[_R, None]:
+    """Call *func* for *items* concurrently and yield the results in order.
+
+    At most *limit* calls are run at once, the next items are consumed
+    while earlier results are not yet requested.
+    """
+    pending: Deque["asyncio.Future[_R]"] = collections.deque()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < limit:
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.append(asyncio.ensure_future(func(item)))
+            if not pending:
+                return
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+
+class LazySequence(Sequence[_T]):
+    """Sequence of items decoded from their raw API form on first access.
+
+    The length and truthiness are known without decoding.
+    """
+
+    __slots__ = ("_raw", "_factory", "_items")
+
+    def __init__(self, raw: Sequence[Any], factory: Callable[[Any], _T]) -> None:
+        self._raw = raw
+        self._factory = factory
+        self._items: Optional[List[_T]] = None
+
+    def _materialize(self) -> List[_T]:
+        if self._items is None:
+            self._items = [self._factory(item) for item in self._raw]
+            self._raw = ()
+        return self._items
+
+    def __len__(self) -> int:
+        if self._items is None:
+            return len(self._raw)
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> _T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[_T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_T, Sequence[_T]]:
+        return self._materialize()[index]
+
+    def __iter__(self) -> Iterator[_T]:
+        return iter(self._materialize())
+
+    def __eq__(self, other: object) -> bool:
+        # Compares as the list of decoded items
+        if isinstance(other, LazySequence):
+            other = other._materialize()
+        return self._materialize() == other
+
+    def __repr__(self) -> str:
+        return repr(self._materialize())
@@ -1,5 +1,6 @@
+import asyncio
 from datetime import datetime, timezone
-from pathlib import PurePosixPath
+from pathlib import Path, PurePosixPath
 from typing import (
     Any,
     AsyncContextManager,
@@ -7,24 +8,38 @@ from typing import (
     Awaitable,
     Callable,
     Dict,
+    List,
     Mapping,
     Optional,
+    Sequence,
     Tuple,
     Union,
 )
+from unittest import mock
 
+import botocore.exceptions
 import pytest
+from azure.core import MatchConditions
+from azure.core.credentials import AzureSasCredential
+from azure.core.exceptions import HttpResponseError
 
+import apolo_sdk._bucket_base
 from apolo_sdk import (
+    AbstractDeleteProgress,
     BlobCommonPrefix,
     BlobObject,
     Bucket,
     BucketCredentials,
     BucketEntry,
+    Client,
     ResourceNotFound,
+    StorageProgressDelete,
 )
+from apolo_sdk._azure_bucket_provider import AzureProvider
 from apolo_sdk._bucket_base import BucketProvider
-from apolo_sdk._buckets import BucketFS
+from apolo_sdk._buckets import BucketCopier, BucketFS
+from apolo_sdk._file_utils import FileTransferer, LocalFS
+from apolo_sdk._s3_bucket_provider import S3Provider
 from apolo_sdk._utils import asyncgeneratorcontextmanager
 
 
@@ -53,7 +68,7 @@ class MockBucketProvider(BucketProvider):
                     yield await self.head_blob(key)
                 elif not recursive:
                     common, _ = post_prefix.split("/", 1)
-                    common_prefixes.add(prefix + common)
+                    common_prefixes.add(prefix + common + "/")
         for common in common_prefixes:
             yield BlobCommonPrefix(
                 key=common,
@@ -76,6 +91,8 @@ class MockBucketProvider(BucketProvider):
         key: str,
         body: Union[AsyncIterator[bytes], bytes],
         progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
     ) -> None:
         if not isinstance(body, bytes):
             body = b"".join([chunk async for chunk in body])
@@ -91,7 +108,8 @@ class MockBucketProvider(BucketProvider):
         yield data
 
     async def delete_blob(self, key: str) -> None:
-        self.keys.pop(key)
+        if self.keys.pop(key, None) is None:
+            raise ResourceNotFound(f"There is no object with key {key}")
 
     async def get_time_diff_to_local(self) -> Tuple[float, float]:
         return 0, 0
@@ -225,6 +243,50 @@ async def test_bucket_fs_iter_dir(
     assert res == {"some_key/foo", "some_key/bar1", "some_key/bar2"}
 
 
+async def test_bucket_fs_iter_dir_stat(
+    bucket_fs: BucketFS, mock_bucket_provider: MockBucketProvider
+) -> None:
+    await mock_bucket_provider.put_blob("some_key/", b"")
+    await mock_bucket_provider.put_blob("some_key/foo", b"data")
+    await mock_bucket_provider.put_blob("some_key/bar1/", b"")
+    await mock_bucket_provider.put_blob("some_key/bar2/baz", b"data")
+
+    async with bucket_fs.iter_dir_stat(PurePosixPath("some_key")) as it:
+        entries = {entry.name: entry async for entry in it}
+
+    assert entries.keys() == {"foo", "bar1", "bar2"}
+    foo = entries["foo"]
+    assert foo.path == PurePosixPath("some_key/foo")
+    assert foo.is_file and not foo.is_dir
+    assert foo.size == 4
+    assert (
+        foo.modification_time
+        == mock_bucket_provider.keys["some_key/foo"]["modified_at"].timestamp()
+    )
+    for name in ("bar1", "bar2"):
+        assert entries[name].is_dir and not entries[name].is_file
+
+
+async def test_bucket_fs_download_dir_uses_listing(
+    bucket_fs: BucketFS, mock_bucket_provider: MockBucketProvider, tmp_path: Path
+) -> None:
+    await mock_bucket_provider.put_blob("some_key/foo", b"data")
+    await mock_bucket_provider.put_blob("some_key/bar/", b"")
+    await mock_bucket_provider.put_blob("some_key/bar/baz", b"data2")
+
+    transferer = FileTransferer(bucket_fs, LocalFS())
+    # Sizes and types of entries are taken from the listing.
+    with mock.patch.object(
+        bucket_fs, "stat", side_effect=AssertionError("unexpected")
+    ), mock.patch.object(
+        bucket_fs, "is_file", side_effect=AssertionError("unexpected")
+    ):
+        await transferer.transfer_dir(PurePosixPath("some_key"), tmp_path / "dst")
+
+    assert (tmp_path / "dst" / "foo").read_bytes() == b"data"
+    assert (tmp_path / "dst" / "bar" / "baz").read_bytes() == b"data2"
+
+
 async def test_bucket_fs_mkdir(
     bucket_fs: BucketFS, mock_bucket_provider: MockBucketProvider
 ) -> None:
@@ -239,3 +301,719 @@ async def test_bucket_fs_mkdir_root(
 ) -> None:
     with pytest.raises(ValueError):
         await bucket_fs.mkdir(PurePosixPath(""))
+
+
+async def _iter_chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_upload_parts(mock_bucket_provider: MockBucketProvider) -> None:
+    mock_bucket_provider.MIN_CHUNK_SIZE = 4
+    mock_bucket_provider._parallel_parts = 2
+    uploaded: Dict[int, bytes] = {}
+    in_flight = max_in_flight = 0
+    steps = []
+
+    async def upload_part(part_number: int, data: bytearray) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Complete the parts in reverse order
+        await asyncio.sleep(0.01 / part_number)
+        in_flight -= 1
+        uploaded[part_number] = bytes(data)
+        return part_number * 10
+
+    async def progress(n: int) -> None:
+        steps.append(n)
+
+    res = await mock_bucket_provider._upload_parts(
+        _iter_chunks(b"abc", b"defghij", b"", b"klmnopqrs"),
+        upload_part,
+        progress=progress,
+    )
+
+    assert res == [10, 20, 30, 40, 50]
+    assert uploaded == {1: b"abcd", 2: b"efgh", 3: b"ijkl", 4: b"mnop", 5: b"qrs"}
+    assert max_in_flight == 2
+    assert sorted(steps) == [3, 4, 4, 4, 4]
+
+
+async def test_upload_parts_empty(mock_bucket_provider: MockBucketProvider) -> None:
+    uploaded = []
+
+    async def upload_part(part_number: int, data: bytearray) -> None:
+        uploaded.append((part_number, bytes(data)))
+
+    await mock_bucket_provider._upload_parts(_iter_chunks(), upload_part)
+
+    assert uploaded == [(1, b"")]
+
+
+async def test_upload_parts_error(mock_bucket_provider: MockBucketProvider) -> None:
+    mock_bucket_provider.MIN_CHUNK_SIZE = 4
+
+    async def upload_part(part_number: int, data: bytearray) -> None:
+        if part_number == 2:
+            raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError, match="failed"):
+        await mock_bucket_provider._upload_parts(_iter_chunks(b"x" * 100), upload_part)
+
+
+def test_part_size_for_max_parts(mock_bucket_provider: MockBucketProvider) -> None:
+    mock_bucket_provider.MIN_CHUNK_SIZE = 4
+    mock_bucket_provider.MAX_PARTS = 10
+    assert mock_bucket_provider._get_part_size() == 4
+    assert mock_bucket_provider._get_part_size(40) == 4
+    assert mock_bucket_provider._get_part_size(41) == 5
+    assert mock_bucket_provider._get_part_size(100) == 10
+
+
+def _make_s3_provider(mock_bucket: Bucket) -> Tuple[S3Provider, mock.Mock]:
+    client = mock.Mock()
+    client.create_multipart_upload = mock.AsyncMock(
+        return_value={"UploadId": "upload-id"}
+    )
+    client.upload_part = mock.AsyncMock(
+        side_effect=lambda **kwargs: {"ETag": f"etag{kwargs['PartNumber']}"}
+    )
+    client.complete_multipart_upload = mock.AsyncMock()
+    client.abort_multipart_upload = mock.AsyncMock()
+    provider = S3Provider(client, mock_bucket, "bucket-name")
+    provider._parallel_parts = 3
+    return provider, client
+
+
+async def test_s3_put_blob_multipart(mock_bucket: Bucket) -> None:
+    provider, client = _make_s3_provider(mock_bucket)
+    part_size = provider.MIN_CHUNK_SIZE
+
+    await provider.put_blob(
+        "key", _iter_chunks(b"x" * (part_size * 2 + 1)), size=part_size * 2 + 1
+    )
+
+    bodies = {
+        call.kwargs["PartNumber"]: call.kwargs["Body"]
+        for call in client.upload_part.await_args_list
+    }
+    assert {n: len(body) for n, body in bodies.items()} == {
+        1: part_size,
+        2: part_size,
+        3: 1,
+    }
+    client.complete_multipart_upload.assert_awaited_once_with(
+        Bucket="bucket-name",
+        Key="key",
+        UploadId="upload-id",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "etag1", "PartNumber": 1},
+                {"ETag": "etag2", "PartNumber": 2},
+                {"ETag": "etag3", "PartNumber": 3},
+            ]
+        },
+    )
+    client.abort_multipart_upload.assert_not_awaited()
+
+
+async def test_s3_put_blob_abort(mock_bucket: Bucket) -> None:
+    provider, client = _make_s3_provider(mock_bucket)
+    client.upload_part.side_effect = RuntimeError("failed")
+
+    with pytest.raises(RuntimeError, match="failed"):
+        await provider.put_blob("key", _iter_chunks(b"data"))
+
+    client.abort_multipart_upload.assert_awaited_once_with(
+        Bucket="bucket-name", Key="key", UploadId="upload-id"
+    )
+    client.complete_multipart_upload.assert_not_awaited()
+
+
+async def test_fetch_ranges_memory_limit(
+    mock_bucket_provider: MockBucketProvider, monkeypatch: Any
+) -> None:
+    monkeypatch.setattr(apolo_sdk._bucket_base, "MAX_FETCH_AHEAD", 8)
+    mock_bucket_provider.MIN_CHUNK_SIZE = 4
+    mock_bucket_provider._parallel_parts = 4
+    data = b"abcdefghijklmnop"
+    in_flight = max_in_flight = 0
+
+    async def fetch_range(start: int, end: int) -> bytes:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return data[start:end]
+
+    chunks = [
+        chunk async for chunk in mock_bucket_provider._fetch_ranges(fetch_range, 0, 16)
+    ]
+
+    assert chunks == [b"abcd", b"efgh", b"ijkl", b"mnop"]
+    assert max_in_flight == 2
+
+
+async def test_fetch_ranges(mock_bucket_provider: MockBucketProvider) -> None:
+    mock_bucket_provider.MIN_CHUNK_SIZE = 4
+    mock_bucket_provider._parallel_parts = 2
+    data = b"abcdefghijklmnopqrs"
+    in_flight = max_in_flight = 0
+    ranges = []
+
+    async def fetch_range(start: int, end: int) -> bytes:
+        nonlocal in_flight, max_in_flight
+        ranges.append((start, end))
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01 / (start + 1))
+        in_flight -= 1
+        return data[start:end]
+
+    chunks = [
+        chunk async for chunk in mock_bucket_provider._fetch_ranges(fetch_range, 3, 19)
+    ]
+
+    assert chunks == [b"defg", b"hijk", b"lmno", b"pqrs"]
+    assert ranges == [(3, 7), (7, 11), (11, 15), (15, 19)]
+    assert max_in_flight == 2
+
+
+def _make_azure_provider(
+    mock_bucket: Bucket, data: bytes
+) -> Tuple[AzureProvider, mock.Mock]:
+    blob_client = mock.Mock()
+    blob_client.stage_block = mock.AsyncMock()
+    blob_client.commit_block_list = mock.AsyncMock()
+
+    async def download_blob(offset: int, length: int, **kwargs: Any) -> mock.Mock:
+        chunk = data[offset : offset + length]
+
+        async def chunks() -> AsyncIterator[bytes]:
+            yield chunk
+
+        # Like in azure-storage-blob, the size is the size of the range
+        downloader = mock.Mock()
+        downloader.properties.size = len(chunk)
+        downloader.properties.content_range = (
+            f"bytes {offset}-{offset + length - 1}/{len(data)}"
+        )
+        downloader.properties.etag = '"etag"'
+        downloader.chunks = chunks
+        downloader.readall = mock.AsyncMock(return_value=chunk)
+        return downloader
+
+    blob_client.download_blob = mock.AsyncMock(side_effect=download_blob)
+    container_client = mock.Mock()
+    container_client.get_blob_client.return_value = blob_client
+    provider = AzureProvider(container_client, mock_bucket)
+    provider.MIN_CHUNK_SIZE = 4
+    return provider, blob_client
+
+
+async def test_azure_put_blob_blocks(mock_bucket: Bucket) -> None:
+    provider, blob_client = _make_azure_provider(mock_bucket, b"")
+
+    await provider.put_blob("key", _iter_chunks(b"ab", b"cdefghij"), size=10)
+
+    staged = [call.args for call in blob_client.stage_block.await_args_list]
+    assert sorted(data.getvalue() for _, data in staged) == [b"abcd", b"efgh", b"ij"]
+    data_by_id = {block_id: data.getvalue() for block_id, data in staged}
+    (blocks,) = blob_client.commit_block_list.await_args.args
+    assert [data_by_id[block.id] for block in blocks] == [b"abcd", b"efgh", b"ij"]
+
+
+async def test_azure_put_blob_empty(mock_bucket: Bucket) -> None:
+    provider, blob_client = _make_azure_provider(mock_bucket, b"")
+
+    await provider.put_blob("key", _iter_chunks())
+
+    blob_client.stage_block.assert_not_awaited()
+    blob_client.commit_block_list.assert_awaited_once_with([])
+
+
+async def test_azure_fetch_blob_ranges(mock_bucket: Bucket) -> None:
+    data = b"abcdefghijklmnopqrs"
+    provider, blob_client = _make_azure_provider(mock_bucket, data)
+
+    async with provider.fetch_blob("key", offset=1) as it:
+        chunks = [chunk async for chunk in it]
+
+    assert b"".join(chunks) == data[1:]
+    pinned = {"etag": '"etag"', "match_condition": MatchConditions.IfNotModified}
+    assert [call.kwargs for call in blob_client.download_blob.await_args_list] == [
+        {"offset": 1, "length": 4},
+        {"offset": 5, "length": 4, **pinned},
+        {"offset": 9, "length": 4, **pinned},
+        {"offset": 13, "length": 4, **pinned},
+        {"offset": 17, "length": 2, **pinned},
+    ]
+
+
+async def test_azure_fetch_blob_large(mock_bucket: Bucket) -> None:
+    data = bytes(range(256)) * 40
+    provider, blob_client = _make_azure_provider(mock_bucket, data)
+    provider.MIN_CHUNK_SIZE = 1000
+    provider._parallel_parts = 3
+
+    async with provider.fetch_blob("key") as it:
+        chunks = [chunk async for chunk in it]
+
+    assert b"".join(chunks) == data
+    assert [len(chunk) for chunk in chunks] == [1000] * 10 + [240]
+
+
+async def test_azure_fetch_blob_small(mock_bucket: Bucket) -> None:
+    provider, blob_client = _make_azure_provider(mock_bucket, b"abc")
+
+    async with provider.fetch_blob("key") as it:
+        chunks = [chunk async for chunk in it]
+
+    assert chunks == [b"abc"]
+    blob_client.download_blob.assert_awaited_once_with(offset=0, length=4)
+
+
+@pytest.fixture
+async def sharded_provider(
+    mock_bucket_provider: MockBucketProvider,
+) -> MockBucketProvider:
+    for key in [
+        "a",
+        "b/",
+        "b/x",
+        "b/y/z",
+        "c/d/1",
+        "c/d/2",
+        "c/e",
+        "c0",
+        "d/f",
+    ]:
+        await mock_bucket_provider.put_blob(key, b"")
+    return mock_bucket_provider
+
+
+async def test_list_blobs_sharded_ordered(
+    sharded_provider: MockBucketProvider,
+) -> None:
+    expected = sorted(sharded_provider.keys)
+    for parallel in (1, 2, 3, 10):
+        async with sharded_provider._list_blobs_sharded("", parallel) as it:
+            assert [entry.key async for entry in it] == expected
+    async with sharded_provider._list_blobs_sharded("c/", 3) as it:
+        assert [entry.key async for entry in it] == ["c/d/1", "c/d/2", "c/e"]
+
+
+async def test_list_blobs_sharded_unordered(
+    sharded_provider: MockBucketProvider,
+) -> None:
+    async with sharded_provider._list_blobs_sharded("", 3, ordered=False) as it:
+        keys = [entry.key async for entry in it]
+    assert sorted(keys) == sorted(sharded_provider.keys)
+
+
+async def test_list_blobs_sharded_concurrent(
+    sharded_provider: MockBucketProvider,
+) -> None:
+    list_blobs = sharded_provider.list_blobs
+    in_flight = max_in_flight = 0
+
+    @asyncgeneratorcontextmanager
+    async def slow_list_blobs(
+        prefix: str, recursive: bool = False, limit: Optional[int] = None
+    ) -> AsyncIterator[BucketEntry]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            async with list_blobs(prefix, recursive, limit) as it:
+                async for entry in it:
+                    yield entry
+        finally:
+            in_flight -= 1
+
+    with mock.patch.object(sharded_provider, "list_blobs", slow_list_blobs):
+        async with sharded_provider._list_blobs_sharded("", 3) as it:
+            keys = [entry.key async for entry in it]
+
+    assert keys == sorted(sharded_provider.keys)
+    assert max_in_flight == 3
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_list_blobs_sharded_error(
+    sharded_provider: MockBucketProvider, ordered: bool
+) -> None:
+    list_blobs = sharded_provider.list_blobs
+
+    def failing_list_blobs(
+        prefix: str, recursive: bool = False, limit: Optional[int] = None
+    ) -> AsyncContextManager[AsyncIterator[BucketEntry]]:
+        if prefix == "c/" and recursive:
+            raise RuntimeError("failed")
+        return list_blobs(prefix, recursive, limit)
+
+    with mock.patch.object(sharded_provider, "list_blobs", failing_list_blobs):
+        with pytest.raises(RuntimeError, match="failed"):
+            async with sharded_provider._list_blobs_sharded(
+                "", 3, ordered=ordered
+            ) as it:
+                async for _ in it:
+                    pass
+
+
+class _DeleteProgress(AbstractDeleteProgress):
+    def __init__(self) -> None:
+        self.deleted: List[Tuple[str, bool]] = []
+
+    def delete(self, data: StorageProgressDelete) -> None:
+        self.deleted.append((str(data.uri), data.is_dir))
+
+
+async def test_bucket_fs_rm_tree(
+    bucket_fs: BucketFS, mock_bucket_provider: MockBucketProvider
+) -> None:
+    for key in ["dir/", "dir/a", "dir/b", "dir/sub/", "dir/sub/c", "dir2/d", "e"]:
+        await mock_bucket_provider.put_blob(key, b"")
+    mock_bucket_provider.MAX_DELETE_BATCH = 2
+    batches = []
+    delete_blobs = mock_bucket_provider.delete_blobs
+
+    async def _delete_blobs(keys: Sequence[str]) -> None:
+        batches.append(list(keys))
+        await delete_blobs(keys)
+
+    progress = _DeleteProgress()
+    with mock.patch.object(mock_bucket_provider, "delete_blobs", _delete_blobs):
+        await bucket_fs.rm_tree(PurePosixPath("dir"), progress)
+
+    assert mock_bucket_provider.keys.keys() == {"dir2/d", "e"}
+    assert sorted(len(batch) for batch in batches) == [1, 2, 2]
+    uri = str(mock_bucket_provider.bucket.uri)
+    assert sorted(progress.deleted[:-1]) == [
+        (uri + "/dir/a", False),
+        (uri + "/dir/b", False),
+        (uri + "/dir/sub", True),
+        (uri + "/dir/sub/c", False),
+    ]
+    assert progress.deleted[-1] == (uri + "/dir", True)
+
+
+async def test_bucket_fs_rm_tree_not_found(bucket_fs: BucketFS) -> None:
+    with pytest.raises(FileNotFoundError):
+        await bucket_fs.rm_tree(PurePosixPath("missing"))
+
+
+async def test_delete_blobs_ignores_missing(
+    mock_bucket_provider: MockBucketProvider,
+) -> None:
+    await mock_bucket_provider.put_blob("a", b"")
+    await mock_bucket_provider.put_blob("b", b"")
+
+    await mock_bucket_provider.delete_blobs(["a", "missing", "b"])
+
+    assert mock_bucket_provider.keys == {}
+
+
+async def test_s3_delete_blobs(mock_bucket: Bucket) -> None:
+    provider, client = _make_s3_provider(mock_bucket)
+    client.delete_objects = mock.AsyncMock(return_value={})
+
+    await provider.delete_blobs(["a", "b"])
+
+    client.delete_objects.assert_awaited_once_with(
+        Bucket="bucket-name",
+        Delete={"Objects": [{"Key": "a"}, {"Key": "b"}], "Quiet": True},
+    )
+
+
+async def test_s3_delete_blobs_error(mock_bucket: Bucket) -> None:
+    provider, client = _make_s3_provider(mock_bucket)
+    client.delete_objects = mock.AsyncMock(
+        return_value={
+            "Errors": [{"Key": "b", "Code": "AccessDenied", "Message": "Denied"}]
+        }
+    )
+
+    with pytest.raises(botocore.exceptions.ClientError, match="AccessDenied"):
+        await provider.delete_blobs(["a", "b"])
+
+
+async def test_azure_delete_blobs(mock_bucket: Bucket) -> None:
+    provider, _ = _make_azure_provider(mock_bucket, b"")
+
+    async def responses() -> AsyncIterator[mock.Mock]:
+        for status_code in (202, 404):
+            yield mock.Mock(status_code=status_code)
+
+    with mock.patch.object(
+        provider._client,
+        "delete_blobs",
+        new_callable=mock.AsyncMock,
+        return_value=responses(),
+    ) as delete_blobs:
+        await provider.delete_blobs(["a", "b"])
+
+    delete_blobs.assert_awaited_once_with("a", "b", raise_on_any_failure=False)
+
+
+class CopyingMockBucketProvider(MockBucketProvider):
+    def can_copy_from(self, src: BucketProvider) -> bool:
+        return isinstance(src, MockBucketProvider)
+
+    async def copy_blob(
+        self,
+        src: BucketProvider,
+        src_key: str,
+        key: str,
+        *,
+        size: int,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> None:
+        assert isinstance(src, MockBucketProvider)
+        self.keys[key] = src.keys[src_key]
+        if progress is not None:
+            await progress(size)
+
+
+async def test_bucket_copier_server_side(
+    mock_bucket_provider: MockBucketProvider, mock_bucket: Bucket
+) -> None:
+    await mock_bucket_provider.put_blob("dir/foo", b"data")
+    await mock_bucket_provider.put_blob("dir/sub/bar", b"data2")
+    dst_provider = CopyingMockBucketProvider(mock_bucket)
+    src_fs = BucketFS(mock_bucket_provider)
+    transferer = BucketCopier(src_fs, BucketFS(dst_provider))
+
+    with mock.patch.object(
+        src_fs, "read_chunks", side_effect=AssertionError("unexpected")
+    ):
+        await transferer.transfer_dir(PurePosixPath("dir"), PurePosixPath("copy"))
+
+    assert {key: value["data"] for key, value in dst_provider.keys.items()} == {
+        "copy/": b"",
+        "copy/foo": b"data",
+        "copy/sub/": b"",
+        "copy/sub/bar": b"data2",
+    }
+
+
+async def test_bucket_copier_streams(
+    mock_bucket_provider: MockBucketProvider, mock_bucket: Bucket
+) -> None:
+    await mock_bucket_provider.put_blob("foo", b"data")
+    dst_provider = MockBucketProvider(mock_bucket)
+    transferer = BucketCopier(BucketFS(mock_bucket_provider), BucketFS(dst_provider))
+
+    await transferer.transfer_file(PurePosixPath("foo"), PurePosixPath("bar"))
+
+    assert dst_provider.keys["bar"]["data"] == b"data"
+
+
+async def test_copy_blob_streams(
+    mock_bucket_provider: MockBucketProvider, mock_bucket: Bucket
+) -> None:
+    await mock_bucket_provider.put_blob("foo", b"data")
+    dst_provider = MockBucketProvider(mock_bucket)
+
+    assert not dst_provider.can_copy_from(mock_bucket_provider)
+    await dst_provider.copy_blob(mock_bucket_provider, "foo", "bar", size=4)
+
+    assert dst_provider.keys["bar"]["data"] == b"data"
+
+
+async def test_s3_copy_blob(mock_bucket: Bucket) -> None:
+    provider, client = _make_s3_provider(mock_bucket)
+    src, _ = _make_s3_provider(mock_bucket)
+    src._bucket_name = "src-bucket"
+    client.copy_object = mock.AsyncMock()
+    steps = []
+
+    async def progress(n: int) -> None:
+        steps.append(n)
+
+    assert not provider.can_copy_from(src)
+    src._client.meta.endpoint_url = client.meta.endpoint_url
+    assert provider.can_copy_from(src)
+    await provider.copy_blob(src, "src-key", "key", size=10, progress=progress)
+
+    client.copy_object.assert_awaited_once_with(
+        Bucket="bucket-name",
+        Key="key",
+        CopySource={"Bucket": "src-bucket", "Key": "src-key"},
+    )
+    assert steps == [10]
+
+
+async def test_s3_copy_blob_multipart(mock_bucket: Bucket) -> None:
+    provider, client = _make_s3_provider(mock_bucket)
+    src, _ = _make_s3_provider(mock_bucket)
+    provider.MAX_COPY_OBJECT_SIZE = 8
+    provider.COPY_PART_SIZE = 4
+    client.upload_part_copy = mock.AsyncMock(
+        side_effect=lambda **kwargs: {
+            "CopyPartResult": {"ETag": f"etag{kwargs['PartNumber']}"}
+        }
+    )
+
+    await provider.copy_blob(src, "src-key", "key", size=10)
+
+    assert sorted(
+        (call.kwargs["PartNumber"], call.kwargs["CopySourceRange"])
+        for call in client.upload_part_copy.await_args_list
+    ) == [(1, "bytes=0-3"), (2, "bytes=4-7"), (3, "bytes=8-9")]
+    client.complete_multipart_upload.assert_awaited_once_with(
+        Bucket="bucket-name",
+        Key="key",
+        UploadId="upload-id",
+        MultipartUpload={
+            "Parts": [
+                {"ETag": "etag1", "PartNumber": 1},
+                {"ETag": "etag2", "PartNumber": 2},
+                {"ETag": "etag3", "PartNumber": 3},
+            ]
+        },
+    )
+
+
+async def test_s3_fetch_blob_ranges(mock_bucket: Bucket) -> None:
+    provider, client = _make_s3_provider(mock_bucket)
+    provider.MIN_CHUNK_SIZE = 4
+    data = b"abcdefghijk"
+
+    async def get_object(
+        Bucket: str, Key: str, Range: str, IfMatch: Optional[str] = None
+    ) -> Dict[str, Any]:
+        start_str, _, end_str = Range[len("bytes=") :].partition("-")
+        start, end = int(start_str), int(end_str) + 1
+        body = mock.MagicMock()
+        body.__aenter__.return_value = body
+        body.read = mock.AsyncMock(return_value=data[start:end])
+
+        async def iter_any() -> AsyncIterator[bytes]:
+            yield data[start:end]
+
+        body.content.iter_any = iter_any
+        return {
+            "Body": body,
+            "ContentRange": f"bytes {start}-{min(end, len(data)) - 1}/{len(data)}",
+            "ETag": '"etag"',
+        }
+
+    client.get_object = mock.AsyncMock(side_effect=get_object)
+
+    async with provider.fetch_blob("key", offset=1) as it:
+        chunks = [chunk async for chunk in it]
+
+    assert chunks == [b"bcde", b"fghi", b"jk"]
+    assert [call.kwargs["Range"] for call in client.get_object.await_args_list] == [
+        "bytes=1-4",
+        "bytes=5-8",
+        "bytes=9-10",
+    ]
+    assert [
+        call.kwargs.get("IfMatch") for call in client.get_object.await_args_list
+    ] == [None, '"etag"', '"etag"']
+
+
+async def test_azure_copy_blob(mock_bucket: Bucket) -> None:
+    provider, blob_client = _make_azure_provider(mock_bucket, b"")
+    provider.COPY_POLL_INTERVAL = 0
+    src, src_blob_client = _make_azure_provider(mock_bucket, b"")
+    src._sas_credential = AzureSasCredential("sig=secret")
+    src_blob_client.url = "https://account/container/src-key"
+    blob_client.start_copy_from_url = mock.AsyncMock(
+        return_value={"copy_status": "pending"}
+    )
+    blob_client.get_blob_properties = mock.AsyncMock(
+        side_effect=[
+            mock.Mock(copy=mock.Mock(status="pending", progress="4/10")),
+            mock.Mock(copy=mock.Mock(status="success", progress="10/10")),
+        ]
+    )
+    steps = []
+
+    async def progress(n: int) -> None:
+        steps.append(n)
+
+    assert provider.can_copy_from(src)
+    await provider.copy_blob(src, "src-key", "key", size=10, progress=progress)
+
+    blob_client.start_copy_from_url.assert_awaited_once_with(
+        "https://account/container/src-key?sig=secret"
+    )
+    assert steps == [4, 6]
+
+
+async def test_azure_copy_blob_failed(mock_bucket: Bucket) -> None:
+    provider, blob_client = _make_azure_provider(mock_bucket, b"")
+    provider.COPY_POLL_INTERVAL = 0
+    src, _ = _make_azure_provider(mock_bucket, b"")
+    blob_client.start_copy_from_url = mock.AsyncMock(
+        return_value={"copy_status": "pending"}
+    )
+    blob_client.get_blob_properties = mock.AsyncMock(
+        return_value=mock.Mock(
+            copy=mock.Mock(status="failed", progress=None, status_description="err")
+        )
+    )
+
+    with pytest.raises(HttpResponseError, match="failed: err"):
+        await provider.copy_blob(src, "src-key", "key", size=10)
+
+
+async def test_glob_blobs(
+    mock_bucket_provider: MockBucketProvider, make_client: Callable[..., Client]
+) -> None:
+    for key in [
+        "data/2023-12/shard-1/part.parquet",
+        "data/2024-01/shard-1/part.parquet",
+        "data/2024-01/shard-1/part.json",
+        "data/2024-01/shard-2/part.parquet",
+        "data/2024-02/other/part.parquet",
+        "data/2024-02/shard-1/part.parquet",
+        "data/2024-03",
+    ]:
+        await mock_bucket_provider.put_blob(key, b"")
+    prefixes = []
+    list_blobs = mock_bucket_provider.list_blobs
+
+    def _list_blobs(
+        prefix: str, recursive: bool = False, limit: Optional[int] = None
+    ) -> AsyncContextManager[AsyncIterator[BucketEntry]]:
+        prefixes.append(prefix)
+        return list_blobs(prefix, recursive, limit)
+
+    async def glob(pattern: str) -> List[str]:
+        async with client.buckets._glob_blobs(pattern, mock_bucket_provider) as it:
+            return sorted([entry.key async for entry in it])
+
+    async with make_client("https://example.com") as client:
+        with mock.patch.object(mock_bucket_provider, "list_blobs", _list_blobs):
+            assert await glob("data/2024-*/shard-*/*.parquet") == [
+                "data/2024-01/shard-1/part.parquet",
+                "data/2024-01/shard-2/part.parquet",
+                "data/2024-02/shard-1/part.parquet",
+            ]
+            # Listings start with the literal parts of segments
+            assert sorted(prefixes) == [
+                "data/2024-",
+                "data/2024-01/shard-",
+                "data/2024-01/shard-1/",
+                "data/2024-01/shard-2/",
+                "data/2024-02/shard-",
+                "data/2024-02/shard-1/",
+            ]
+            assert await glob("data/2024-0[12]/shard-1/part.json") == [
+                "data/2024-01/shard-1/part.json",
+            ]
+            assert await glob("data/2024-*") == [
+                "data/2024-01/",
+                "data/2024-02/",
+                "data/2024-03",
+            ]
+            assert await glob("data/**/other/*") == [
+                "data/2024-02/other/part.parquet",
+            ]
@@ -1,9 +1,19 @@
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Callable
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
 
 from aiohttp import web
 
-from apolo_sdk import Bucket, Client, Cluster
+from apolo_sdk import (
+    BlobObject,
+    Bucket,
+    BucketCredentials,
+    BucketEntry,
+    Client,
+    Cluster,
+)
+from apolo_sdk._bucket_base import BucketProvider
+from apolo_sdk._utils import asyncgeneratorcontextmanager
 
 from tests import _TestServerFactory
 
@@ -373,3 +383,115 @@ async def test_rm(aiohttp_server: _TestServerFactory, make_client: _MakeClient)
 
     async with make_client(srv.make_url("/")) as client:
         await client.buckets.rm("name")
+
+
+class _CountingProvider(BucketProvider):
+    created: List["_CountingProvider"] = []
+
+    def __init__(self, bucket: Bucket) -> None:
+        self.bucket = bucket
+        self.closed = False
+
+    @classmethod
+    @asynccontextmanager
+    async def create(
+        cls,
+        bucket: Bucket,
+        _get_credentials: Callable[[], Awaitable[BucketCredentials]],
+    ) -> AsyncIterator[BucketProvider]:
+        await _get_credentials()
+        provider = cls(bucket)
+        cls.created.append(provider)
+        try:
+            yield provider
+        finally:
+            provider.closed = True
+
+    @asyncgeneratorcontextmanager
+    async def list_blobs(
+        self, prefix: str, recursive: bool = False, limit: Optional[int] = None
+    ) -> AsyncIterator[BucketEntry]:
+        yield BlobObject(key=prefix + "file", bucket=self.bucket, size=0)
+
+    async def head_blob(self, key: str) -> BucketEntry:
+        return BlobObject(key=key, bucket=self.bucket, size=0)
+
+    async def put_blob(
+        self,
+        key: str,
+        body: Union[AsyncIterator[bytes], bytes],
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        *,
+        size: Optional[int] = None,
+    ) -> None:
+        raise NotImplementedError
+
+    @asyncgeneratorcontextmanager
+    async def fetch_blob(self, key: str, offset: int = 0) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+        yield b""
+
+    async def delete_blob(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def get_time_diff_to_local(self) -> Tuple[float, float]:
+        return 0, 0
+
+
+async def test_provider_is_reused(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    requests: List[str] = []
+
+    async def get_handler(request: web.Request) -> web.Response:
+        requests.append("get")
+        return web.json_response(
+            {
+                "id": "bucket-1",
+                "owner": "user",
+                "name": "name",
+                "project_name": "test-project",
+                "provider": "aws",
+                "created_at": datetime.now().isoformat(),
+            }
+        )
+
+    async def credentials_handler(request: web.Request) -> web.Response:
+        requests.append("credentials")
+        return web.json_response(
+            {
+                "bucket_id": "bucket-1",
+                "provider": "aws",
+                "credentials": {},
+            }
+        )
+
+    async def delete_handler(request: web.Request) -> web.Response:
+        raise web.HTTPNoContent
+
+    app = web.Application()
+    app.router.add_get("/buckets/buckets/{key}", get_handler)
+    app.router.add_post(
+        "/buckets/buckets/{key}/make_tmp_credentials", credentials_handler
+    )
+    app.router.add_delete("/buckets/buckets/{key}", delete_handler)
+
+    srv = await aiohttp_server(app)
+
+    _CountingProvider.created = []
+    async with make_client(srv.make_url("/")) as client:
+        client.buckets._providers[Bucket.Provider.AWS] = _CountingProvider
+        await client.buckets.head_blob("name", "key1")
+        entry = await client.buckets.head_blob("name", "key2")
+        async with client.buckets.list_blobs(entry.bucket.uri / "dir/") as it:
+            assert [item.key async for item in it] == ["dir/file"]
+        assert requests == ["get", "credentials"]
+        assert len(_CountingProvider.created) == 1
+
+        await client.buckets.rm("name")
+        assert _CountingProvider.created[0].closed
+        await client.buckets.head_blob("name", "key3")
+        assert requests == ["get", "credentials", "get", "credentials"]
+        assert not _CountingProvider.created[1].closed
+
+    assert _CountingProvider.created[1].closed
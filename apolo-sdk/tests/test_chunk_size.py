@@ -0,0 +1,100 @@
+import pytest
+
+from apolo_sdk._chunk_size import (
+    DEFAULT_MAX_CHUNK_SIZE,
+    DEFAULT_MIN_CHUNK_SIZE,
+    FAST_REQUEST_TIME,
+    SLOW_REQUEST_TIME,
+    ChunkSizeController,
+)
+
+
+def test_grow_on_fast_requests() -> None:
+    controller = ChunkSizeController(1024, min_size=256, max_size=4096)
+    controller.observe(1024, FAST_REQUEST_TIME / 2)
+    assert controller.size == 2048
+    controller.observe(2048, FAST_REQUEST_TIME / 2)
+    assert controller.size == 4096
+    controller.observe(4096, FAST_REQUEST_TIME / 2)
+    assert controller.size == 4096
+
+
+def test_no_grow_on_small_chunks() -> None:
+    controller = ChunkSizeController(1024, min_size=256, max_size=4096)
+    controller.observe(100, FAST_REQUEST_TIME / 2)
+    assert controller.size == 1024
+
+
+def test_shrink_on_slow_requests() -> None:
+    controller = ChunkSizeController(1024, min_size=256, max_size=4096)
+    controller.observe(1024, SLOW_REQUEST_TIME * 2)
+    assert controller.size == 512
+    controller.observe(100, SLOW_REQUEST_TIME * 2)
+    assert controller.size == 256
+    controller.observe(256, SLOW_REQUEST_TIME * 2)
+    assert controller.size == 256
+
+
+def test_shrink_on_errors() -> None:
+    controller = ChunkSizeController(1024, min_size=256, max_size=4096)
+    with pytest.raises(ZeroDivisionError):
+        with controller.measure(1024):
+            1 / 0
+    assert controller.size == 512
+
+
+def test_measure_success() -> None:
+    controller = ChunkSizeController(1024, min_size=256, max_size=4096)
+    with controller.measure(1024):
+        pass
+    assert controller.size == 2048
+
+
+def test_not_adaptive() -> None:
+    controller = ChunkSizeController(1024, min_size=256, max_size=4096, adaptive=False)
+    controller.observe(1024, FAST_REQUEST_TIME / 2)
+    controller.observe(1024, SLOW_REQUEST_TIME * 2)
+    controller.failed()
+    assert controller.size == 1024
+
+
+def test_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        ChunkSizeController(0)
+
+
+def test_from_user_config_defaults() -> None:
+    controller = ChunkSizeController.from_user_config({}, size=2**20)
+    assert controller.size == 2**20
+    assert controller.adaptive
+    for _ in range(100):
+        controller.failed()
+    assert controller.size == DEFAULT_MIN_CHUNK_SIZE
+    for _ in range(100):
+        controller.observe(controller.size, 0)
+    assert controller.size == DEFAULT_MAX_CHUNK_SIZE
+
+
+def test_from_user_config() -> None:
+    controller = ChunkSizeController.from_user_config(
+        {
+            "storage": {
+                "chunk-size": 4096,
+                "min-chunk-size": 1024,
+                "max-chunk-size": 8192,
+                "adaptive-chunk-size": False,
+            }
+        }
+    )
+    assert controller.size == 4096
+    assert not controller.adaptive
+
+
+def test_from_user_config_lower_bound() -> None:
+    controller = ChunkSizeController.from_user_config(
+        {"storage": {"chunk-size": 1024, "min-chunk-size": 256}},
+        lower_bound=2048,
+    )
+    assert controller.size == 2048
+    controller.failed()
+    assert controller.size == 2048
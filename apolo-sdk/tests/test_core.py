@@ -12,12 +12,14 @@ from yarl import URL
 
 from apolo_sdk import BadGateway, IllegalArgumentError
 from apolo_sdk._core import (
+    DROP,
+    SCHEMA,
     _Core,
-    _ensure_schema,
     _load_cookies,
     _make_cookie,
     _save_cookies,
 )
+from apolo_sdk._utils import ensure_schema
 
 from tests import _TestServerFactory
 
@@ -183,7 +185,7 @@ def test_load_cookies_valid() -> None:
     now = 123456
 
     with sqlite3.connect(":memory:") as db:
-        _ensure_schema(db, update=True)
+        ensure_schema(db, SCHEMA, DROP)
 
         db.execute(
             """INSERT INTO cookie_session
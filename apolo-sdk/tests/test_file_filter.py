@@ -1,6 +1,6 @@
 import codecs
 
-from apolo_sdk._file_filter import FileFilter, translate
+from apolo_sdk._file_filter import FileFilter, compile_glob, translate
 
 
 async def test_empty_filter() -> None:
@@ -169,6 +169,38 @@ def test_translate_recursive() -> None:
     assert translate("abc/**/def") == r"abc/(?:.+/)?def/?"
 
 
+def test_compile_glob() -> None:
+    segments = compile_glob("data/2024-*/shard-*/part/x.parquet")
+    assert [segment.pattern for segment in segments] == [
+        "data",
+        "2024-*",
+        "shard-*",
+        "part/x.parquet",
+    ]
+    assert [segment.is_literal for segment in segments] == [True, False, False, True]
+    assert [segment.prefix for segment in segments] == [
+        "data",
+        "2024-",
+        "shard-",
+        "part/x.parquet",
+    ]
+    assert segments[1].match("2024-01")
+    assert not segments[1].match("2023-01")
+    assert not segments[1].match("2024-01/x")
+    assert compile_glob("data/2024-*/shard-*/part/x.parquet") is segments
+
+
+def test_compile_glob_recursive() -> None:
+    head, recursive, tail = compile_glob("data/**/*.json")
+    assert head.pattern == "data"
+    assert recursive.is_recursive
+    # The recursive segment matches the rest of the path
+    assert tail.pattern == "*.json"
+    assert recursive.match("a.json")
+    assert recursive.match("x/y/a.json")
+    assert not recursive.match("x/y/a.txt")
+
+
 async def test_read_from_buffer() -> None:
     ff = FileFilter()
     ff.read_from_buffer(
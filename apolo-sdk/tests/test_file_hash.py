@@ -0,0 +1,93 @@
+import hashlib
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, List
+
+from apolo_sdk import Client
+from apolo_sdk._file_hash import FileHashCache
+
+_MakeClient = Callable[..., Client]
+
+
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+async def test_hash(make_client: _MakeClient, tmp_path: Path) -> None:
+    path = tmp_path / "file.bin"
+    data = os.urandom(3 * 2**20 + 5)
+    path.write_bytes(data)
+    async with make_client("https://example.com") as client:
+        cache = FileHashCache(client._config)
+        assert await cache.hash(path) == sha256(data)
+
+
+async def test_cached(
+    make_client: _MakeClient, tmp_path: Path, monkeypatch: Any
+) -> None:
+    import apolo_sdk._file_hash
+
+    hashed: List[Path] = []
+    hash_file = apolo_sdk._file_hash._hash_file
+
+    def _hash_file(path: Path) -> Any:
+        hashed.append(path)
+        return hash_file(path)
+
+    monkeypatch.setattr(apolo_sdk._file_hash, "_hash_file", _hash_file)
+
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"data")
+    async with make_client("https://example.com") as client:
+        cache = FileHashCache(client._config)
+        assert await cache.hash(path) == sha256(b"data")
+        assert await cache.hash(path) == sha256(b"data")
+        assert hashed == [path]
+        cache.save()
+
+        # Persisted in the config database
+        cache = FileHashCache(client._config)
+        assert await cache.hash(path) == sha256(b"data")
+        assert hashed == [path]
+
+        # The file is changed, the modification time is preserved
+        stat = path.stat()
+        path.write_bytes(b"DATA")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert await cache.hash(path) == sha256(b"DATA")
+        assert hashed == [path, path]
+
+
+async def test_evict_least_recently_used(
+    make_client: _MakeClient, tmp_path: Path, monkeypatch: Any
+) -> None:
+    import apolo_sdk._file_hash
+
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file{i}.bin"
+        path.write_bytes(b"data%d" % i)
+        paths.append(path)
+
+    times = iter([1.0, 2.0, 3.0])
+    monkeypatch.setattr(
+        apolo_sdk._file_hash, "time", SimpleNamespace(time=lambda: next(times))
+    )
+
+    async with make_client("https://example.com") as client:
+        cache = FileHashCache(client._config, max_size=2)
+        await cache.hash(paths[0])
+        await cache.hash(paths[1])
+        cache.save()
+        await cache.hash(paths[0])
+        cache.save()
+        await cache.hash(paths[2])
+        cache.save()
+
+        with client._config._open_db() as db:
+            inodes = {
+                row["inode"]
+                for row in db.execute("SELECT inode FROM file_hash").fetchall()
+            }
+        assert inodes == {paths[0].stat().st_ino, paths[2].stat().st_ino}
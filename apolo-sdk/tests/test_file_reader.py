@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from apolo_sdk._file_reader import BufferPool, iter_file_chunks, read_into
+
+
+def test_buffer_pool_reuse() -> None:
+    pool = BufferPool(max_idle=1)
+    buf = pool.acquire(10)
+    assert len(buf) == 10
+    pool.release(buf)
+    assert pool.acquire(10) is buf
+    assert len(pool.acquire(20)) == 20
+
+
+def test_buffer_pool_max_idle() -> None:
+    pool = BufferPool(max_idle=1)
+    with pool.buffer(10) as buf1:
+        with pool.buffer(10) as buf2:
+            pass
+    assert pool.acquire(10) is buf2
+    assert pool.acquire(10) is not buf1
+
+
+async def test_read_into(tmp_path: Path) -> None:
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"abcdefg")
+    buf = bytearray(3)
+    with path.open("rb") as stream:
+        assert await read_into(stream, buf) == b"abc"
+        assert await read_into(stream, buf) == b"def"
+        assert await read_into(stream, buf) == b"g"
+        assert await read_into(stream, buf) == b""
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+async def test_iter_file_chunks(tmp_path: Path, use_mmap: bool) -> None:
+    path = tmp_path / "file.bin"
+    data = os.urandom(10_000)
+    path.write_bytes(data)
+    chunks: List[bytes] = []
+    with path.open("rb") as stream:
+        stream.seek(1000)
+        async for chunk in iter_file_chunks(stream, 3000, use_mmap=use_mmap):
+            assert isinstance(chunk, memoryview)
+            chunks.append(bytes(chunk))
+        assert stream.tell() == 10_000
+    assert [len(chunk) for chunk in chunks] == [3000, 3000, 3000]
+    assert b"".join(chunks) == data[1000:]
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+async def test_iter_file_chunks_empty(tmp_path: Path, use_mmap: bool) -> None:
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"")
+    with path.open("rb") as stream:
+        assert [
+            chunk async for chunk in iter_file_chunks(stream, use_mmap=use_mmap)
+        ] == []
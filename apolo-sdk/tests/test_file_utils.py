@@ -12,6 +12,7 @@ from unittest import mock
 import pytest
 from yarl import URL
 
+import apolo_sdk._scheduler
 from apolo_sdk import (
     AbstractRecursiveFileProgress,
     StorageProgressComplete,
@@ -22,6 +23,7 @@ from apolo_sdk import (
     StorageProgressStep,
 )
 from apolo_sdk._file_utils import READ_SIZE, FileTransferer, LocalFS, rm
+from apolo_sdk._scheduler import WorkGroup, WorkKind
 
 
 @pytest.fixture()
@@ -455,6 +457,77 @@ async def test_transfer_dir_ignore_file_names(
     assert await cmp_dirs(src, dst_dir / "sub_dir")
 
 
+async def test_local_fs_iter_dir_stat(src_dir: Path) -> None:
+    (src_dir / "file").write_bytes(b"testing")
+    (src_dir / "dir").mkdir()
+    if sys.platform != "win32":
+        (src_dir / "link").symlink_to(src_dir / "missing")
+
+    async with LocalFS().iter_dir_stat(src_dir) as it:
+        entries = {entry.name: entry async for entry in it}
+
+    file_entry = entries.pop("file")
+    assert file_entry.path == src_dir / "file"
+    assert file_entry.is_file
+    assert not file_entry.is_dir
+    assert file_entry.size == 7
+    assert file_entry.modification_time == (src_dir / "file").stat().st_mtime
+    dir_entry = entries.pop("dir")
+    assert dir_entry.is_dir
+    assert not dir_entry.is_file
+    if sys.platform != "win32":
+        link_entry = entries.pop("link")
+        assert not link_entry.is_dir
+        assert not link_entry.is_file
+    assert entries == {}
+
+
+async def test_transfer_dir_no_stat_calls(
+    transferer: FileTransferer[Path, Path], src_dir: Path, dst_dir: Path
+) -> None:
+    (src_dir / "file").write_bytes(b"testing")
+    (src_dir / "nested").mkdir()
+    (src_dir / "nested" / "file").write_bytes(b"nested")
+    (dst_dir / "dst" / "nested").mkdir(parents=True)
+    (dst_dir / "dst" / "nested" / "file").write_bytes(b"old")
+
+    with mock.patch.object(
+        LocalFS, "stat", side_effect=AssertionError("unexpected stat")
+    ), mock.patch.object(
+        LocalFS, "is_file", side_effect=AssertionError("unexpected is_file")
+    ):
+        await transferer.transfer_dir(src_dir, dst_dir / "dst", update=True)
+
+    assert (dst_dir / "dst" / "file").read_bytes() == b"testing"
+    assert (dst_dir / "dst" / "nested" / "file").read_bytes() == b"nested"
+
+
+async def test_transfer_dir_work_kinds(
+    transferer: FileTransferer[Path, Path],
+    src_dir: Path,
+    dst_dir: Path,
+    monkeypatch: Any,
+) -> None:
+    monkeypatch.setattr(apolo_sdk._scheduler, "LARGE_FILE_SIZE", 1000)
+    (src_dir / "small").write_bytes(b"x" * 999)
+    (src_dir / "large").write_bytes(b"x" * 1000)
+    kinds = []
+    orig_submit = WorkGroup.submit
+
+    async def submit(self: WorkGroup, kind: WorkKind, job: Any) -> None:
+        kinds.append(kind)
+        await orig_submit(self, kind, job)
+
+    with mock.patch.object(WorkGroup, "submit", submit):
+        await transferer.transfer_dir(src_dir, dst_dir / "dst")
+
+    assert sorted(kinds, key=lambda kind: kind.value) == [
+        WorkKind.LARGE_FILE,
+        WorkKind.SMALL_FILE,
+    ]
+    assert (dst_dir / "dst" / "large").read_bytes() == b"x" * 1000
+
+
 async def test_rm_file(
     src_dir: Path,
 ) -> None:
@@ -0,0 +1,323 @@
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional, Set
+from urllib.parse import unquote
+
+import pytest
+from aiohttp import (
+    BodyPartReader,
+    ClientResponseError,
+    ClientSession,
+    MultipartWriter,
+    web,
+)
+
+from apolo_sdk import Bucket
+from apolo_sdk._gcs_bucket_provider import AutoRefreshingGCSToken, GCSProvider
+
+from tests import _TestServerFactory
+
+
+class StaticToken(AutoRefreshingGCSToken):
+    def _refresh_required(self) -> bool:
+        return False
+
+    async def _do_refresh(self) -> None:
+        pass
+
+
+class FakeGCS:
+    """Minimal implementation of the GCS JSON API used by GCSProvider."""
+
+    def __init__(self) -> None:
+        self.objects: Dict[str, bytes] = {}
+        self.sessions: Dict[str, bytearray] = {}
+        self.requests: List[str] = []
+        self.ranges: List[Optional[str]] = []
+        self.fail_compose = False
+        self.forbidden: Set[str] = set()
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/upload/storage/v1/b/bucket/o", self.handle_upload)
+        app.router.add_put("/upload/session/{id}", self.handle_session)
+        app.router.add_post("/storage/v1/b/bucket/o/{key}/compose", self.handle_compose)
+        app.router.add_get("/storage/v1/b/bucket/o/{key}", self.handle_get)
+        app.router.add_delete("/storage/v1/b/bucket/o/{key}", self.handle_delete)
+        app.router.add_post("/batch/storage/v1", self.handle_batch)
+        app.router.add_post(
+            "/storage/v1/b/{src_bucket}/o/{src_key}/rewriteTo/b/bucket/o/{key}",
+            self.handle_rewrite,
+        )
+        return app
+
+    async def handle_upload(self, request: web.Request) -> web.Response:
+        upload_type = request.query["uploadType"]
+        self.requests.append(upload_type)
+        name = request.query["name"]
+        if upload_type == "media":
+            self.objects[name] = await request.read()
+            return web.json_response({"name": name})
+        assert upload_type == "resumable"
+        self.sessions[name] = bytearray()
+        location = request.url.with_path(f"/upload/session/{name}").with_query({})
+        return web.Response(headers={"Location": str(location)})
+
+    async def handle_session(self, request: web.Request) -> web.Response:
+        name = request.match_info["id"]
+        self.sessions[name] += await request.read()
+        if not request.headers["Content-Range"].endswith("/*"):
+            self.objects[name] = bytes(self.sessions.pop(name))
+        return web.json_response({})
+
+    async def handle_compose(self, request: web.Request) -> web.Response:
+        self.requests.append("compose")
+        if self.fail_compose:
+            raise web.HTTPInternalServerError()
+        data = await request.json()
+        sources = [item["name"] for item in data["sourceObjects"]]
+        assert len(sources) <= GCSProvider.MAX_COMPOSE_SOURCES
+        self.objects[request.match_info["key"]] = b"".join(
+            self.objects[name] for name in sources
+        )
+        return web.json_response({})
+
+    async def handle_get(self, request: web.Request) -> web.Response:
+        assert request.query["alt"] == "media"
+        data = self.objects.get(request.match_info["key"])
+        if data is None:
+            raise web.HTTPNotFound()
+        # The generation changes when the object is overwritten
+        generation = str(zlib.crc32(data))
+        if request.query.get("ifGenerationMatch", generation) != generation:
+            raise web.HTTPPreconditionFailed()
+        range_ = request.headers.get("Range")
+        self.ranges.append(range_)
+        headers = {"x-goog-generation": generation}
+        if range_ is None:
+            return web.Response(body=data, headers=headers)
+        start_str, _, end_str = range_[len("bytes=") :].partition("-")
+        start = int(start_str)
+        end = min(int(end_str) + 1 if end_str else len(data), len(data))
+        if start >= end:
+            raise web.HTTPRequestRangeNotSatisfiable()
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{len(data)}"
+        return web.Response(status=206, body=data[start:end], headers=headers)
+
+    async def handle_delete(self, request: web.Request) -> web.Response:
+        self.requests.append("delete")
+        if self.objects.pop(request.match_info["key"], None) is None:
+            raise web.HTTPNotFound()
+        return web.Response(status=204)
+
+    async def handle_rewrite(self, request: web.Request) -> web.Response:
+        # Rewrites in two calls to check continuation
+        self.requests.append("rewrite")
+        match_info = request.match_info
+        data = self.objects[f"{match_info['src_bucket']}:{match_info['src_key']}"]
+        size = len(data)
+        if "rewriteToken" not in request.query:
+            return web.json_response(
+                {
+                    "totalBytesRewritten": str(size // 2),
+                    "objectSize": str(size),
+                    "done": False,
+                    "rewriteToken": "token",
+                }
+            )
+        assert request.query["rewriteToken"] == "token"
+        self.objects[match_info["key"]] = data
+        return web.json_response(
+            {"totalBytesRewritten": str(size), "objectSize": str(size), "done": True}
+        )
+
+    async def handle_batch(self, request: web.Request) -> web.Response:
+        self.requests.append("batch")
+        reader = await request.multipart()
+        writer = MultipartWriter("mixed")
+        async for part in reader:
+            assert isinstance(part, BodyPartReader)
+            method, path, _ = (await part.text()).split(" ", 2)
+            assert method == "DELETE"
+            key = unquote(path.rpartition("/o/")[2])
+            if key in self.forbidden:
+                status = "403 Forbidden"
+            elif self.objects.pop(key, None) is None:
+                status = "404 Not Found"
+            else:
+                status = "204 No Content"
+            writer.append(
+                f"HTTP/1.1 {status}\r\n\r\n",
+                {
+                    "Content-Type": "application/http",
+                    "Content-ID": f"<response-{part.headers['Content-ID'][1:]}",
+                },
+            )
+        return web.Response(
+            body=writer, content_type=f"multipart/mixed; boundary={writer.boundary}"
+        )
+
+
+@pytest.fixture
+def fake_gcs() -> FakeGCS:
+    return FakeGCS()
+
+
+@pytest.fixture
+async def provider(
+    aiohttp_server: _TestServerFactory, fake_gcs: FakeGCS
+) -> AsyncIterator[GCSProvider]:
+    srv = await aiohttp_server(fake_gcs.make_app())
+    bucket = Bucket(
+        id="bucket-id",
+        name="bucket",
+        cluster_name="cluster",
+        org_name="NO_ORG",
+        project_name="project",
+        owner="user",
+        created_at=datetime.now(timezone.utc),
+        provider=Bucket.Provider.GCP,
+        imported=False,
+    )
+    async with ClientSession() as session:
+        provider = GCSProvider(session, StaticToken(), bucket, "bucket")
+        provider.BASE_URL = str(srv.make_url("/storage/v1"))
+        provider.UPLOAD_BASE_URL = str(srv.make_url("/upload/storage/v1"))
+        provider.BATCH_URL = str(srv.make_url("/batch/storage/v1"))
+        provider.MIN_CHUNK_SIZE = 4
+        provider.COMPOSITE_UPLOAD_THRESHOLD = 10
+        yield provider
+
+
+async def _iter_chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_put_blob_resumable(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    await provider.put_blob("key", _iter_chunks(b"abc", b"def"), size=6)
+
+    assert fake_gcs.objects == {"key": b"abcdef"}
+    assert fake_gcs.requests == ["resumable"]
+
+
+async def test_put_blob_composite(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    steps = []
+
+    async def progress(n: int) -> None:
+        steps.append(n)
+
+    await provider.put_blob(
+        "dir/key", _iter_chunks(b"abcdefghij", b"klm"), progress, size=13
+    )
+
+    assert fake_gcs.objects == {"dir/key": b"abcdefghijklm"}
+    assert fake_gcs.requests.count("media") == 4
+    assert fake_gcs.requests.count("compose") == 1
+    assert fake_gcs.requests.count("delete") == 4
+    assert sorted(steps) == [1, 4, 4, 4]
+
+
+async def test_put_blob_composite_nested(
+    provider: GCSProvider, fake_gcs: FakeGCS
+) -> None:
+    provider.MAX_COMPOSE_SOURCES = 2
+    data = bytes(range(20))
+
+    await provider.put_blob("key", _iter_chunks(data), size=len(data))
+
+    assert fake_gcs.objects == {"key": data}
+    # 5 parts -> 3 -> 2 -> key
+    assert fake_gcs.requests.count("compose") == 6
+
+
+async def test_put_blob_composite_cleanup_on_error(
+    provider: GCSProvider, fake_gcs: FakeGCS
+) -> None:
+    fake_gcs.fail_compose = True
+
+    with pytest.raises(Exception):
+        await provider.put_blob("key", _iter_chunks(b"x" * 12), size=12)
+
+    assert fake_gcs.objects == {}
+
+
+async def test_fetch_blob_ranges(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    fake_gcs.objects["key"] = b"abcdefghijklm"
+
+    async with provider.fetch_blob("key", offset=2) as it:
+        data = b"".join([chunk async for chunk in it])
+
+    assert data == b"cdefghijklm"
+    assert fake_gcs.ranges == [
+        "bytes=2-5",
+        "bytes=6-9",
+        "bytes=10-12",
+    ]
+
+
+async def test_fetch_blob_overwritten(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    fake_gcs.objects["key"] = b"abcdefghijklm"
+
+    with pytest.raises(ClientResponseError) as exc_info:
+        async with provider.fetch_blob("key") as it:
+            async for chunk in it:
+                fake_gcs.objects["key"] = b"ABCDEFGHIJKLM"
+
+    assert exc_info.value.status == 412
+    assert fake_gcs.ranges == ["bytes=0-3"]
+
+
+async def test_fetch_blob_small(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    fake_gcs.objects["key"] = b"abc"
+
+    async with provider.fetch_blob("key") as it:
+        data = b"".join([chunk async for chunk in it])
+
+    assert data == b"abc"
+    assert fake_gcs.ranges == ["bytes=0-3"]
+
+
+async def test_fetch_blob_empty(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    fake_gcs.objects["key"] = b""
+
+    async with provider.fetch_blob("key") as it:
+        data = b"".join([chunk async for chunk in it])
+
+    assert data == b""
+    assert fake_gcs.ranges == ["bytes=0-3", None]
+
+
+async def test_delete_blobs(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    fake_gcs.objects.update({"a": b"", "dir/b": b"", "c": b""})
+
+    await provider.delete_blobs(["a", "dir/b", "missing"])
+
+    assert fake_gcs.objects == {"c": b""}
+    assert fake_gcs.requests == ["batch"]
+
+
+async def test_delete_blobs_error(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    fake_gcs.objects.update({"a": b"", "b": b""})
+    fake_gcs.forbidden.add("b")
+
+    with pytest.raises(ClientResponseError) as exc_info:
+        await provider.delete_blobs(["a", "b"])
+
+    assert exc_info.value.status == 403
+
+
+async def test_copy_blob(provider: GCSProvider, fake_gcs: FakeGCS) -> None:
+    fake_gcs.objects["other:dir/src"] = b"abcdefghij"
+    src = GCSProvider(provider._session, StaticToken(), provider.bucket, "other")
+    steps = []
+
+    async def progress(n: int) -> None:
+        steps.append(n)
+
+    assert provider.can_copy_from(src)
+    await provider.copy_blob(src, "dir/src", "dir/dst", size=10, progress=progress)
+
+    assert fake_gcs.objects["dir/dst"] == b"abcdefghij"
+    assert fake_gcs.requests == ["rewrite", "rewrite"]
+    assert steps == [5, 5]
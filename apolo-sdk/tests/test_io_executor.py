@@ -0,0 +1,47 @@
+import threading
+from typing import List
+
+from apolo_sdk._io_executor import IOExecutor, run_io
+
+
+async def test_run_io_in_executor() -> None:
+    executor = IOExecutor(lambda: 2)
+    try:
+        name = await run_io(executor, lambda: threading.current_thread().name)
+        assert name.startswith("apolo-io")
+    finally:
+        executor.shutdown()
+
+
+async def test_run_io_default_executor() -> None:
+    name = await run_io(None, lambda: threading.current_thread().name)
+    assert not name.startswith("apolo-io")
+
+
+async def test_max_workers_requested_lazily() -> None:
+    calls: List[int] = []
+
+    def get_max_workers() -> int:
+        calls.append(1)
+        return 1
+
+    executor = IOExecutor(get_max_workers)
+    try:
+        assert calls == []
+        assert await run_io(executor, sum, [1, 2]) == 3
+        assert await run_io(executor, sum, [3, 4]) == 7
+        assert calls == [1]
+    finally:
+        executor.shutdown()
+
+
+def test_shutdown_unused() -> None:
+    calls: List[int] = []
+
+    def get_max_workers() -> int:
+        calls.append(1)
+        return 1
+
+    executor = IOExecutor(get_max_workers)
+    executor.shutdown()
+    assert calls == []
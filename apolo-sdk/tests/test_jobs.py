@@ -1,8 +1,10 @@
 import asyncio
+import dataclasses
 import json
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 import pytest
 from aiodocker.exceptions import DockerError
@@ -10,14 +12,18 @@ from aiohttp import web
 from dateutil.parser import isoparse
 from yarl import URL
 
+import apolo_sdk._job_index
 from apolo_sdk import (
     Client,
     Container,
     DiskVolume,
     HTTPPort,
+    IllegalArgumentError,
     JobPriority,
     JobRestartPolicy,
     JobStatus,
+    JobStatusItem,
+    JobSummary,
     JobTelemetry,
     RemoteImage,
     ResourceNotFound,
@@ -273,6 +279,85 @@ async def test_top_nonexisting_job(
     assert lst == []
 
 
+async def test_top_many(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    async def top_stream(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        count = int(request.match_info["job_id"].rpartition("-")[2])
+        for i in range(count):
+            await ws.send_json({"cpu": 0.5, "memory_bytes": 2**20, "timestamp": i})
+        await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/jobs/{job_id}/top", top_stream)
+    srv = await aiohttp_server(app)
+
+    async def ids() -> AsyncIterator[str]:
+        yield "job-2"
+        await asyncio.sleep(0.01)
+        yield "job-0"
+        yield "job-3"
+        yield "job-2"
+
+    lst = []
+    async with make_client(srv.make_url("/")) as client:
+        async with client.jobs.top_many(ids()) as it:
+            async for job_id, info in it:
+                lst.append((job_id, info and info.timestamp))
+
+    for job_id, count in [("job-0", 0), ("job-2", 2), ("job-3", 3)]:
+        assert [info for id, info in lst if id == job_id] == [*range(count), None]
+
+
+async def test_top_many_error(
+    aiohttp_server: _TestServerFactory,
+    make_client: _MakeClient,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    attempts = []
+
+    async def top_stream(request: web.Request) -> web.WebSocketResponse:
+        job_id = request.match_info["job_id"]
+        attempts.append(job_id)
+        if job_id == "job-unavailable":
+            raise web.HTTPServiceUnavailable()
+        if job_id == "job-flaky" and attempts.count(job_id) == 1:
+            raise web.HTTPBadGateway()
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json({"cpu": 0.5, "memory_bytes": 2**20, "timestamp": 0})
+        await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/jobs/{job_id}/top", top_stream)
+    srv = await aiohttp_server(app)
+
+    lst = []
+    async with make_client(srv.make_url("/")) as client:
+        client.jobs.TOP_MANY_RETRY_DELAY = 0
+        async with client.jobs.top_many(
+            ["job-1", "job-unavailable", "job-flaky"]
+        ) as it:
+            async for job_id, info in it:
+                lst.append((job_id, info and info.timestamp))
+
+    # Other jobs are streamed till the end, broken streams are reconnected
+    assert sorted(lst, key=lambda item: (item[0], item[1] is None)) == [
+        ("job-1", 0),
+        ("job-1", None),
+        ("job-flaky", 0),
+        ("job-flaky", None),
+        ("job-unavailable", None),
+    ]
+    assert attempts.count("job-unavailable") == client.jobs.TOP_MANY_RETRIES + 1
+    assert attempts.count("job-flaky") == 2
+    assert "Cannot get telemetry of job job-unavailable" in caplog.text
+
+
 async def test_kill_not_found_error(
     aiohttp_server: _TestServerFactory, make_client: _MakeClient
 ) -> None:
@@ -755,6 +840,38 @@ async def test_status_with_http(
         assert ret == _job_description_from_api(JSON, client.parse)
 
 
+async def test_watch(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    statuses = ["pending", "pending", "pending", "running"]
+    requests = []
+
+    async def handler(request: web.Request) -> web.Response:
+        status = statuses.pop(0)
+        etag = f'"{status}"'
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        job = create_job_response("job-id", status)
+        return web.json_response(job, headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/jobs/job-id", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        client.jobs.WATCH_MIN_DELAY = 0
+        ret = []
+        async with client.jobs.watch("job-id") as it:
+            async for job in it:
+                ret.append(job.status)
+                if job.status == JobStatus.RUNNING:
+                    break
+
+    assert ret == [JobStatus.PENDING] * 3 + [JobStatus.RUNNING]
+    assert requests == [None, '"pending"', '"pending"', '"pending"']
+
+
 async def test_status_with_tpu(
     aiohttp_server: _TestServerFactory, make_client: _MakeClient
 ) -> None:
@@ -2351,6 +2468,451 @@ async def test_list_no_filter(
         assert ret == job_descriptions
 
 
+async def test_list_statuses(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    job = create_job_response("job-id-1", "succeeded")
+    job["statuses"] = [
+        {"status": "pending", "transition_time": "2018-09-25T12:28:21.298672Z"},
+        {
+            "status": "succeeded",
+            "transition_time": "2018-09-25T12:28:59.759433+00:00",
+            "reason": "Completed",
+            "exit_code": 0,
+        },
+    ]
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({"jobs": [job]})
+
+    app = web.Application()
+    app.router.add_get("/jobs", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        async with client.jobs.list() as it:
+            ret = [job async for job in it]
+
+    assert ret[0].history.transitions == [
+        JobStatusItem(
+            status=JobStatus.PENDING,
+            transition_time=datetime(2018, 9, 25, 12, 28, 21, 298672, timezone.utc),
+        ),
+        JobStatusItem(
+            status=JobStatus.SUCCEEDED,
+            transition_time=datetime(2018, 9, 25, 12, 28, 59, 759433, timezone.utc),
+            reason="Completed",
+            exit_code=0,
+        ),
+    ]
+
+
+async def test_list_throughput(
+    aiohttp_server: _TestServerFactory,
+    make_client: _MakeClient,
+    record_testsuite_property: Callable[[str, object], None],
+) -> None:
+    # Benchmark of decoding a long listing,
+    # the rate is reported as a property of the test suite in JUnit XML
+    count = 5000
+    job = create_job_response("job-id-1", "succeeded", name="job-name-1")
+    job["statuses"] = [
+        {"status": status, "transition_time": "2018-09-25T12:28:21.298672+00:00"}
+        for status in ("pending", "running", "succeeded")
+    ]
+    line = json.dumps(job).encode() + b"\n"
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        resp = web.StreamResponse()
+        resp.headers["Content-Type"] = "application/x-ndjson"
+        await resp.prepare(request)
+        await resp.write(line * count)
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/jobs", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        listed = 0
+        start = time.perf_counter()
+        async with client.jobs.list() as it:
+            async for _ in it:
+                listed += 1
+        elapsed = time.perf_counter() - start
+
+    assert listed == count
+    record_testsuite_property("jobs_list_per_second", round(count / elapsed))
+
+
+async def test_list_summaries(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    job = create_job_response("job-id-1", "failed", name="job-name-1", tags=["t1"])
+    job["description"] = "Description"
+    job["max_run_time_minutes"] = 10
+
+    async def handler(request: web.Request) -> web.Response:
+        assert request.query.getall("field") == [
+            "id",
+            "owner",
+            "cluster_name",
+            "org_name",
+            "project_name",
+            "status",
+            "name",
+            "history",
+            "container.command",
+            "container.image",
+            "max_run_time_minutes",
+        ]
+        return web.json_response({"jobs": [job]})
+
+    app = web.Application()
+    app.router.add_get("/jobs", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        async with client.jobs.list_summaries(
+            fields=["image", "command", "life_span"]
+        ) as it:
+            ret = [job async for job in it]
+
+        assert ret == [
+            JobSummary(
+                id="job-id-1",
+                owner="owner",
+                cluster_name="default",
+                org_name=None,
+                project_name="myproject",
+                status=JobStatus.FAILED,
+                name="job-name-1",
+                created_at=isoparse("2018-09-25T12:28:21.298672+00:00"),
+                started_at=isoparse("2018-09-25T12:28:59.759433+00:00"),
+                finished_at=isoparse("2018-09-25T12:28:59.759433+00:00"),
+                changed_at=isoparse("2018-09-25T12:28:59.759433+00:00"),
+                tags=(),
+                description=None,
+                image=client.parse.remote_image("submit-image-name"),
+                command="submit-command",
+                working_dir=None,
+                life_span=600.0,
+                preset_name=None,
+            )
+        ]
+        description = _job_description_from_api(job, client.parse)
+        assert JobSummary.from_job(description) == dataclasses.replace(
+            ret[0], tags=["t1"], description="Description"
+        )
+
+
+async def test_list_summaries_changed_at(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    job = create_job_response("job-id-1", "unknown")
+    job["history"]["status"] = "unknown"
+    job["statuses"] = [
+        {"status": "pending", "transition_time": "2018-09-25T12:28:21+00:00"},
+        {"status": "unknown", "transition_time": "2018-09-25T12:30:00+00:00"},
+    ]
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({"jobs": [job]})
+
+    app = web.Application()
+    app.router.add_get("/jobs", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        async with client.jobs.list_summaries() as it:
+            ret = [job async for job in it]
+
+        # Transitions are not fetched, the creation time is used instead
+        assert ret[0].changed_at == ret[0].created_at
+
+
+async def test_list_summaries_without_field_projection(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    job = create_job_response("job-id-1", "running", name="job-name-1")
+    queries = []
+
+    async def handler(request: web.Request) -> web.Response:
+        queries.append(request.query.getall("field", []))
+        if "field" in request.query:
+            raise web.HTTPBadRequest(text="Unknown parameter field")
+        return web.json_response({"jobs": [job]})
+
+    app = web.Application()
+    app.router.add_get("/jobs", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        for _ in range(2):
+            async with client.jobs.list_summaries(fields=["image"]) as it:
+                ret = [job async for job in it]
+            assert [job.id for job in ret] == ["job-id-1"]
+            assert ret[0].image == client.parse.remote_image("submit-image-name")
+
+    assert [bool(fields) for fields in queries] == [True, False, False]
+
+
+async def test_list_summaries_bad_request(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    job = create_job_response("job-id-1", "running", name="job-name-1")
+    queries = []
+
+    async def handler(request: web.Request) -> web.Response:
+        queries.append(request.query.getall("field", []))
+        if request.query.get("name") == "bad":
+            raise web.HTTPBadRequest(text="Invalid name")
+        return web.json_response({"jobs": [job]})
+
+    app = web.Application()
+    app.router.add_get("/jobs", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        with pytest.raises(IllegalArgumentError, match="Invalid name"):
+            async with client.jobs.list_summaries(name="bad") as it:
+                async for _ in it:
+                    pass
+        async with client.jobs.list_summaries() as it:
+            ret = [job async for job in it]
+        assert [job.id for job in ret] == ["job-id-1"]
+
+    # The field projection is still used
+    assert [bool(fields) for fields in queries] == [True, True]
+
+
+async def test_list_summaries_unknown_field(make_client: _MakeClient) -> None:
+    async with make_client("https://example.com") as client:
+        with pytest.raises(ValueError, match="Unknown job summary fields: spam"):
+            async with client.jobs.list_summaries(fields=["spam", "image"]) as it:
+                async for _ in it:
+                    pass
+
+
+async def test_resolve_name(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    job = create_job_response("job-id-1", "running", name="job-name")
+    queries = []
+
+    async def list_handler(request: web.Request) -> web.Response:
+        queries.append(request.query)
+        jobs = [job] if request.query["name"] == job["name"] else []
+        return web.json_response({"jobs": jobs})
+
+    async def status_handler(request: web.Request) -> web.Response:
+        return web.json_response(job)
+
+    app = web.Application()
+    app.router.add_get("/jobs", list_handler)
+    app.router.add_get("/jobs/{job_id}", status_handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        projects = {"myproject": None}
+        for _ in range(2):
+            job_id = await client.jobs.resolve_name("job-name", projects=projects)
+            assert job_id == "job-id-1"
+        assert len(queries) == 1
+        assert queries[0]["name"] == "job-name"
+        assert queries[0].getall("project_name") == ["myproject"]
+
+        # Finished jobs are not resolved from the index
+        job["status"] = "succeeded"
+        await client.jobs.status("job-id-1")
+        job_id = await client.jobs.resolve_name("job-name", projects=projects)
+        assert job_id == "job-id-1"
+        assert len(queries) == 2
+
+        assert await client.jobs.resolve_name("other", projects=projects) is None
+        assert len(queries) == 3
+
+
+async def test_job_index_schema_checked_once(
+    aiohttp_server: _TestServerFactory,
+    make_client: _MakeClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    job = create_job_response("job-id-1", "running", name="job-name")
+    checks = []
+
+    def ensure_schema(*args: Any) -> bool:
+        checks.append(args)
+        return orig_ensure_schema(*args)
+
+    orig_ensure_schema = apolo_sdk._job_index.ensure_schema
+    monkeypatch.setattr(apolo_sdk._job_index, "ensure_schema", ensure_schema)
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({"jobs": [job]})
+
+    app = web.Application()
+    app.router.add_get("/jobs", handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        projects = {"myproject": None}
+        for _ in range(2):
+            job_id = await client.jobs.resolve_name("job-name", projects=projects)
+            assert job_id == "job-id-1"
+        async with client.jobs.list_cached() as it:
+            async for _ in it:
+                pass
+    assert len(checks) == 1
+
+
+async def test_resolve_name_finished_elsewhere(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    jobs = [create_job_response("job-id-1", "running", name="job-name")]
+    requests = []
+
+    async def list_handler(request: web.Request) -> web.Response:
+        requests.append(request.path)
+        return web.json_response({"jobs": jobs})
+
+    async def status_handler(request: web.Request) -> web.Response:
+        requests.append(request.path)
+        for job in jobs:
+            if job["id"] == request.match_info["job_id"]:
+                return web.json_response(job)
+        raise web.HTTPNotFound()
+
+    app = web.Application()
+    app.router.add_get("/jobs", list_handler)
+    app.router.add_get("/jobs/{job_id}", status_handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        projects = {"myproject": None}
+        job_id = await client.jobs.resolve_name("job-name", projects=projects)
+        assert job_id == "job-id-1"
+        assert requests == ["/jobs"]
+        # Recently fetched active jobs are not checked on the server
+        job_id = await client.jobs.resolve_name("job-name", projects=projects)
+        assert job_id == "job-id-1"
+        assert requests == ["/jobs"]
+
+        client.jobs._index.CHECK_INTERVAL = 0
+        job_id = await client.jobs.resolve_name("job-name", projects=projects)
+        assert job_id == "job-id-1"
+        assert requests == ["/jobs", "/jobs/job-id-1"]
+        # The job is finished and the name is reused without this client
+        jobs[0]["status"] = "succeeded"
+        jobs.insert(0, create_job_response("job-id-2", "running", name="job-name"))
+        job_id = await client.jobs.resolve_name("job-name", projects=projects)
+        assert job_id == "job-id-2"
+        assert requests == ["/jobs", "/jobs/job-id-1", "/jobs/job-id-1", "/jobs"]
+
+
+async def test_resolve_name_killed(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    jobs = [create_job_response("job-id-1", "running", name="job-name")]
+
+    async def list_handler(request: web.Request) -> web.Response:
+        return web.json_response({"jobs": jobs})
+
+    async def kill_handler(request: web.Request) -> web.Response:
+        jobs.insert(0, create_job_response("job-id-2", "pending", name="job-name"))
+        return web.Response(status=204)
+
+    app = web.Application()
+    app.router.add_get("/jobs", list_handler)
+    app.router.add_delete("/jobs/{job_id}", kill_handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        projects = {"myproject": None}
+        job_id = await client.jobs.resolve_name("job-name", projects=projects)
+        assert job_id == "job-id-1"
+        await client.jobs.kill("job-id-1")
+        job_id = await client.jobs.resolve_name("job-name", projects=projects)
+        assert job_id == "job-id-2"
+
+
+async def test_list_cached(
+    aiohttp_server: _TestServerFactory, make_client: _MakeClient
+) -> None:
+    # The index keeps jobs created within JobIndex.MAX_AGE
+    since = datetime.now(timezone.utc) - timedelta(days=1)
+    created_at = since + timedelta(hours=1)
+    jobs = [
+        create_job_response("job-id-1", "running", name="job-name-1"),
+        create_job_response("job-id-0", "running"),
+    ]
+    jobs[0]["history"]["created_at"] = created_at.isoformat()
+    jobs[1]["history"]["created_at"] = (created_at - timedelta(minutes=1)).isoformat()
+    queries = []
+
+    async def list_handler(request: web.Request) -> web.Response:
+        queries.append(request.query)
+        statuses = request.query.getall("status", [])
+        since = isoparse(request.query["since"])
+        return web.json_response(
+            {
+                "jobs": [
+                    job
+                    for job in jobs
+                    if (not statuses or job["status"] in statuses)
+                    and isoparse(job["history"]["created_at"]) >= since
+                ]
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/jobs", list_handler)
+    srv = await aiohttp_server(app)
+
+    async with make_client(srv.make_url("/")) as client:
+        async with client.jobs.list_cached(since=since, limit=10) as it:
+            ret = [job async for job in it]
+        assert [(job.id, job.name) for job in ret] == [
+            ("job-id-1", "job-name-1"),
+            ("job-id-0", None),
+        ]
+        assert ret[0].status == JobStatus.RUNNING
+        assert ret[0].created_at == created_at
+        assert queries[0]["since"] == since.isoformat()
+        assert queries[0]["limit"] == "10"
+
+        # Refreshed not more often than JobIndex.REFRESH_INTERVAL
+        async with client.jobs.list_cached(since=since, limit=10) as it:
+            ret = [job async for job in it]
+        assert len(ret) == 2
+        assert len(queries) == 1
+
+        client.jobs._index.REFRESH_INTERVAL = 0
+        jobs.append(create_job_response("job-id-2", "pending"))
+        jobs[2]["history"]["created_at"] = datetime.now(timezone.utc).isoformat()
+        # The jobs are finished by another client
+        jobs[0]["status"] = "succeeded"
+        jobs[1]["status"] = "failed"
+        async with client.jobs.list_cached(since=since, limit=10) as it:
+            ret = [job async for job in it]
+        # Finished jobs missing in the list of active jobs are dropped
+        # without checking them one by one
+        assert [(job.id, job.status) for job in ret] == [
+            ("job-id-2", JobStatus.PENDING),
+            ("job-id-1", JobStatus.SUCCEEDED),
+        ]
+        assert len(queries) == 3
+        # Only jobs created since the newest indexed job are fetched
+        assert queries[1]["since"] == created_at.isoformat()
+        assert "limit" not in queries[1]
+        # Statuses of indexed active jobs are refreshed
+        assert sorted(queries[2].getall("status")) == [
+            "pending",
+            "running",
+            "suspended",
+        ]
+
+
 async def test_list_filter_by_name(
     aiohttp_server: _TestServerFactory, make_client: _MakeClient
 ) -> None:
@@ -0,0 +1,136 @@
+import asyncio
+import functools
+from typing import Dict, List
+
+import pytest
+
+from apolo_sdk._scheduler import LARGE_FILE_SIZE, Scheduler, WorkGroup, WorkKind
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.current = 0
+        self.max = 0
+
+    async def run(self) -> None:
+        self.current += 1
+        self.max = max(self.max, self.current)
+        await asyncio.sleep(0.001)
+        self.current -= 1
+
+
+def test_work_kind_for_file() -> None:
+    assert WorkKind.for_file(None) == WorkKind.SMALL_FILE
+    assert WorkKind.for_file(0) == WorkKind.SMALL_FILE
+    assert WorkKind.for_file(LARGE_FILE_SIZE - 1) == WorkKind.SMALL_FILE
+    assert WorkKind.for_file(LARGE_FILE_SIZE) == WorkKind.LARGE_FILE
+
+
+async def test_empty() -> None:
+    async def root(group: WorkGroup) -> None:
+        pass
+
+    await Scheduler().run(root)
+
+
+async def test_limits() -> None:
+    counters: Dict[WorkKind, Counter] = {kind: Counter() for kind in WorkKind}
+
+    async def walk(depth: int, group: WorkGroup) -> None:
+        await counters[WorkKind.LIST].run()
+        async with group.group() as dir_group:
+            for _ in range(10):
+                await dir_group.submit(
+                    WorkKind.SMALL_FILE, counters[WorkKind.SMALL_FILE].run
+                )
+            await dir_group.submit(
+                WorkKind.LARGE_FILE, counters[WorkKind.LARGE_FILE].run
+            )
+            if depth:
+                for _ in range(3):
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(walk, depth - 1, group=dir_group),
+                    )
+
+    scheduler = Scheduler(
+        list_workers=2, small_file_workers=3, large_file_workers=1, queue_size=5
+    )
+    await scheduler.run(functools.partial(walk, 3))
+    assert counters[WorkKind.LIST].max <= 3  # 2 workers + the root
+    assert counters[WorkKind.SMALL_FILE].max == 3
+    assert counters[WorkKind.LARGE_FILE].max == 1
+    assert all(counter.current == 0 for counter in counters.values())
+
+
+async def test_on_done_order() -> None:
+    events: List[str] = []
+
+    async def walk(name: str, depth: int, group: WorkGroup) -> None:
+        events.append(f"enter {name}")
+
+        async def leave() -> None:
+            events.append(f"leave {name}")
+
+        async with group.group(on_done=leave) as dir_group:
+            for i in range(3):
+                file_name = f"{name}/f{i}"
+
+                async def file(file_name: str = file_name) -> None:
+                    await asyncio.sleep(0)
+                    events.append(f"file {file_name}")
+
+                await dir_group.submit(WorkKind.SMALL_FILE, file)
+            if depth:
+                for i in range(2):
+                    await dir_group.submit(
+                        WorkKind.LIST,
+                        functools.partial(
+                            walk, f"{name}/d{i}", depth - 1, group=dir_group
+                        ),
+                    )
+
+    await Scheduler(queue_size=1).run(functools.partial(walk, "root", 2))
+    assert len(events) == 7 * 5
+    for event in events:
+        if event.startswith("leave "):
+            name = event[len("leave ") :]
+            pos = events.index(event)
+            # all entries of the directory are processed before leaving it
+            assert events.index(f"enter {name}") < pos
+            for other in events[pos + 1 :]:
+                assert not other.startswith(f"file {name}/")
+                assert not other.startswith(f"enter {name}/")
+                assert not other.startswith(f"leave {name}/")
+    assert events[-1] == "leave root"
+
+
+async def test_error() -> None:
+    started = 0
+    finished = 0
+
+    async def file(n: int) -> None:
+        nonlocal started, finished
+        started += 1
+        await asyncio.sleep(0.01 * n)
+        if n == 3:
+            raise OSError("Ouch!")
+        finished += 1
+
+    async def root(group: WorkGroup) -> None:
+        for n in range(100):
+            await group.submit(WorkKind.SMALL_FILE, functools.partial(file, n))
+
+    with pytest.raises(OSError, match="Ouch!"):
+        await Scheduler(small_file_workers=5).run(root)
+    assert started < 100
+    assert finished < started
+
+
+async def test_error_in_root() -> None:
+    async def root(group: WorkGroup) -> None:
+        await group.submit(WorkKind.SMALL_FILE, functools.partial(asyncio.sleep, 1))
+        raise ValueError("Ouch!")
+
+    with pytest.raises(ValueError, match="Ouch!"):
+        await asyncio.wait_for(Scheduler().run(root), timeout=0.5)
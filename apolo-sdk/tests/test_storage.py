@@ -1,7 +1,9 @@
 import asyncio
+import dataclasses
 import errno
 import json
 import os
+import shutil
 from filecmp import dircmp
 from pathlib import Path
 from shutil import copytree
@@ -24,7 +26,8 @@ from apolo_sdk import (
     StorageProgressStart,
     StorageProgressStep,
 )
-from apolo_sdk._storage import _parse_content_range
+from apolo_sdk._storage import _parse_content_range, _split_segments
+from apolo_sdk._utils import asyncgeneratorcontextmanager
 
 from tests import _RawTestServerFactory, _TestServerFactory
 
@@ -170,6 +173,16 @@ async def storage_server(
                 ret.append(status)
             return await make_listiter_response(request, ret)
 
+        elif op == "DELETE":
+            if not local_path.exists():
+                raise web.HTTPNotFound()
+            if local_path.is_dir():
+                assert request.query["recursive"] == "true"
+                shutil.rmtree(local_path)
+            else:
+                local_path.unlink()
+            return web.Response(status=204)
+
         else:
             raise web.HTTPInternalServerError(text=f"Unsupported operation {op}")
 
@@ -2286,3 +2299,502 @@ async def test_storage_upload_dir_with_parent_ignore_file_names(
     assert names == ["nested", "three"]
     names = sorted(os.listdir(storage_path / "folder" / "nested"))
     assert names == ["three", "two"]
+
+
+async def test_storage_upload_file_parallel(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    small_block_size: None,
+) -> None:
+    storage_file = storage_path / "file.bin"
+    local_file = tmp_path / "file.bin"
+    content = os.urandom(10_000)
+    local_file.write_bytes(content)
+    progress = mock.Mock()
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.upload_file(
+            URL(local_file.as_uri()),
+            URL("storage:file.bin"),
+            parallel=4,
+            progress=progress,
+        )
+    assert storage_file.read_bytes() == content
+
+    src = URL(local_file.as_uri())
+    dst = URL("storage://default/NO_ORG/test-project/file.bin")
+    size = len(content)
+    progress.start.assert_called_once_with(StorageProgressStart(src, dst, size))
+    steps = [call.args[0].current for call in progress.step.call_args_list]
+    assert steps == sorted(steps)
+    assert steps[0] == 300
+    assert steps[-1] == size
+    progress.complete.assert_called_once_with(StorageProgressComplete(src, dst, size))
+
+
+async def test_storage_upload_file_parallel_continue(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    zero_time_threshold: None,
+    small_block_size: None,
+) -> None:
+    storage_file = storage_path / "file.bin"
+    local_file = tmp_path / "file.bin"
+    content = os.urandom(10_000)
+    local_file.write_bytes(content)
+    await asyncio.sleep(5)
+    storage_file.write_bytes(content[:1234])
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.upload_file(
+            URL(local_file.as_uri()),
+            URL("storage:file.bin"),
+            continue_=True,
+            parallel=3,
+        )
+    assert storage_file.read_bytes() == content
+
+
+async def test_storage_upload_dir_parallel(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    small_block_size: None,
+) -> None:
+    local_dir = tmp_path / "folder"
+    (local_dir / "nested").mkdir(parents=True)
+    (local_dir / "big.bin").write_bytes(os.urandom(5_000))
+    (local_dir / "nested" / "small.bin").write_bytes(os.urandom(100))
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.upload_dir(
+            URL(local_dir.as_uri()), URL("storage:folder"), parallel=4
+        )
+    diff = dircmp(local_dir, storage_path / "folder")
+    assert not calc_diff(diff)
+
+
+async def test_storage_upload_file_invalid_parallel(
+    make_client: _MakeClient, tmp_path: Path
+) -> None:
+    local_file = tmp_path / "file.bin"
+    local_file.write_bytes(b"data")
+    async with make_client("https://example.com") as client:
+        with pytest.raises(ValueError, match="parallel should be >= 1"):
+            await client.storage.upload_file(
+                URL(local_file.as_uri()), URL("storage:file.bin"), parallel=0
+            )
+
+
+@pytest.fixture
+def small_segment_size(monkeypatch: Any) -> None:
+    import apolo_sdk._storage
+
+    monkeypatch.setattr(apolo_sdk._storage, "MIN_SEGMENT_SIZE", 1000)
+    monkeypatch.setattr(apolo_sdk._storage, "MAX_SEGMENT_SIZE", 3000)
+
+
+async def test_storage_download_file_parallel(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    small_segment_size: None,
+) -> None:
+    storage_file = storage_path / "file.bin"
+    local_file = tmp_path / "file.bin"
+    content = os.urandom(10_000)
+    storage_file.write_bytes(content)
+    progress = mock.Mock()
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.download_file(
+            URL("storage:file.bin"),
+            URL(local_file.as_uri()),
+            parallel=4,
+            progress=progress,
+        )
+        assert client.storage._read_download_records() == {}
+    assert local_file.read_bytes() == content
+
+    src = URL("storage://default/NO_ORG/test-project/file.bin")
+    dst = URL(local_file.as_uri())
+    size = len(content)
+    progress.start.assert_called_once_with(StorageProgressStart(src, dst, size))
+    steps = [call.args[0].current for call in progress.step.call_args_list]
+    assert steps == sorted(steps)
+    assert steps[-1] == size
+    progress.complete.assert_called_once_with(StorageProgressComplete(src, dst, size))
+
+
+async def test_storage_download_file_parallel_continue(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    small_segment_size: None,
+) -> None:
+    storage_file = storage_path / "file.bin"
+    local_file = tmp_path / "file.bin"
+    content = os.urandom(10_000)
+    storage_file.write_bytes(content)
+    # Segments 0-2499 and 5000-7499 are marked as downloaded
+    # but differ from the remote file.
+    local_content = bytearray(10_000)
+    local_content[0:2500] = b"a" * 2500
+    local_content[5000:7500] = b"b" * 2500
+    local_file.write_bytes(local_content)
+
+    async with make_client(storage_server.make_url("/")) as client:
+        src_stat = await client.storage.stat(URL("storage:file.bin"))
+        client.storage._save_download_record(
+            local_file, src_stat, {(0, 2500), (5000, 7500)}
+        )
+
+        await client.storage.download_file(
+            URL("storage:file.bin"),
+            URL(local_file.as_uri()),
+            continue_=True,
+            parallel=2,
+        )
+        assert client.storage._read_download_records() == {}
+
+    expected = bytearray(content)
+    expected[0:2500] = b"a" * 2500
+    expected[5000:7500] = b"b" * 2500
+    assert local_file.read_bytes() == expected
+
+
+async def test_storage_download_file_parallel_continue_outdated_record(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    small_segment_size: None,
+) -> None:
+    storage_file = storage_path / "file.bin"
+    local_file = tmp_path / "file.bin"
+    content = os.urandom(10_000)
+    storage_file.write_bytes(content)
+    local_file.write_bytes(bytes(10_000))
+
+    async with make_client(storage_server.make_url("/")) as client:
+        src_stat = await client.storage.stat(URL("storage:file.bin"))
+        client.storage._save_download_record(
+            local_file,
+            dataclasses.replace(src_stat, size=20_000),
+            {(0, 2500), (5000, 7500)},
+        )
+
+        await client.storage.download_file(
+            URL("storage:file.bin"),
+            URL(local_file.as_uri()),
+            continue_=True,
+            parallel=2,
+        )
+
+    assert local_file.read_bytes() == content
+
+
+async def test_storage_download_file_parallel_modified(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    small_segment_size: None,
+) -> None:
+    storage_file = storage_path / "file.bin"
+    local_file = tmp_path / "file.bin"
+    storage_file.write_bytes(os.urandom(10_000))
+
+    async with make_client(storage_server.make_url("/")) as client:
+        orig_open = client.storage.open
+
+        @asyncgeneratorcontextmanager
+        async def open(*args: Any, **kwargs: Any) -> AsyncIterator[bytes]:
+            async with orig_open(*args, **kwargs) as it:
+                async for chunk in it:
+                    yield chunk
+            # The file is overwritten after the first range is fetched
+            storage_file.write_bytes(os.urandom(10_000))
+            stat = storage_file.stat()
+            os.utime(storage_file, (stat.st_atime, stat.st_mtime + 100))
+
+        with mock.patch.object(client.storage, "open", open):
+            with pytest.raises(RuntimeError, match="modified during download"):
+                await client.storage.download_file(
+                    URL("storage:file.bin"), URL(local_file.as_uri()), parallel=2
+                )
+        # Completed ranges are kept, but the record no longer matches
+        # the modified file, so a continued download starts anew.
+        assert str(local_file) in client.storage._read_download_records()
+
+
+async def test_storage_download_dir_parallel(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+    small_segment_size: None,
+) -> None:
+    storage_dir = storage_path / "folder"
+    (storage_dir / "nested").mkdir(parents=True)
+    (storage_dir / "big.bin").write_bytes(os.urandom(5_000))
+    (storage_dir / "nested" / "small.bin").write_bytes(os.urandom(100))
+    local_dir = tmp_path / "folder"
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.download_dir(
+            URL("storage:folder"), URL(local_dir.as_uri()), parallel=4
+        )
+    diff = dircmp(storage_dir, local_dir)
+    assert not calc_diff(diff)
+
+
+async def test_storage_copy_file(
+    storage_server: Any,
+    make_client: _MakeClient,
+    storage_path: Path,
+    small_block_size: None,
+) -> None:
+    data = os.urandom(1000)
+    (storage_path / "src.bin").write_bytes(data)
+    progress = mock.Mock()
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.copy_file(
+            URL("storage:src.bin"), URL("storage:dst.bin"), progress=progress
+        )
+    assert (storage_path / "dst.bin").read_bytes() == data
+    src = URL("storage://default/NO_ORG/test-project/src.bin")
+    dst = URL("storage://default/NO_ORG/test-project/dst.bin")
+    progress.start.assert_called_once_with(StorageProgressStart(src, dst, 1000))
+    progress.step.assert_called_with(StorageProgressStep(src, dst, 1000, 1000))
+    progress.complete.assert_called_once_with(StorageProgressComplete(src, dst, 1000))
+
+
+async def test_storage_copy_file_parallel(
+    storage_server: Any,
+    make_client: _MakeClient,
+    storage_path: Path,
+    small_block_size: None,
+    small_segment_size: None,
+) -> None:
+    data = os.urandom(7_500)
+    (storage_path / "src.bin").write_bytes(data)
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.copy_file(
+            URL("storage:src.bin"), URL("storage:dst.bin"), parallel=3
+        )
+    assert (storage_path / "dst.bin").read_bytes() == data
+
+
+async def test_storage_copy_file_continue(
+    storage_server: Any,
+    make_client: _MakeClient,
+    storage_path: Path,
+) -> None:
+    data = os.urandom(1000)
+    (storage_path / "src.bin").write_bytes(data)
+    (storage_path / "dst.bin").write_bytes(data[:300])
+    progress = mock.Mock()
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.copy_file(
+            URL("storage:src.bin"),
+            URL("storage:dst.bin"),
+            continue_=True,
+            progress=progress,
+        )
+        assert (storage_path / "dst.bin").read_bytes() == data
+        progress.step.assert_any_call(
+            StorageProgressStep(mock.ANY, mock.ANY, 300, 1000)
+        )
+
+        progress = mock.Mock()
+        await client.storage.copy_file(
+            URL("storage:src.bin"),
+            URL("storage:dst.bin"),
+            update=True,
+            progress=progress,
+        )
+        progress.start.assert_not_called()
+
+
+async def test_storage_copy_file_same(
+    make_client: _MakeClient,
+) -> None:
+    async with make_client("https://example.com") as client:
+        with pytest.raises(ValueError, match="are the same file"):
+            await client.storage.copy_file(
+                URL("storage:file.bin"), URL("storage:/test-project/file.bin")
+            )
+
+
+async def test_storage_copy_dir(
+    storage_server: Any,
+    make_client: _MakeClient,
+    storage_path: Path,
+    small_block_size: None,
+) -> None:
+    src_dir = storage_path / "folder"
+    (src_dir / "nested").mkdir(parents=True)
+    (src_dir / "empty").mkdir()
+    (src_dir / "file.bin").write_bytes(os.urandom(1000))
+    (src_dir / "nested" / "file.txt").write_bytes(b"content")
+    (src_dir / "nested" / "empty.txt").write_bytes(b"")
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.copy_dir(URL("storage:folder"), URL("storage:copy"))
+        with pytest.raises(ValueError, match="into itself"):
+            await client.storage.copy_dir(
+                URL("storage:folder"), URL("storage:folder/nested")
+            )
+    assert not calc_diff(dircmp(src_dir, storage_path / "copy"))
+
+
+async def test_storage_sync_upload(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+) -> None:
+    local_dir = tmp_path / "folder"
+    (local_dir / "nested").mkdir(parents=True)
+    (local_dir / "file.txt").write_bytes(b"content")
+    (local_dir / "nested" / "file.bin").write_bytes(os.urandom(100))
+    storage_dir = storage_path / "folder"
+
+    async with make_client(storage_server.make_url("/")) as client:
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL(local_dir.as_uri()), URL("storage:folder"), progress=progress
+        )
+        assert not calc_diff(dircmp(local_dir, storage_dir))
+        assert progress.start.call_count == 2
+
+        # Nothing is changed
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL(local_dir.as_uri()), URL("storage:folder"), progress=progress
+        )
+        assert progress.start.call_count == 0
+        assert progress.enter.call_count == 2
+
+        # Touched file is not uploaded
+        os.utime(local_dir / "file.txt")
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL(local_dir.as_uri()), URL("storage:folder"), progress=progress
+        )
+        assert progress.start.call_count == 0
+
+        # The modification time is preserved but the content is changed
+        stat = (local_dir / "file.txt").stat()
+        (local_dir / "file.txt").write_bytes(b"CONTENT")
+        os.utime(local_dir / "file.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL(local_dir.as_uri()), URL("storage:folder"), progress=progress
+        )
+        assert progress.start.call_count == 1
+        assert (storage_dir / "file.txt").read_bytes() == b"CONTENT"
+
+        # The remote file is changed
+        (storage_dir / "nested" / "file.bin").write_bytes(b"changed")
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL(local_dir.as_uri()), URL("storage:folder"), progress=progress
+        )
+        assert progress.start.call_count == 1
+        assert not calc_diff(dircmp(local_dir, storage_dir))
+
+
+async def test_storage_sync_upload_delete(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+) -> None:
+    local_dir = tmp_path / "folder"
+    local_dir.mkdir()
+    (local_dir / "file.txt").write_bytes(b"content")
+    storage_dir = storage_path / "folder"
+    (storage_dir / "extra").mkdir(parents=True)
+    (storage_dir / "extra.txt").write_bytes(b"extra")
+
+    async with make_client(storage_server.make_url("/")) as client:
+        await client.storage.sync(URL(local_dir.as_uri()), URL("storage:folder"))
+        assert (storage_dir / "extra.txt").exists()
+        assert (storage_dir / "extra").exists()
+
+        await client.storage.sync(
+            URL(local_dir.as_uri()), URL("storage:folder"), delete=True
+        )
+    assert not calc_diff(dircmp(local_dir, storage_dir))
+
+
+async def test_storage_sync_download(
+    storage_server: Any,
+    make_client: _MakeClient,
+    tmp_path: Path,
+    storage_path: Path,
+) -> None:
+    storage_dir = storage_path / "folder"
+    (storage_dir / "nested").mkdir(parents=True)
+    (storage_dir / "file.txt").write_bytes(b"content")
+    (storage_dir / "nested" / "file.bin").write_bytes(os.urandom(100))
+    local_dir = tmp_path / "folder"
+
+    async with make_client(storage_server.make_url("/")) as client:
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL("storage:folder"), URL(local_dir.as_uri()), progress=progress
+        )
+        assert not calc_diff(dircmp(storage_dir, local_dir))
+        assert progress.start.call_count == 2
+
+        # Nothing is changed
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL("storage:folder"), URL(local_dir.as_uri()), progress=progress
+        )
+        assert progress.start.call_count == 0
+
+        # The local file is changed
+        (local_dir / "file.txt").write_bytes(b"changed")
+        (local_dir / "extra.txt").write_bytes(b"extra")
+        progress = mock.Mock()
+        await client.storage.sync(
+            URL("storage:folder"),
+            URL(local_dir.as_uri()),
+            delete=True,
+            progress=progress,
+        )
+        assert progress.start.call_count == 1
+    assert not calc_diff(dircmp(storage_dir, local_dir))
+
+
+async def test_storage_sync_invalid_schemes(make_client: _MakeClient) -> None:
+    async with make_client("https://example.com") as client:
+        with pytest.raises(ValueError, match="Cannot sync"):
+            await client.storage.sync(URL("storage:a"), URL("storage:b"))
+
+
+@pytest.mark.parametrize(
+    "done,expected",
+    [
+        (set(), [(0, 3), (3, 6), (6, 9), (9, 10)]),
+        ({(0, 4), (6, 7)}, [(4, 6), (7, 10)]),
+        ({(3, 6)}, [(0, 3), (6, 9), (9, 10)]),
+        ({(0, 10)}, []),
+    ],
+)
+def test_split_segments(done: Any, expected: List[Tuple[int, int]]) -> None:
+    assert _split_segments(10, 3, done) == expected
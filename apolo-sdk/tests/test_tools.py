@@ -6,7 +6,7 @@ from unittest.mock import Mock, call
 import pytest
 
 from apolo_sdk import ConfigError, find_project_root
-from apolo_sdk._utils import queue_calls
+from apolo_sdk._utils import LazySequence, queue_calls
 
 
 @pytest.fixture()
@@ -111,3 +111,26 @@ async def test_queue_calls_no_errors_for_none() -> None:
     queue, foo = queue_calls(None, allow_any_for_none=True)
     await foo.bar()
     await foo.baz()
+
+
+def test_lazy_sequence_decodes_on_first_access() -> None:
+    factory = Mock(side_effect=str)
+    seq = LazySequence([1, 2, 3], factory)
+
+    assert len(seq) == 3
+    assert seq
+    factory.assert_not_called()
+
+    assert seq[0] == "1"
+    assert seq[1:] == ["2", "3"]
+    assert list(seq) == ["1", "2", "3"]
+    assert factory.call_count == 3
+
+
+def test_lazy_sequence_compares_as_list() -> None:
+    assert LazySequence([1, 2], str) == ["1", "2"]
+    assert ["1", "2"] == LazySequence([1, 2], str)
+    assert LazySequence([1, 2], str) == LazySequence(["1", "2"], str)
+    assert LazySequence([1, 2], str) != ["1"]
+    assert LazySequence([], str) == []
+    assert repr(LazySequence([1], str)) == "['1']"